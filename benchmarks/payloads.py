@@ -0,0 +1,111 @@
+"""
+payloads for the benchmarks. recorded payloads in benchmarks/payloads/<name>.json.gz are used when they are there
+(see run.py --record), otherwise realistic payloads are generated with a fixed seed so every run sees the same data
+"""
+import gzip
+import json
+import os
+import numpy as np
+import pandas as pd
+
+PATH = os.path.join(os.path.dirname(__file__), 'payloads')
+
+CORE_HUBS = ['AT', 'BE', 'CZ', 'DE', 'FR', 'HR', 'HU', 'NL', 'PL', 'RO', 'SI', 'SK', 'ALBE', 'ALDE']
+TSOS = [('APG', '10XAT-APG------Z'), ('ELIA', '10X1001A1001A094'), ('RTE', '10XFR-RTE------Q'),
+        ('TENNETBV', '10X1001A1001A361'), ('AMPRION', '10XDE-RWENET---W'), ('PSE', '10XPL-TSO------P')]
+
+
+def _path(name: str) -> str:
+    return os.path.join(PATH, name + '.json.gz')
+
+
+def save(name: str, payload):
+    os.makedirs(PATH, exist_ok=True)
+    with gzip.open(_path(name), 'wt') as f:
+        json.dump(payload, f)
+
+
+def load(name: str, generate):
+    if os.path.exists(_path(name)):
+        with gzip.open(_path(name), 'rt') as f:
+            return json.load(f)
+    return generate()
+
+
+def domain(rows: int = 20000, mtu: str = '2025-03-23T11:00:00Z') -> list[dict]:
+    # rows of the initial/final domain as the publication tool returns them
+    rng = np.random.default_rng(0)
+    data = []
+    for i in range(rows):
+        tso, eic = TSOS[i % len(TSOS)]
+        cnec = f'{tso} line {i // 40}'
+        row = {
+            'id': 1_000_000 + i, 'dateTimeUtc': mtu, 'tso': tso, 'tsoEic': eic,
+            'cnecName': cnec, 'cnecEic': f'{eic[:8]}-CNEC-{i:06d}', 'cneName': cnec, 'cneType': 'Line',
+            'cneStatus': 'In', 'cneEic': f'{eic[:8]}-CNE-{i // 40:06d}', 'direction': 'DIRECT',
+            'hubFrom': CORE_HUBS[i % 12], 'hubTo': CORE_HUBS[(i + 1) % 12], 'substationFrom': f'SUB {i % 97}',
+            'substationTo': f'SUB {(i + 3) % 97}', 'elementType': 'Line', 'fmaxType': 'SEASONAL',
+            'contTso': tso, 'contName': 'Basecase' if i % 40 == 0 else f'{tso} outage {i % 40}',
+            'contStatus': 'Out',
+            'contingencies': [{
+                'number': 1, 'branchname': f'{tso} outage {i % 40}', 'branchEic': f'{eic[:8]}-CO-{i % 40:04d}',
+                'hubFrom': CORE_HUBS[i % 12], 'hubTo': CORE_HUBS[(i + 2) % 12], 'substationFrom': f'SUB {i % 89}',
+                'substationTo': f'SUB {(i + 5) % 89}', 'elementType': 'Line',
+            }],
+            'presolved': bool(i % 100 == 0), 'significant': bool(i % 10 == 0),
+        }
+        for k in ['ram', 'minFlow', 'maxFlow', 'u', 'imax', 'fmax', 'frm', 'frefInit', 'fnrao', 'fref', 'fcore',
+                  'fall', 'fuaf', 'amr', 'aac', 'ltaMargin', 'cva', 'iva', 'ftotalLtn', 'fltn']:
+            row[k] = round(float(rng.uniform(-2000, 2000)), 1)
+        for hub, ptdf in zip(CORE_HUBS, rng.uniform(-0.3, 0.3, len(CORE_HUBS))):
+            row['ptdf_' + hub] = round(float(ptdf), 5)
+        data.append(row)
+    return data
+
+
+def base_output(days: int = 60, start: str = '2025-01-01') -> list[dict]:
+    # hourly net positions as the publication tool returns them
+    rng = np.random.default_rng(1)
+    mtus = pd.date_range(start, periods=days * 24, freq='h', tz='UTC')
+    values = rng.uniform(-5000, 5000, (len(mtus), len(CORE_HUBS))).round(1)
+    return [
+        {'id': i, 'dateTimeUtc': mtu.strftime('%Y-%m-%dT%H:%M:%SZ'), **{f'hub_{h}': float(v) for h, v in zip(CORE_HUBS, row)}}
+        for i, (mtu, row) in enumerate(zip(mtus, values))
+    ]
+
+
+def utility_tool_csv(day: str = '2021-03-10', rows_per_hour: int = 300) -> str:
+    # the csv the deprecated CWE utility tool returns for a domain, header with ; and the rows with |
+    rng = np.random.default_rng(2)
+    zones = ['AT', 'BE', 'DE', 'FR', 'NL', 'ALBE', 'ALDE']
+    header = ['FileId', 'Row', 'DeliveryDate', 'Period', 'CriticalBranchName', 'CriticalBranchEIC', 'OutageName',
+              'OutageEIC', 'Presolved', 'RemainingAvailableMargin', 'Fmax', 'Fref', 'AMR', 'MinRAMFactor',
+              'MinRAMFactorJustification']
+    for _ in zones:
+        header += ['Factor', 'BiddingArea_Shortname']
+    lines = [';'.join(header)]
+    date = pd.Timestamp(day).strftime('%d/%m/%Y 00:00:00')
+    for period in range(1, 25):
+        for i in range(rows_per_hour):
+            ptdfs = rng.uniform(-0.3, 0.3, len(zones)).round(5)
+            row = [1, i, date, period, f'line {i}', f'10T-CNE-{i:05d}', f'outage {i % 17}', f'10T-CO-{i % 17:05d}',
+                   'True' if i % 50 == 0 else 'False', *rng.uniform(0, 2000, 4).round(1), 0.7,
+                   'MNCC = 20%;LFcalc = 5%;LFaccept = 5%;MACZTtarget = 70%']
+            for zone, ptdf in zip(zones, ptdfs):
+                row += [ptdf, zone]
+            lines.append('|'.join(str(x) for x in row))
+    return '\r\n'.join(lines)
+
+
+def utility_tool_xml(days: int = 60, start: str = '2021-01-01') -> str:
+    # net positions xml of the deprecated CWE utility tool web service
+    rng = np.random.default_rng(3)
+    zones = ['AT', 'NL', 'BE', 'DE', 'FR', 'ALBE', 'ALDE']
+    nodes = []
+    for day in pd.date_range(start, periods=days, freq='D'):
+        for hour in range(1, 25):
+            values = ''.join(f'<{z}>{v}</{z}>' for z, v in zip(zones, rng.uniform(-5000, 5000, len(zones)).round(1)))
+            nodes.append(f'<NetPositionData><CalendarDate>{day.strftime("%Y-%m-%dT00:00:00")}</CalendarDate>'
+                         f'<CalendarHour>{hour}</CalendarHour>{values}</NetPositionData>')
+    return ('<?xml version="1.0" encoding="utf-8"?><ArrayOfNetPositionData xmlns="http://tempuri.org/">'
+            + ''.join(nodes) + '</ArrayOfNetPositionData>')
@@ -0,0 +1,26 @@
+"""
+implementations as they were before they were optimized, kept as reference cases for the benchmarks:
+they show what was gained and their output is checked to be identical to the current implementations
+"""
+import pandas as pd
+from jao.util import to_snake_case
+
+
+def parse_final_domain(data: list[dict]) -> pd.DataFrame:
+    # parse_final_domain up to jao-py 0.7.4, mutates the rows of data
+    columns = list(data[0].keys())
+    i = columns.index('contingencies')
+    columns = columns[:i] + ['contingency_' + x for x in data[0]['contingencies'][0].keys()] + columns[i + 1:]
+    for d in data:
+        for c_k, c_d in d['contingencies'][0].items():
+            d['contingency_' + c_k] = c_d
+        del d['contingencies']
+    df = pd.DataFrame(data)
+    df = df.rename(columns=lambda x: to_snake_case(x) if 'ptdf' not in x else x)
+    columns = [to_snake_case(x) if 'ptdf' not in x else x for x in columns]
+    columns.remove('contingency_number')
+    df = df.drop(columns=['contingency_number'])
+    df = df[columns]
+    df = df.rename(columns={'id': 'id_original'})
+    df['date_time_utc'] = pd.to_datetime(df['date_time_utc'], utc=True).dt.tz_convert('Europe/Amsterdam')
+    return df.rename(columns={'date_time_utc': 'mtu'})
@@ -0,0 +1,269 @@
+"""
+offline benchmarks of the fetch and parse hot paths of jao-py.
+
+the fetch benchmarks run the real client code against an in process adapter that serves the payloads,
+so they measure the overhead of the client itself (pagination, json decoding, concatenation) without any network.
+every benchmark reports the best of --repeat runs as requests/s and rows/s, and the peak memory of one run.
+benchmarks ending in _reference run the implementation from before an optimization (see reference.py) on the same
+payload, after checking its output is identical, and the speed up over it is reported.
+
+    python benchmarks/run.py                  # run and compare with benchmarks/baseline.json
+    python benchmarks/run.py --save-baseline  # run and store the results as the new baseline
+    python benchmarks/run.py --record         # download real payloads from jao once, used instead of generated ones
+
+exits with 1 when any benchmark is more than --tolerance slower or uses that much more memory than the baseline,
+and also more than MIN_SECONDS slower or MIN_MB more memory
+the committed baseline.json is from a reference machine, save a baseline of your own to compare on other hardware
+"""
+import argparse
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+from urllib.parse import urlparse, parse_qs
+import pandas as pd
+import requests
+from requests.adapters import BaseAdapter
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from jao import JaoPublicationToolClient  # noqa: E402
+from jao.parsers import parse_final_domain, parse_base_output  # noqa: E402
+import payloads  # noqa: E402
+import reference  # noqa: E402
+
+BASELINE = os.path.join(os.path.dirname(__file__), 'baseline.json')
+# differences below these are noise of the machine (allocator, timer) and never a regression, whatever the tolerance
+MIN_SECONDS = 0.005
+MIN_MB = 1
+# fixed page size of bench_query_domain, smaller than the domain so every run pulls several pages
+DOMAIN_PAGE_SIZE = 5000
+
+
+class PayloadAdapter(BaseAdapter):
+    # serves a domain with Skip/Take pagination and base output per FromUTC/ToUTC window, responses are serialized
+    # once per distinct query so repeated runs only measure the client
+    def __init__(self, domain: list[dict], base: list[dict]):
+        super().__init__()
+        self.domain = domain
+        self.base = pd.DataFrame({'mtu': pd.to_datetime([r['dateTimeUtc'] for r in base], utc=True)})
+        self.base_rows = base
+        self.responses = {}
+        self.requests = 0
+
+    def _body(self, url: str) -> bytes:
+        query = {k: v[0] for k, v in parse_qs(urlparse(url).query).items()}
+        if 'Skip' in query:
+            skip, take = int(query['Skip']), int(query['Take'])
+            return json.dumps({'totalRowsWithFilter': len(self.domain), 'data': self.domain[skip:skip + take]}).encode()
+        mask = (self.base['mtu'] >= pd.Timestamp(query['FromUTC'])) & (self.base['mtu'] <= pd.Timestamp(query['ToUTC']))
+        return json.dumps({'data': [self.base_rows[i] for i in mask[mask].index]}).encode()
+
+    def send(self, request, **kwargs):
+        self.requests += 1
+        if request.url not in self.responses:
+            self.responses[request.url] = self._body(request.url)
+        r = requests.Response()
+        r.status_code = 200
+        r.url = request.url
+        r._content = self.responses[request.url]
+        return r
+
+    def close(self):
+        pass
+
+
+def _client(adapter: PayloadAdapter) -> JaoPublicationToolClient:
+    client = JaoPublicationToolClient(rate_limit=None)
+    client.s.mount('https://', adapter)
+    return client
+
+
+def bench_query_domain(data: dict):
+    adapter = PayloadAdapter(data['domain'], data['base'])
+    client = _client(adapter)
+    # no tuning of the page size, it would grow to the whole domain in one page after the warm up run
+    client.PAGE_SIZE = client.MIN_PAGE_SIZE = client.MAX_PAGE_SIZE = DOMAIN_PAGE_SIZE
+    mtu = pd.Timestamp(data['domain'][0]['dateTimeUtc']).tz_convert('Europe/Amsterdam')
+
+    def run():
+        adapter.requests = 0
+        rows = len(client.query_initial_domain(mtu))
+        return adapter.requests, rows
+    return run
+
+
+def bench_query_base_fromto(data: dict):
+    adapter = PayloadAdapter(data['domain'], data['base'])
+    client = _client(adapter)
+    mtus = pd.to_datetime([r['dateTimeUtc'] for r in data['base']], utc=True).tz_convert('Europe/Amsterdam')
+
+    def run():
+        adapter.requests = 0
+        rows = len(client.query_net_position_fromto(mtus[0], mtus[-1]))
+        return adapter.requests, rows
+    return run
+
+
+def bench_parse_final_domain(data: dict):
+    def run():
+        return 0, len(parse_final_domain(data['domain']))
+    return run
+
+
+def bench_parse_final_domain_reference(data: dict):
+    # the implementation before it was vectorized, on the same payload. it changes the rows it is given, so it
+    # parses a shallow copy of them (a few ms of the measurement)
+    expected = parse_final_domain(data['domain'])
+    pd.testing.assert_frame_equal(reference.parse_final_domain([dict(d) for d in data['domain']]), expected)
+
+    def run():
+        return 0, len(reference.parse_final_domain([dict(d) for d in data['domain']]))
+    return run
+
+
+def bench_parse_base_output(data: dict):
+    def run():
+        return 0, len(parse_base_output(data['base']))
+    return run
+
+
+def bench_cwe_parse_domain(data: dict):
+    from jao.CWE import JaoUtilityToolCSVClient
+    client = JaoUtilityToolCSVClient()
+    r = requests.Response()
+    r.status_code = 200
+    r.encoding = 'utf-8'
+    r._content = data['cwe_csv'].encode()
+
+    def run():
+        return 0, len(client._parse_domain(r))
+    return run
+
+
+def bench_cwe_parse_xml(data: dict):
+    from jao.CWE.parsers import _parse_utilitytool_xml
+
+    def run():
+        return 0, len(_parse_utilitytool_xml(data['cwe_xml'], 'NetPositionData',
+                                              ['AT', 'NL', 'BE', 'DE', 'FR', 'ALBE', 'ALDE'], 'CalendarDate'))
+    return run
+
+
+BENCHMARKS = {
+    'query_domain': bench_query_domain,
+    'query_base_fromto': bench_query_base_fromto,
+    'parse_final_domain': bench_parse_final_domain,
+    'parse_final_domain_reference': bench_parse_final_domain_reference,
+    'parse_base_output': bench_parse_base_output,
+    'cwe_parse_domain': bench_cwe_parse_domain,
+    'cwe_parse_xml': bench_cwe_parse_xml,
+}
+
+
+def load_payloads() -> dict:
+    return {
+        'domain': payloads.load('domain', payloads.domain),
+        'base': payloads.load('base_output', payloads.base_output),
+        'cwe_csv': payloads.utility_tool_csv(),
+        'cwe_xml': payloads.utility_tool_xml(),
+    }
+
+
+def record():
+    # one mtu of initial domain and two months of net positions from the live publication tool
+    client = JaoPublicationToolClient()
+    mtu = pd.Timestamp('2025-03-23 12:00', tz='Europe/Amsterdam')
+    payloads.save('domain', client.query_initial_domain(mtu))
+    payloads.save('base_output', client.query_net_position_fromto(
+        pd.Timestamp('2025-01-01', tz='Europe/Amsterdam'), pd.Timestamp('2025-02-28 23:00', tz='Europe/Amsterdam')
+    ))
+    client.close()
+
+
+def measure(run, repeat: int) -> dict:
+    run()  # warm up, fills the caches of the adapter
+    best = None
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        requests_done, rows = run()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    gc.collect()
+    tracemalloc.start()
+    run()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    result = {'seconds': best, 'rows_per_second': rows / best, 'peak_mb': peak / 1024 ** 2}
+    if requests_done > 0:
+        result['requests_per_second'] = requests_done / best
+    return result
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        old = baseline[name]
+        if result['seconds'] > max(old['seconds'] * (1 + tolerance), old['seconds'] + MIN_SECONDS):
+            regressions.append(f"{name}: {result['seconds']:.3f}s vs {old['seconds']:.3f}s in the baseline")
+        if result['peak_mb'] > max(old['peak_mb'] * (1 + tolerance), old['peak_mb'] + MIN_MB):
+            regressions.append(f"{name}: peak {result['peak_mb']:.1f}MB vs {old['peak_mb']:.1f}MB in the baseline")
+    return regressions
+
+
+def main(argv: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(description='offline benchmarks of jao-py')
+    parser.add_argument('benchmarks', nargs='*', default=list(BENCHMARKS), help=f'from: {",".join(BENCHMARKS)}')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--tolerance', type=float, default=0.2, help='allowed slow down before it is a regression')
+    parser.add_argument('--baseline', default=BASELINE)
+    parser.add_argument('--save-baseline', action='store_true')
+    parser.add_argument('--record', action='store_true', help='download real payloads from jao first')
+    args = parser.parse_args(argv)
+
+    if args.record:
+        record()
+    data = load_payloads()
+
+    results = {}
+    for name in args.benchmarks:
+        try:
+            run = BENCHMARKS[name](data)
+        except ImportError as e:
+            # the CWE parsers need the optional dependencies of that subpackage
+            print(f"{name:<30} skipped, {e}")
+            continue
+        results[name] = measure(run, args.repeat)
+        r = results[name]
+        req = f"{r['requests_per_second']:9,.0f}" if 'requests_per_second' in r else f"{'-':>9}"
+        print(f"{name:<30} {r['seconds'] * 1000:9.1f} ms {r['rows_per_second']:12,.0f} rows/s "
+              f"{req} req/s {r['peak_mb']:8.1f} MB peak")
+
+    for name in results:
+        if name + '_reference' in results:
+            print(f"{name}: {results[name + '_reference']['seconds'] / results[name]['seconds']:.1f}x as fast as "
+                  f"the reference implementation")
+
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"saved baseline to {args.baseline}")
+        return 0
+
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for regression in regressions:
+            print('REGRESSION ' + regression)
+        return 1 if len(regressions) > 0 else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,39 @@
+import pandas as pd
+import pytest
+
+
+def _domain_rows(mtus: pd.DatetimeIndex, rows: int) -> list[dict]:
+    # domain rows like the publication tool returns them, rows cnecs per mtu
+    return [
+        {
+            'id': i,
+            'dateTimeUtc': mtu.tz_convert('UTC').strftime('%Y-%m-%dT%H:%M:%SZ'),
+            'tso': ['TENNETBV', 'ELIA'][i % 2],
+            'tsoEic': ['10X1001A1001A361', '10X1001A1001A094'][i % 2],
+            'cnecName': f'line {i}',
+            'contName': 'Basecase' if i % 3 == 0 else f'trafo {i}',
+            'contingencies': [{'number': 1, 'branchname': f'trafo {i}', 'branchEic': f'EIC {i}'}],
+            'presolved': i % 10 == 0,
+            'ram': 100.0,
+            'ptdf_NL': 0.1,
+        }
+        for mtu in mtus for i in range(rows)
+    ]
+
+
+def _base_rows(mtus: pd.DatetimeIndex) -> list[dict]:
+    # one row per mtu like the base output endpoints (netPos and the like) return them
+    return [
+        {'id': i, 'dateTimeUtc': mtu.tz_convert('UTC').strftime('%Y-%m-%dT%H:%M:%SZ'), 'hub_NL': float(i)}
+        for i, mtu in enumerate(mtus)
+    ]
+
+
+@pytest.fixture()
+def domain_rows():
+    return _domain_rows
+
+
+@pytest.fixture()
+def base_rows():
+    return _base_rows
@@ -5,11 +5,39 @@ from datetime import date
 from suds.client import Client as suds_Client
 from functools import wraps
 from PIL import Image
-from io import BytesIO, StringIO
+from io import BytesIO
 from .parsers import _parse_utility_tool_xml, _parse_maczt_final_flowbased_domain, \
     _parse_utilitytool_xml, _parse_suds_tradingdata
-import numpy as np
 from .definitions import ParseDataSubject
+from ..retry import RetryPolicy, RetrySession
+
+
+class _UtilityToolCSVStream:
+    # file like object over the csv of the utility tool that turns the ; of the header into | and drops the ; before
+    # a |, handing pandas one chunk at a time
+    CHUNK = 2 ** 20
+
+    def __init__(self, content: bytes):
+        header_end = content.find(b'\n') + 1 if b'\n' in content else len(content)
+        self.content = content
+        self.position = header_end
+        self.pending = content[:header_end].replace(b';', b'|')
+
+    def read(self, size: int = -1) -> bytes:
+        size = self.CHUNK if size is None or size < 0 else max(size, 1)
+        while len(self.pending) < size and self.position < len(self.content):
+            chunk = self.content[self.position:self.position + self.CHUNK]
+            self.position += len(chunk)
+            # a ; at the end of a chunk could be followed by the | at the start of the next one
+            held = b';' if chunk.endswith(b';') and self.position < len(self.content) else b''
+            self.pending += (chunk[:-1] if held else chunk).replace(b';|', b'|')
+            if held:
+                self.position -= 1
+        out, self.pending = self.pending[:size], self.pending[size:]
+        return out
+
+    def __iter__(self):
+        return iter(self.read, b'')
 
 
 class JaoUtilityToolASMXClient:
@@ -74,8 +102,8 @@ class JaoUtilityToolASMXClient:
 class JaoUtilityToolCSVClient:
     # this ingests from the same client the excel macros in the utility tool is talking too
     # because of this the endpoints are open and thus no key or captcha is required
-    def __init__(self):
-        self.s = requests.Session()
+    def __init__(self, retry: RetryPolicy = None):
+        self.s = RetrySession(retry)
         self.s.headers.update({
             'user-agent': 'jao-py (github.com/fboerman/jao-py)'
         })
@@ -111,56 +139,22 @@ class JaoUtilityToolCSVClient:
                                        'MaxFR', 'MinALBE', 'MaxALBE', 'MinALDE', 'MaxALDE'], 'Date', xpath='ns:MaxNetPositions/')
 
     def _parse_domain(self, r: requests.Response) -> pd.DataFrame:
-        # do some character formatting so pandas understands the text
-        lines = r.text.replace(';|', "|").split('\r\n')
-        lines[0] = lines[0].replace(';', '|')
-        # load it in a virtual file and give it to pandas
-        stream = StringIO()
-        stream.write("\n".join(lines))
-        stream.seek(0)
-
-        df = pd.read_csv(stream, sep="|")
+        # the header is separated with ; and the rows with |, where some fields end with a stray ;
+        # read it through a stream that fixes this chunk by chunk instead of copying the whole text around
+        df = pd.read_csv(_UtilityToolCSVStream(r.content), sep="|", encoding=r.encoding or 'utf-8')
 
         # check if the dataframe is empty, this should not happen. default flow parameters always return something.
         # throw an error and let the user deal with it
         if len(df) == 0:
             raise ServerReturnedEmptyData
 
-        # parse the date string which is only the day
-        df['DeliveryDate'] = pd.to_datetime(df['DeliveryDate'], format='%d/%m/%Y %H:%M:%S')
-        # insert the hour into the date by combining with the Period column
-
-        # for DST: difficult problem. JAO gives everything in localtime, so we cant use the easy trick of everything in UTC and then later convert
-        # it also gives the hour only as a period number for that day
-        # for now this package solves it the following way: throwing away the double hour in case of clock going backwards
-        # and leaving the hour empty when clock is going forward.
-        # If a reader knows a better way please open an issue or pullrequest on github
-        if df['Period'].max() > 24:
-            # clock going backwards so one extra hour at hour
-            def _shift_hour(row):
-                if row['Period'] < 4: # before clock change
-                    return row['DeliveryDate'].replace(hour=row['Period'] - 1)
-                if row['Period'] == 4: # during clock change
-                    return np.nan
-                if row['Period'] > 4: # after clock change
-                    return row['DeliveryDate'].replace(hour=row['Period'] - 2)
-                return None
-            df['DeliveryDate'] = df.apply(_shift_hour, axis=1)
-        elif df['Period'].max() < 24:
-            # clock going forward so one hour less
-            def _shift_hour(row):
-                if row['Period'] < 3: # before clock change
-                    return row['DeliveryDate'].replace(hour=row['Period'] - 1)
-                if row['Period'] >= 3: # after clock change
-                    return row['DeliveryDate'].replace(hour=row['Period'])
-                return None
-            df['DeliveryDate'] = df.apply(_shift_hour, axis=1)
-        else:
-            # normal time
-            df['DeliveryDate'] = df.apply(lambda row: row['DeliveryDate'].replace(hour=row['Period'] - 1), axis=1)
-        df = df.dropna(subset=['DeliveryDate'])
+        # JAO gives the day in localtime and the hour only as a period number of that day, so 23 periods when the
+        # clock goes forward and 25 when it goes backward. midnight is never ambiguous, so localize that and add
+        # the periods as absolute hours, this keeps both hours of the day the clock goes backward
+        days = pd.to_datetime(df['DeliveryDate'], format='%d/%m/%Y %H:%M:%S', cache=True)
+        df['DeliveryDate'] = pd.DatetimeIndex(days).tz_localize('Europe/Amsterdam') + \
+            pd.to_timedelta(df['Period'].to_numpy() - 1, unit='h')
         df = df.rename(columns={'DeliveryDate': 'timestamp'}).drop(columns=['Period']).set_index('timestamp')
-        df = df.tz_localize('Europe/Amsterdam', ambiguous=True)
 
         # now do some cleanup, remove useless columns and make the ptdf columns more efficient
         df = df.drop(columns=['FileId', 'Row'])
@@ -309,8 +303,8 @@ class JaoUtilityToolXmlClient:
 
     BASEURL = "https://utilitytool.jao.eu"
 
-    def __init__(self):
-        self.s = requests.Session()
+    def __init__(self, retry: RetryPolicy = None):
+        self.s = RetrySession(retry)
         self.s.headers.update({
             'user-agent': 'jao-py (github.com/fboerman/jao-py)'
         })
@@ -5,7 +5,9 @@ from .jao_parrun import JaoPublicationToolPandasIntraDayParRun, JaoPublicationTo
 from .jao_nordic import JaoPublicationToolPandasNordics
 from .webservice import JaoAPIClient
 from .jao_italynorth import JaoPublicationToolItalyNorth, JaoPublicationToolPandasItalyNorth
+from .jao_async import JaoPublicationToolAsyncClient
 
 __all__ = ['JaoPublicationToolClient', 'JaoPublicationToolPandasClient', 'JaoPublicationToolPandasNordics', 'JaoAPIClient',
            'JaoPublicationToolPandasIntraDay', 'JaoPublicationToolPandasIntraDayParRun', 'JaoPublicationToolPandasParRun',
-           'JaoPublicationToolPandasIntraDayIda', 'JaoPublicationToolItalyNorth', 'JaoPublicationToolPandasItalyNorth']
+           'JaoPublicationToolPandasIntraDayIda', 'JaoPublicationToolItalyNorth', 'JaoPublicationToolPandasItalyNorth',
+           'JaoPublicationToolAsyncClient']
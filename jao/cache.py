@@ -0,0 +1,116 @@
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+import time
+from urllib.parse import urlparse
+import pandas as pd
+import requests
+
+
+# endpoint: (time to live in seconds while the data can still change,
+#            age in days of the business day after which the data is final and never expires, None if never final)
+# intraday and italy north endpoints are matched on the part after their prefix, so IDCCA_finalComputation uses finalComputation
+EXPIRY_POLICY = {
+    'finalComputation': (15 * 60, 2),
+    'shadowPrices': (15 * 60, 2),
+    'fbDomainShadowPrice': (15 * 60, 2),
+    'preFinalComputation': (5 * 60, 7),
+    'initialComputation': (5 * 60, 7),
+    'final_domain': (15 * 60, 2),
+    'prefinal_domain': (15 * 60, 7),
+    'monitoring': (60, None),
+}
+DEFAULT_EXPIRY = (15 * 60, 7)
+
+
+class ResponseCache:
+    """
+    on disk cache of successful responses, keyed by url (base url + endpoint) and the normalized query parameters.
+    whether a cached response is still valid depends on the expiry policy of its endpoint: responses stored when their
+    business day was already final never expire, all others expire after the time to live of the endpoint
+    """
+
+    def __init__(self, path: str, policy: dict = None, default: tuple = DEFAULT_EXPIRY):
+        """
+        :param path: directory to store the responses in, created when it does not exist
+        :param policy: dict of endpoint to (time to live in seconds, days after which final), overrides EXPIRY_POLICY
+        :param default: expiry for endpoints not in the policy
+        """
+        self.path = path
+        self.policy = {**EXPIRY_POLICY, **(policy or {})}
+        self.default = default
+        os.makedirs(path, exist_ok=True)
+
+    @staticmethod
+    def _endpoint(url: str) -> str:
+        return urlparse(url).path.rstrip('/').rsplit('/', 1)[-1]
+
+    def _expiry(self, endpoint: str) -> tuple:
+        if endpoint in self.policy:
+            return self.policy[endpoint]
+        return self.policy.get(endpoint.split('_')[-1], self.default)
+
+    @staticmethod
+    def _business_day(url: str, params: dict | None) -> pd.Timestamp | None:
+        # the last business day the response is about, taken from the end of the queried window
+        params = params or {}
+        for k in ['ToUtc', 'ToUTC']:
+            if k in params:
+                return pd.Timestamp(params[k]).tz_convert('Europe/Amsterdam').normalize()
+        # the mirror has the date as last part of the url
+        try:
+            return pd.Timestamp(urlparse(url).path.rstrip('/').rsplit('/', 1)[-1], tz='Europe/Amsterdam')
+        except ValueError:
+            return None
+
+    def _file(self, url: str, params: dict | None) -> str:
+        key = url + '?' + json.dumps(params or {}, sort_keys=True, default=str)
+        return os.path.join(self.path, self._endpoint(url) or '_', hashlib.sha256(key.encode()).hexdigest() + '.gz')
+
+    def _is_valid(self, url: str, params: dict | None, stored_on: float) -> bool:
+        ttl, final_after = self._expiry(self._endpoint(url))
+        day = self._business_day(url, params)
+        if final_after is not None and day is not None:
+            final_on = (day + pd.Timedelta(days=final_after + 1)).timestamp()
+            if stored_on >= final_on:
+                # data was already final when it was stored, so will never change anymore
+                return True
+        return time.time() - stored_on < ttl
+
+    def get(self, url: str, params: dict = None) -> bytes | None:
+        fname = self._file(url, params)
+        try:
+            stored_on = os.path.getmtime(fname)
+            if not self._is_valid(url, params, stored_on):
+                return None
+            with gzip.open(fname, 'rb') as f:
+                return f.read()
+        except (FileNotFoundError, OSError, EOFError):
+            return None
+
+    def set(self, url: str, params: dict | None, content: bytes):
+        fname = self._file(url, params)
+        os.makedirs(os.path.dirname(fname), exist_ok=True)
+        # write to a temporary file first so parallel readers never see half a response
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(fname))
+        with os.fdopen(fd, 'wb') as f:
+            f.write(gzip.compress(content, compresslevel=3))
+        os.replace(tmp, fname)
+
+    def response(self, url: str, content: bytes) -> requests.Response:
+        # rebuild a response object so the callers cannot tell the difference with a fresh one
+        r = requests.Response()
+        r.status_code = 200
+        r.url = url
+        r.encoding = 'utf-8'
+        r._content = content
+        r.from_cache = True
+        return r
+
+    def clear(self):
+        for root, _, files in os.walk(self.path):
+            for fname in files:
+                if fname.endswith('.gz'):
+                    os.remove(os.path.join(root, fname))
@@ -0,0 +1,73 @@
+import argparse
+import sys
+from .jao import JaoPublicationToolPandasClient
+from .jao_nordic import JaoPublicationToolPandasNordics
+from .jao_intraday import JaoPublicationToolPandasIntraDay
+from .jao_italynorth import JaoPublicationToolPandasItalyNorth
+from .sync import JaoSync, ENDPOINTS, IBWT_ENDPOINTS
+from .export import JaoExport
+
+
+REGIONS = ['core', 'nordic', 'coreID-a', 'coreID-b', 'coreID-c', 'coreID-d', 'ibwt']
+
+
+def _client(region: str, api_key: str = None, workers: int = 8, rate_limit: int = 100):
+    kwargs = {'api_key': api_key, 'max_workers': workers, 'rate_limit': rate_limit or None}
+    if region == 'core':
+        return JaoPublicationToolPandasClient(**kwargs)
+    if region == 'nordic':
+        return JaoPublicationToolPandasNordics(**kwargs)
+    if region.startswith('coreID-'):
+        return JaoPublicationToolPandasIntraDay(region.split('-')[1], **kwargs)
+    if region == 'ibwt':
+        return JaoPublicationToolPandasItalyNorth(**kwargs)
+    raise ValueError(f"unknown region {region}, choose from {REGIONS}")
+
+
+def _sync(args):
+    with _client(args.region, args.api_key, args.workers, args.rate_limit) as client:
+        done = JaoSync(client, args.store, args.endpoints.split(',')).sync(args.d_from, args.d_to)
+    for endpoint, day, action in done:
+        print(f"{endpoint} {day.strftime('%Y-%m-%d')} {action}")
+    print(f"synced {len(done)} partitions")
+
+
+def _export(args):
+    with _client(args.region, args.api_key, args.workers, args.rate_limit) as client:
+        done = JaoExport(client, args.store, args.endpoints.split(','), overwrite=args.overwrite) \
+            .export(args.d_from, args.d_to)
+    for endpoint, day, _ in done:
+        print(f"{endpoint} {day.strftime('%Y-%m-%d')}")
+    print(f"exported {len(done)} partitions")
+
+
+def main(argv: list[str] = None):
+    parser = argparse.ArgumentParser(prog='jao', description='command line tools of jao-py')
+    parser.add_argument('--region', default='core', choices=REGIONS)
+    parser.add_argument('--api-key', default=None)
+    parser.add_argument('--workers', type=int, default=8, help='amount of requests in parallel')
+    parser.add_argument('--rate-limit', type=int, default=100, help='requests per minute, 0 to not hold back')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    sync = commands.add_parser('sync', help='keep a local partitioned store up to date')
+    sync.add_argument('--store', required=True, help='root directory of the store')
+    sync.add_argument('--endpoints', required=True, help=f'comma separated list, from: {",".join(ENDPOINTS)}')
+    sync.add_argument('--from', dest='d_from', required=True, help='first business day, YYYY-MM-DD')
+    sync.add_argument('--to', dest='d_to', required=True, help='last business day, YYYY-MM-DD')
+    sync.set_defaults(func=_sync)
+
+    export = commands.add_parser('export', help='bulk export to a local partitioned store, skips what is stored already')
+    export.add_argument('--store', required=True, help='root directory of the store')
+    export.add_argument('--endpoints', required=True,
+                        help=f'comma separated list, from: {",".join(ENDPOINTS)} (ibwt: {",".join(IBWT_ENDPOINTS)})')
+    export.add_argument('--from', dest='d_from', required=True, help='first business day, YYYY-MM-DD')
+    export.add_argument('--to', dest='d_to', required=True, help='last business day, YYYY-MM-DD')
+    export.add_argument('--overwrite', action='store_true', help='export stored partitions again')
+    export.set_defaults(func=_export)
+
+    args = parser.parse_args(argv)
+    args.func(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,496 @@
+import itertools
+import numpy as np
+import pandas as pd
+
+
+class FlowBasedDomain:
+    """
+    dense numpy representation of flowbased domains for calculations, built once from the dataframe of
+    parse_final_domain (any of the final, prefinal or initial domain queries) with FlowBasedDomain.from_frame.
+
+    the rows are sorted on mtu so every mtu is one contiguous block, slicing out an mtu with mtu() gives views
+    on the same arrays instead of copies:
+        ptdf: (n_cnec, n_zone) C contiguous zone to slack ptdfs, columns in the order of zones
+        ram: (n_cnec,) remaining available margins
+        mtu_index, cnec_index, contingency_index: (n_cnec,) positions of every row in mtus, cnecs and contingencies,
+            -1 where the frame had no value
+        rows: (n_cnec,) position of every row in the frame it was built from
+        offsets: (n_mtu + 1,) rows of mtu i are offsets[i]:offsets[i + 1]
+    """
+    # rows per batch of flows(), bounds the memory of the gathered ptdfs
+    CHUNK = 2 ** 20
+    # cnecs per mtu project() clips with before dropping the ones that no longer cut
+    CLIP = 4
+    # other names of zones. the ptdfs of the domain are of DE, the net positions of the pandas clients of DE_LU
+    ZONE_ALIASES = {'DE': ['DE_LU'], 'DE_LU': ['DE']}
+
+    def __init__(self, ptdf: np.ndarray, ram: np.ndarray, zones: list[str], mtus: pd.DatetimeIndex,
+                 offsets: np.ndarray, mtu_index: np.ndarray, cnecs: pd.Index, cnec_index: np.ndarray,
+                 contingencies: pd.Index, contingency_index: np.ndarray, rows: np.ndarray):
+        self.ptdf = ptdf
+        self.ram = ram
+        self.zones = zones
+        self.mtus = mtus
+        self.offsets = offsets
+        self.mtu_index = mtu_index
+        self.cnecs = cnecs
+        self.cnec_index = cnec_index
+        self.contingencies = contingencies
+        self.contingency_index = contingency_index
+        self.rows = rows
+        self._zone_positions = {z: i for i, z in enumerate(zones)}
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, zones: list[str] = None, cnec: str = None, contingency: str = None,
+                   dtype=np.float64) -> 'FlowBasedDomain':
+        """
+        :param df: domain as returned by the pandas clients (parse_final_domain)
+        :param zones: zones to take the ptdfs of, in this order. defaults to all ptdf_ columns of the frame
+        :param cnec: column identifying the cnecs, defaults to cnec_eic or else cnec_name
+        :param contingency: column identifying the contingencies, defaults to cont_name or else
+            contingency_branchname
+        :param dtype: float type of ptdf and ram, float32 halves the memory
+        """
+        if zones is None:
+            zones = [c[len('ptdf_'):] for c in df.columns if c.startswith('ptdf_')]
+        if len(zones) == 0:
+            raise ValueError("no ptdf columns in the frame")
+        cnec = cnec if cnec is not None else _first_column(df, ['cnec_eic', 'cnec_name'])
+        contingency = contingency if contingency is not None else \
+            _first_column(df, ['cont_name', 'contingency_branchname'])
+
+        # stable sort on mtu keeps the order of jao within an mtu
+        mtu_codes, mtus = pd.factorize(df['mtu'], sort=True)
+        rows = np.argsort(mtu_codes, kind='stable')
+        mtu_index = mtu_codes[rows]
+        offsets = np.searchsorted(mtu_index, np.arange(len(mtus) + 1))
+
+        # one copy out of the frame straight into a C ordered array, everything after that are views
+        ptdf = np.empty((len(df), len(zones)), dtype=dtype)
+        for i, z in enumerate(zones):
+            ptdf[:, i] = df['ptdf_' + z].to_numpy(dtype=dtype, na_value=0)[rows]
+        ram = df['ram'].to_numpy(dtype=dtype, na_value=np.nan)[rows]
+
+        cnec_index, cnecs = _factorize(df, cnec, rows)
+        contingency_index, contingencies = _factorize(df, contingency, rows)
+        return cls(ptdf, ram, list(zones), pd.DatetimeIndex(mtus), offsets, mtu_index, cnecs, cnec_index,
+                   contingencies, contingency_index, rows)
+
+    def __len__(self) -> int:
+        return len(self.ram)
+
+    def _subset(self, start: int, stop: int, mtus: slice) -> 'FlowBasedDomain':
+        offsets = self.offsets[mtus.start:mtus.stop + 1] - start
+        return FlowBasedDomain(
+            self.ptdf[start:stop], self.ram[start:stop], self.zones, self.mtus[mtus], offsets,
+            self.mtu_index[start:stop] - mtus.start, self.cnecs, self.cnec_index[start:stop], self.contingencies,
+            self.contingency_index[start:stop], self.rows[start:stop]
+        )
+
+    def mtu(self, mtu: pd.Timestamp) -> 'FlowBasedDomain':
+        """
+        domain of one mtu, ptdf and ram are views on the ones of this domain
+        """
+        i = self.mtus.get_loc(mtu)
+        return self._subset(self.offsets[i], self.offsets[i + 1], slice(i, i + 1))
+
+    def mtu_range(self, d_from: pd.Timestamp, d_to: pd.Timestamp) -> 'FlowBasedDomain':
+        """
+        domain of the mtus in [d_from, d_to), ptdf and ram are views on the ones of this domain
+        """
+        i, j = self.mtus.searchsorted(d_from), self.mtus.searchsorted(d_to)
+        return self._subset(self.offsets[i], self.offsets[j], slice(i, j))
+
+    def iter_mtus(self):
+        """
+        yields (mtu, domain of that mtu) for every mtu
+        """
+        for i, mtu in enumerate(self.mtus):
+            yield mtu, self._subset(self.offsets[i], self.offsets[i + 1], slice(i, i + 1))
+
+    def _names(self, zone: str) -> list[str]:
+        return [zone] + self.ZONE_ALIASES.get(zone, [])
+
+    def zone_positions(self, zones: list[str]) -> np.ndarray:
+        # zones can also be given by one of their ZONE_ALIASES
+        positions = []
+        for z in zones:
+            position = next((self._zone_positions[n] for n in self._names(z) if n in self._zone_positions), None)
+            if position is None:
+                raise ValueError(f"unknown zone {z}, choose from {self.zones}")
+            positions.append(position)
+        return np.array(positions, dtype=np.intp)
+
+    def borders(self) -> list[tuple[str, str]]:
+        """
+        every ordered pair of zones
+        """
+        return list(itertools.permutations(self.zones, 2))
+
+    def zone_to_zone(self, borders: list[tuple[str, str]] = None) -> np.ndarray:
+        """
+        zone to zone ptdfs, the change of flow on every cnec for 1 MW exchanged from one zone to the other:
+            ptdf[:, from] - ptdf[:, to]
+
+        :param borders: list of (from zone, to zone), defaults to borders() so every ordered pair of zones
+        :return: (n_cnec, n_border) array, columns in the order of borders
+        """
+        borders = self.borders() if borders is None else borders
+        if len(borders) == 0:
+            return np.empty((len(self), 0), dtype=self.ptdf.dtype)
+        zones_from, zones_to = zip(*borders)
+        return self.ptdf[:, self.zone_positions(zones_from)] - self.ptdf[:, self.zone_positions(zones_to)]
+
+    def net_positions(self, df: pd.DataFrame) -> tuple[pd.DatetimeIndex, np.ndarray]:
+        """
+        net positions as (timestamps, (n_timestamp, n_zone) array in the order of zones)
+
+        :param df: net positions indexed by mtu, with a column per zone named either hub_<zone> or just <zone>
+            (as returned by query_net_position_fromto of the plain and the pandas client), or one of its
+            ZONE_ALIASES instead of <zone>
+        """
+        columns = []
+        for z in self.zones:
+            column = _first_column(df, [c for n in self._names(z) for c in ('hub_' + n, n)])
+            if column is None:
+                raise ValueError(f"no net position of zone {z} in the frame")
+            columns.append(column)
+        return pd.DatetimeIndex(df.index), df[columns].to_numpy(dtype=self.ptdf.dtype)
+
+    def flows(self, net_positions: pd.DataFrame, tolerance: float = 1.0) -> 'FlowResult':
+        """
+        flows on all cnecs for the net positions of every timestamp, batched over the whole range at once:
+            flow = ptdf . net positions, margin = ram - flow
+        every timestamp is checked against the domain of the latest mtu at or before it, so quarter hourly net
+        positions can be checked against hourly domains. timestamps before the first mtu or more than the mtu
+        resolution after the last one are left out
+
+        :param net_positions: as accepted by net_positions(), for example the output of query_net_position_fromto
+        :param tolerance: MW of margin under which a cnec counts as binding
+        """
+        timestamps, values = self.net_positions(net_positions)
+        k = self.mtus.searchsorted(timestamps, side='right') - 1
+        valid = k >= 0
+        valid[valid] = timestamps[valid] - self.mtus[k[valid]] < self.resolution()
+        timestamps, values, k = timestamps[valid], values[valid], k[valid]
+
+        # every timestamp gets the rows of its mtu, gathered in one go
+        sizes = self.offsets[k + 1] - self.offsets[k]
+        offsets = np.concatenate([[0], np.cumsum(sizes)])
+        rows = np.arange(offsets[-1]) - np.repeat(offsets[:-1] - self.offsets[k], sizes)
+        timestamp_index = np.repeat(np.arange(len(timestamps)), sizes)
+
+        # in chunks so the gathered ptdfs never get much bigger than the domain itself
+        flow = np.empty(len(rows), dtype=self.ptdf.dtype)
+        chunk = max(len(self), self.CHUNK)
+        for start in range(0, len(rows), chunk):
+            stop = min(start + chunk, len(rows))
+            flow[start:stop] = np.einsum(
+                'ij,ij->i', self.ptdf[rows[start:stop]], values[timestamp_index[start:stop]]
+            )
+        return FlowResult(self, timestamps, offsets, rows, flow, self.ram[rows] - flow, tolerance)
+
+    def project(self, x: str, y: str, base: dict[str, float] | pd.DataFrame = None, slack: str = None,
+                bound: float = 1e5, tolerance: float = 1e-6) -> 'DomainPolygons':
+        """
+        the domain of every mtu in the plane of the net positions of zones x and y, as the polygons of the usual
+        domain plots. the net positions of all other zones are kept fixed at base, so every cnec is a half plane
+            ptdf[x] * np_x + ptdf[y] * np_y <= ram - sum of ptdf[z] * base[z] over the other zones
+        the half planes of all mtus are intersected at once: a square of +-bound around the origin is clipped
+        with the tightest few cnecs of every mtu, after which the cnecs that can no longer cut the polygon of
+        their mtu are dropped in one go, until none are left
+
+        :param x, y: zones on the axes
+        :param base: net positions of the other zones, (fixed) MW per zone or a frame indexed by mtu as accepted
+            by net_positions(). defaults to zero
+        :param slack: zone that balances the net positions, so its net position is minus the sum of all others
+            and its base is ignored. by default there is no balance, like the zone to slack ptdfs themselves
+        :param bound: MW the polygons are cut off at where the domain is open, those edges have no cnec
+        :param tolerance: MW a cnec has to cut a polygon by to count
+        """
+        axes = self.zone_positions([x, y])
+        if x == y:
+            raise ValueError("x and y have to be different zones")
+        fixed = self._fixed(base)
+        fixed[:, axes] = 0
+        a = self.ptdf[:, axes].astype(np.float64)
+        # with a slack the ptdfs become ptdf - ptdf[slack], the flow of the fixed net positions goes down by
+        # ptdf[slack] times their sum
+        if slack is not None:
+            s = self.zone_positions([slack])[0]
+            if s in axes:
+                raise ValueError("the slack zone can not be on one of the axes")
+            fixed[:, s] = 0
+            a -= self.ptdf[:, [s]]
+        c = self.ram.astype(np.float64)
+        if (fixed != fixed[:1]).any():
+            c -= np.einsum('ij,ij->i', self.ptdf, fixed[self.mtu_index])
+        elif len(fixed) > 0 and fixed[0].any():
+            c -= self.ptdf @ fixed[0]
+        if slack is not None:
+            c += self.ptdf[:, s] * fixed.sum(axis=1)[self.mtu_index]
+
+        # tightest cnecs first (closest to the origin along their normal), they shrink the polygons fastest.
+        # the rows are already in order of mtu, a stable sort on mtu after the one on closeness keeps that
+        usable = np.flatnonzero(np.isfinite(c))
+        norm = np.linalg.norm(a[usable], axis=1)
+        closeness = np.divide(c[usable], norm, out=np.where(c[usable] < 0, -np.inf, np.inf), where=norm > 0)
+        remaining = usable[np.argsort(closeness, kind='stable')]
+        remaining = remaining[np.argsort(self.mtu_index[remaining], kind='stable')]
+
+        n_mtu = len(self.mtus)
+        vertices = np.tile(np.array([[-bound, -bound], [bound, -bound], [bound, bound], [-bound, bound]],
+                                    dtype=np.float64), (n_mtu, 1, 1))
+        edges = np.full((n_mtu, 4), -1, dtype=np.intp)
+        counts = np.full(n_mtu, 4, dtype=np.intp)
+        while len(remaining) > 0:
+            remaining = remaining[self._cuts(vertices, counts, a[remaining], c[remaining],
+                                             self.mtu_index[remaining], tolerance)]
+            m = self.mtu_index[remaining]
+            rank = np.arange(len(remaining)) - np.searchsorted(m, m)
+            for k in range(self.CLIP):
+                rows = remaining[rank == k]
+                if len(rows) > 0:
+                    vertices, edges = _clip(vertices, edges, counts, self.mtu_index[rows], a[rows], c[rows], rows,
+                                            tolerance)
+            remaining = remaining[rank >= self.CLIP]
+        return DomainPolygons(self, x, y, *_flatten(vertices, edges, counts, tolerance))
+
+    def _fixed(self, base: dict[str, float] | pd.DataFrame | None) -> np.ndarray:
+        # (n_mtu, n_zone) net positions per mtu
+        fixed = np.zeros((len(self.mtus), len(self.zones)))
+        if isinstance(base, pd.DataFrame):
+            timestamps, values = self.net_positions(base)
+            i = timestamps.get_indexer(self.mtus)
+            if (i < 0).any():
+                raise ValueError(f"no net positions for mtu {self.mtus[np.argmax(i < 0)]}")
+            fixed[:] = values[i]
+        elif base is not None:
+            for z, value in base.items():
+                fixed[:, self.zone_positions([z])[0]] = value
+        return fixed
+
+    def _cuts(self, vertices: np.ndarray, counts: np.ndarray, a: np.ndarray, c: np.ndarray, mtu_index: np.ndarray,
+              tolerance: float) -> np.ndarray:
+        # which half planes cut off a vertex of the current polygon of their mtu, in chunks that bound the memory
+        # of the gathered vertices
+        out = np.empty(len(c), dtype=bool)
+        chunk = max(1, self.CHUNK // vertices.shape[1])
+        valid = np.arange(vertices.shape[1]) < counts[:, None]
+        for start in range(0, len(c), chunk):
+            stop = min(start + chunk, len(c))
+            m = mtu_index[start:stop]
+            reach = np.einsum('kvj,kj->kv', vertices[m], a[start:stop]) - c[start:stop, None]
+            out[start:stop] = (np.where(valid[m], reach, -np.inf) > tolerance).any(axis=1)
+        return out
+
+    def resolution(self) -> pd.Timedelta:
+        """
+        shortest time between two mtus, one hour when there is only one mtu
+        """
+        if len(self.mtus) < 2:
+            return pd.Timedelta(hours=1)
+        return pd.Timedelta(np.diff(self.mtus.asi8).min(), unit=self.mtus.unit)
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        the ptdfs and rams back as a dataframe with the mtu, cnec and contingency of every row
+        """
+        df = pd.DataFrame(self.ptdf, columns=['ptdf_' + z for z in self.zones])
+        df.insert(0, 'mtu', self.mtus[self.mtu_index])
+        df.insert(1, 'cnec', _labels(self.cnecs, self.cnec_index))
+        df.insert(2, 'contingency', _labels(self.contingencies, self.contingency_index))
+        df.insert(3, 'ram', self.ram)
+        return df
+
+    def __repr__(self):
+        return f"FlowBasedDomain({len(self)} cnecs, {len(self.mtus)} mtus, zones {self.zones})"
+
+
+def _first_column(df: pd.DataFrame, candidates: list[str]) -> str | None:
+    for c in candidates:
+        if c in df.columns:
+            return c
+    return None
+
+
+def _factorize(df: pd.DataFrame, column: str | None, rows: np.ndarray) -> tuple[np.ndarray, pd.Index]:
+    if column is None:
+        return np.full(len(rows), -1, dtype=np.intp), pd.Index([])
+    codes, uniques = pd.factorize(df[column])
+    return codes[rows], pd.Index(uniques)
+
+
+def _labels(index: pd.Index, codes: np.ndarray) -> np.ndarray:
+    # -1 picks the None at the end
+    return np.append(index.to_numpy(dtype=object), None)[codes]
+
+
+def _clip(vertices: np.ndarray, edges: np.ndarray, counts: np.ndarray, mtus: np.ndarray, a: np.ndarray,
+          c: np.ndarray, rows: np.ndarray, tolerance: float) -> tuple[np.ndarray, np.ndarray]:
+    # clips the convex polygons of mtus (one half plane a . v <= c each) in place (sutherland hodgman). every
+    # vertex keeps the row of the edge that starts at it, a polygon can get one vertex more per clip
+    p, e, n = vertices[mtus], edges[mtus], counts[mtus]
+    width = p.shape[1]
+    valid = np.arange(width) < n[:, None]
+    s = np.einsum('kvj,kj->kv', p, a) - c[:, None]
+    inside = s <= tolerance
+    following = np.where(np.arange(1, width + 1) < n[:, None], np.arange(1, width + 1), 0)
+    s_next = np.take_along_axis(s, following, axis=1)
+    crossing = valid & (inside != np.take_along_axis(inside, following, axis=1))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        t = np.where(crossing, s / (s - s_next), 0)
+    q = np.take_along_axis(p, following[..., None], axis=1)
+    # every edge gives its start when inside and then the crossing, which starts an edge on the new row when
+    # leaving and continues the old edge when entering
+    out = np.stack([p, p + t[..., None] * (q - p)], axis=2).reshape(len(mtus), 2 * width, 2)
+    out_edges = np.stack([e, np.where(inside, rows[:, None], e)], axis=2).reshape(len(mtus), 2 * width)
+    keep = np.stack([valid & inside, crossing], axis=2).reshape(len(mtus), 2 * width)
+    n = keep.sum(axis=1)
+    if n.max() > width:
+        extra = n.max() - width
+        vertices = np.concatenate([vertices, np.zeros((len(vertices), extra, 2))], axis=1)
+        edges = np.concatenate([edges, np.full((len(edges), extra), -1, dtype=np.intp)], axis=1)
+        width += extra
+    order = np.argsort(~keep, axis=1, kind='stable')[:, :width]
+    vertices[mtus] = np.take_along_axis(out, order[..., None], axis=1)
+    edges[mtus] = np.take_along_axis(out_edges, order, axis=1)
+    counts[mtus] = n
+    return vertices, edges
+
+
+def _flatten(vertices: np.ndarray, edges: np.ndarray, counts: np.ndarray,
+             tolerance: float) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    # the polygons one after the other, without vertices that coincide with the next one (cnecs through a vertex)
+    valid = np.arange(vertices.shape[1]) < counts[:, None]
+    following = np.where(np.arange(1, vertices.shape[1] + 1) < counts[:, None], np.arange(1, vertices.shape[1] + 1), 0)
+    gap = np.abs(np.take_along_axis(vertices, following[..., None], axis=1) - vertices).max(axis=2)
+    keep = valid & (gap > tolerance)
+    # a polygon that shrunk to a point keeps that point
+    keep[(counts > 0) & ~keep.any(axis=1), 0] = True
+    offsets = np.concatenate([[0], np.cumsum(keep.sum(axis=1))])
+    return offsets, vertices[keep], edges[keep]
+
+
+class DomainPolygons:
+    """
+    polygons of FlowBasedDomain.project(), vertices in counterclockwise order one mtu after the other. vertices
+    of mtu i are offsets[i]:offsets[i + 1], an mtu without vertices has an empty domain for the given base
+        vertices: (n_vertex, 2) net positions of x and y
+        rows: (n_vertex,) position in the arrays of the domain of the cnec of the edge that starts at the vertex,
+            -1 for edges at the bound
+    """
+
+    def __init__(self, domain: FlowBasedDomain, x: str, y: str, offsets: np.ndarray, vertices: np.ndarray,
+                 rows: np.ndarray):
+        self.domain = domain
+        self.x = x
+        self.y = y
+        self.mtus = domain.mtus
+        self.offsets = offsets
+        self.vertices = vertices
+        self.rows = rows
+
+    def __len__(self) -> int:
+        return len(self.mtus)
+
+    def polygon(self, mtu: pd.Timestamp) -> np.ndarray:
+        """
+        (n_vertex, 2) vertices of one mtu
+        """
+        i = self.mtus.get_loc(mtu)
+        return self.vertices[self.offsets[i]:self.offsets[i + 1]]
+
+    def area(self) -> pd.Series:
+        """
+        area of the polygon of every mtu in MW^2 (shoelace formula)
+        """
+        sizes = np.diff(self.offsets)
+        mtu = np.repeat(np.arange(len(self.mtus)), sizes)
+        following = np.arange(1, len(self.vertices) + 1)
+        following[self.offsets[1:][sizes > 0] - 1] = self.offsets[:-1][sizes > 0]
+        x, y = self.vertices[:, 0], self.vertices[:, 1]
+        cross = x * y[following] - x[following] * y
+        return pd.Series(np.bincount(mtu, weights=cross, minlength=len(self.mtus)) / 2,
+                         index=pd.Index(self.mtus, name='mtu'), name='area')
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        every vertex with its mtu and the cnec and contingency of the edge that starts at it
+        """
+        rows = self.rows
+        limited = rows >= 0
+        return pd.DataFrame({
+            'mtu': np.repeat(self.mtus, np.diff(self.offsets)),
+            self.x: self.vertices[:, 0],
+            self.y: self.vertices[:, 1],
+            'cnec': _labels(self.domain.cnecs, np.where(limited, self.domain.cnec_index[rows], -1)),
+            'contingency': _labels(self.domain.contingencies,
+                                   np.where(limited, self.domain.contingency_index[rows], -1)),
+            'row': np.where(limited, self.domain.rows[rows], -1),
+        })
+
+    def __repr__(self):
+        return f"DomainPolygons({self.x}, {self.y}, {len(self.mtus)} mtus, {len(self.vertices)} vertices)"
+
+
+class FlowResult:
+    """
+    flows of FlowBasedDomain.flows(), one row per (timestamp, cnec of the mtu of that timestamp) in order of the
+    timestamps. rows of timestamp i are offsets[i]:offsets[i + 1]
+        flow, margin: (n_row,) flow on the cnec and ram - flow
+        binding: (n_row,) margin under the tolerance, this includes overloaded cnecs (negative margin)
+        rows: (n_row,) position of the cnec in the arrays of the domain
+    """
+
+    def __init__(self, domain: FlowBasedDomain, timestamps: pd.DatetimeIndex, offsets: np.ndarray, rows: np.ndarray,
+                 flow: np.ndarray, margin: np.ndarray, tolerance: float):
+        self.domain = domain
+        self.timestamps = timestamps
+        self.offsets = offsets
+        self.rows = rows
+        self.flow = flow
+        self.margin = margin
+        self.tolerance = tolerance
+        self.binding = margin < tolerance
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def min_margin(self) -> np.ndarray:
+        """
+        (n_timestamp,) smallest margin of every timestamp
+        """
+        if len(self.timestamps) == 0:
+            return np.empty(0, dtype=self.margin.dtype)
+        return np.minimum.reduceat(self.margin, self.offsets[:-1])
+
+    def summary(self) -> pd.DataFrame:
+        """
+        per timestamp: the smallest margin, amount of binding cnecs and if the net positions are within the
+        domain (no margin below -tolerance)
+        """
+        min_margin = self.min_margin()
+        binding = np.add.reduceat(self.binding, self.offsets[:-1]) if len(self.timestamps) > 0 else []
+        return pd.DataFrame({
+            'min_margin': min_margin,
+            'binding': binding,
+            'feasible': min_margin >= -self.tolerance,
+        }, index=pd.Index(self.timestamps, name='mtu'))
+
+    def binding_frame(self) -> pd.DataFrame:
+        """
+        the binding cnecs of every timestamp with their flow, ram and margin
+        """
+        i = np.flatnonzero(self.binding)
+        rows = self.rows[i]
+        timestamps = np.searchsorted(self.offsets, i, side='right') - 1
+        return pd.DataFrame({
+            'mtu': self.timestamps[timestamps],
+            'cnec': _labels(self.domain.cnecs, self.domain.cnec_index[rows]),
+            'contingency': _labels(self.domain.contingencies, self.domain.contingency_index[rows]),
+            'flow': self.flow[i],
+            'ram': self.domain.ram[rows],
+            'margin': self.margin[i],
+            'row': self.domain.rows[rows],
+        })
@@ -1,2 +1,13 @@
+import requests
+
+
 class NoMatchingDataError(Exception):
     pass
+
+
+class IncompleteDataError(Exception):
+    pass
+
+
+class CircuitOpenError(requests.RequestException):
+    pass
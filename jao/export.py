@@ -0,0 +1,42 @@
+import pandas as pd
+from .store import PartitionedStore
+from .sync import JaoSync
+
+
+class JaoExport(JaoSync):
+    """
+    bulk export of endpoints over a range of business days into a PartitionedStore, fetched in parallel on the
+    executor of the client. partitions that are already in the store are skipped, so an interrupted export
+    picks up where it stopped when run again.
+
+    unlike JaoSync the monitoring endpoint is not consulted, so stored days are never refreshed. use JaoSync
+    to keep recent days up to date
+    """
+
+    # stored days are never refreshed, so no monitoring request at all
+    MONITORING = False
+
+    def __init__(self, client, store: PartitionedStore | str, endpoints: list[str], overwrite: bool = False):
+        """
+        :param client: pandas publication tool client to fetch with
+        :param store: PartitionedStore or the root directory of one
+        :param endpoints: names of the endpoints to export, see ENDPOINTS (IBWT_ENDPOINTS for italy north)
+        :param overwrite: fetch and write all partitions again, also the ones already stored
+        """
+        super().__init__(client, store, endpoints)
+        self.overwrite = overwrite
+
+    def plan(self, endpoint: str, day: pd.Timestamp, last_modified: pd.Timestamp | None) -> str | None:
+        if self.overwrite or not self.store.has(endpoint, day):
+            return 'full'
+        return None
+
+    def export(self, d_from, d_to) -> list[tuple[str, pd.Timestamp, str]]:
+        """
+        export all business days from d_from up to and including d_to
+
+        :param d_from: first business day, anything accepted by pandas Timestamp
+        :param d_to: last business day, anything accepted by pandas Timestamp
+        :return: list of (endpoint, business day, 'full') of everything that was written
+        """
+        return self.sync(d_from, d_to)
@@ -1,15 +1,24 @@
 import requests
+from requests.adapters import HTTPAdapter
 import pandas as pd
 import json
-from multiprocessing import Pool
+from concurrent.futures import Executor, ThreadPoolExecutor, ProcessPoolExecutor
 import itertools
-from .exceptions import NoMatchingDataError
-from .parsers import parse_final_domain, parse_base_output, parse_monitoring
+from collections import deque
+from .exceptions import NoMatchingDataError, IncompleteDataError
+from .cache import ResponseCache
+from .ratelimit import RateLimiter, parse_retry_after
+from .retry import RetryPolicy, RetrySession
+from .mirror import MirrorBackend
+from .parsers import parse_final_domain, parse_base_output, parse_monitoring, _compact
 from .util import to_snake_case
-from zipfile import ZipFile
-from io import BytesIO
+from . import metrics
+from .metrics import Observer, QueryStats, RequestEvent
+import functools
 import os
-from time import sleep
+import tempfile
+import threading
+from time import sleep, perf_counter, time
 
 
 __title__ = "jao-py"
@@ -36,13 +45,128 @@ TSO_ALIASES = {
     "ELIA": "10X1001A1001A094",
 }
 
+_worker_sessions = {}
+_worker_state = threading.local()
+
+
+def _run_in_worker(func, args: tuple, submitted: float):
+    # mark the thread as busy so nested fan outs run inline instead of waiting on the (possibly full) executor
+    # the instrumentation of the worker is collected apart and sent back along with the result, also from processes
+    _worker_state.busy = True
+    stats = QueryStats(buffer=True)
+    stats.queued = max(time() - submitted, 0)
+    try:
+        with metrics.collecting(stats):
+            return func(*args), stats
+    finally:
+        _worker_state.busy = False
+
+
+def _observed(func):
+    # instrumentation of the query_* methods, the outermost query of a thread collects the stats of all requests
+    # and parsing done for it. nested queries (the pandas clients calling the plain ones) just add to those
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        if metrics.current() is not None or len(self.observers) == 0:
+            return func(self, *args, **kwargs)
+        stats = QueryStats(func.__name__)
+        start = perf_counter()
+        try:
+            with metrics.collecting(stats):
+                return func(self, *args, **kwargs)
+        except Exception as e:
+            stats.error = e
+            raise
+        finally:
+            stats.seconds = perf_counter() - start
+            metrics.notify(self.observers, 'on_query', stats)
+    return wrapper
+
+
+def _worker_session(headers: dict, proxies: dict, policy: RetryPolicy) -> requests.Session:
+    # one long lived session per process and client configuration, so the connections of a persistent
+    # process pool survive over tasks instead of being thrown away after every page
+    key = json.dumps([headers, proxies, vars(policy)], sort_keys=True, default=str)
+    if key not in _worker_sessions:
+        s = RetrySession(policy)
+        s.headers.update(headers)
+        s.proxies.update(proxies)
+        _worker_sessions[key] = s
+    return _worker_sessions[key]
+
+
 class JaoPublicationToolClientBase:
-    def __init__(self, api_key: str = None, proxies: dict = None):
-        self.s = requests.Session()
+    # pagination of domain queries, the page size is tuned per endpoint to pages of about PAGE_SECONDS
+    PAGE_SIZE = 5000
+    MIN_PAGE_SIZE = 500
+    MAX_PAGE_SIZE = 20000
+    PAGE_SECONDS = 5
+    # how often a request is retried after a 429 before giving up
+    RATE_LIMIT_RETRIES = 5
+    # longest window (ToUTC - FromUTC) that jao accepts per endpoint of range queries, it answers 400 on longer ones
+    # ("Maximum range is 2 days"). two whole business days fit in 48 hours except the ones with the 25 hour DST day,
+    # which are split up. endpoints that accept longer windows can be raised here, windows are then packed with as
+    # many days as fit. endpoints not listed get DEFAULT_MAX_WINDOW
+    MAX_WINDOW = {
+        endpoint: pd.Timedelta(hours=48) for endpoint in [
+            'netPos', 'maxNetPos', 'maxExchanges', 'lta', 'validationReductions', 'validationReductionsATCs',
+            'allocationConstraint', 'spanningDefaultFBP', 'priceSpread', 'scheduledExchanges', 'alphaFactor',
+            'shadowPrices', 'fallbacks', 'intradayAtc', 'intradayNtc', 'd2CF', 'cgmForeCast', 'refprog',
+            'congestionIncome', 'CCR_forecasted', 'CCR_idForecasted', 'CCR_FinalTtcNtc', 'CCR_idFinalTtcNtc',
+            'CCR_allocationConstraint', 'CCR_idAllocationConstraint',
+        ]
+    }
+    DEFAULT_MAX_WINDOW = pd.Timedelta(hours=48)
+    # off by default, jao documents no endpoint that accepts longer windows. set to a timedelta for every endpoint or a
+    # dict of them per endpoint that jao accepts longer windows of: after a query whose windows all came through, the
+    # next one tries windows that much longer, up to LONGEST_WINDOW and never as long as a window jao turned down
+    GROW_WINDOW = None
+    LONGEST_WINDOW = pd.Timedelta(days=7)
+    # mirror of the final and prefinal domain, can be pointed elsewhere with env JAO_MIRROR_URL
+    MIRROR_URL = 'https://mirror.flowbased.eu/dacc/'
+
+    def __init__(self, api_key: str = None, proxies: dict = None, executor: Executor | str | None = 'thread',
+                 max_workers: int = 8, cache: ResponseCache | str | None = None, compact: bool = False,
+                 rate_limit: RateLimiter | int | None = 100, retry: RetryPolicy = None,
+                 observers: list[Observer] = None):
+        """
+        :param api_key: optional api key of the publication tool
+        :param proxies: optional proxies as mandated by the requests library
+        :param executor: how to fan out pages and windows of queries, reused over all calls of this client.
+            'thread' for a thread pool that shares the pooled session of this client,
+            'process' for a persistent process pool,
+            an existing concurrent.futures Executor which is used as is (and not shut down by the client),
+            or None to do all requests one by one in the calling thread
+        :param max_workers: amount of workers for the 'thread' and 'process' executors
+        :param cache: optional on disk response cache, either a ResponseCache or a directory to store it in.
+            when not given the directory in env JAO_CACHE_DIR is used if set
+        :param compact: pandas clients only, return memory compact dataframes: categoricals for repetitive strings,
+            float32 for ptdfs, margins and other floats, and nullable integers and booleans
+        :param rate_limit: client side budget of requests, either a RateLimiter (which can be shared between clients)
+            or an amount of requests per minute. None to send requests without holding back
+        :param retry: how to retry failed requests and when to stop trying, defaults to RetryPolicy()
+        :param observers: Observers that receive an event per request and a summary per query, see jao.metrics
+        """
+        self.s = RetrySession(retry)
         self.s.headers.update({
             'user-agent': f'jao-py {__version__} (github.com/fboerman/jao-py)'
         })
 
+        self.max_workers = max_workers
+        self._own_executor = executor in ('thread', 'process')
+        if executor == 'thread':
+            self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='jao-py')
+            # keep enough connections alive in the session for all workers
+            adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+            self.s.mount('https://', adapter)
+            self.s.mount('http://', adapter)
+        elif executor == 'process':
+            self.executor = ProcessPoolExecutor(max_workers=max_workers)
+        elif executor is None or isinstance(executor, Executor):
+            self.executor = executor
+        else:
+            raise ValueError("executor should be 'thread', 'process', None or a concurrent.futures Executor")
+
         if proxies is not None:
             # proxies should be defined as mandated by the requests library: https://requests.readthedocs.io/en/latest/user/advanced/#proxies
             self.s.proxies.update(proxies)
@@ -52,17 +176,174 @@ class JaoPublicationToolClientBase:
                 'Authorization': 'Bearer ' + api_key
             })
 
+        if cache is None and os.getenv('JAO_CACHE_DIR'):
+            cache = os.getenv('JAO_CACHE_DIR')
+        self.cache = ResponseCache(cache) if isinstance(cache, str) else cache
+
+        self.compact = compact
+        self._page_sizes = {}
+        # the day files of the mirror are kept next to the response cache, or otherwise in JAO_MIRROR_DIR or the
+        # temporary directory of the system
+        if self.cache is not None:
+            mirror_path = os.path.join(self.cache.path, 'mirror')
+        else:
+            mirror_path = os.getenv('JAO_MIRROR_DIR', os.path.join(tempfile.gettempdir(), 'jao-py-mirror'))
+        self.mirror = MirrorBackend(os.getenv('JAO_MIRROR_URL', self.MIRROR_URL), path=mirror_path)
+        # longest windows per endpoint as learned while running, and the shortest ones jao turned down
+        self._max_windows = {}
+        self._rejected_windows = {}
+
         self.NORDIC = 'nordic' in self.BASEURL
         self.version = None # only for intraday
 
-        self.RATE_LIMIT_HANDLER = os.getenv("RATE_LIMIT_HANDLER", 60)
+        self.rate_limiter = RateLimiter(rate_limit) if isinstance(rate_limit, int) else rate_limit
+        # seconds to hold back after a 429 without Retry-After header, 0 to raise the 429 instead
+        self.RATE_LIMIT_HANDLER = float(os.getenv("RATE_LIMIT_HANDLER", 60))
+
+        self.observers = list(observers) if observers is not None else []
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        for name, attr in list(vars(cls).items()):
+            if name.startswith('query_') and callable(attr):
+                setattr(cls, name, _observed(attr))
+
+    def __getstate__(self):
+        # executors cannot be pickled, a copy of the client in a worker process just does its requests one by one
+        # the session is not sent along either, the worker process keeps its own one alive over all tasks
+        state = self.__dict__.copy()
+        state['executor'] = None
+        state['_own_executor'] = False
+        state['s'] = (dict(self.s.headers), dict(self.s.proxies), self.s.policy)
+        # the instrumentation of workers is sent back with their results, observers stay in this process
+        state['observers'] = []
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.s = _worker_session(*state['s'])
+
+    def close(self):
+        if self._own_executor:
+            self.executor.shutdown()
+        self.s.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _starmap(self, func, args: list[tuple], parallel: bool = False) -> list:
+        # every fan out of requests (pages of a domain, windows of a range) goes through here
+        # so it can be swapped out for other means of concurrency, for example by the async client
+        if not parallel or self.executor is None or len(args) <= 1 or getattr(_worker_state, 'busy', False):
+            return list(itertools.starmap(func, args))
+        return [self._merge(*out) for out in self.executor.map(
+            _run_in_worker, itertools.repeat(func), args, itertools.repeat(time())
+        )]
+
+    def _istarmap(self, func, args: list[tuple]):
+        # like _starmap, but yields the results in order as soon as they are in
+        # at most max_workers calls are running ahead of the consumer, so memory stays flat no matter the amount of args
+        if self.executor is None or getattr(_worker_state, 'busy', False):
+            yield from itertools.starmap(func, args)
+            return
+        args = iter(args)
+        pending = deque(
+            self.executor.submit(_run_in_worker, func, a, time()) for a in itertools.islice(args, self.max_workers)
+        )
+        try:
+            while len(pending) > 0:
+                result = self._merge(*pending.popleft().result())
+                for a in itertools.islice(args, 1):
+                    pending.append(self.executor.submit(_run_in_worker, func, a, time()))
+                yield result
+        finally:
+            # consumer stopped early, dont bother with the rest
+            for f in pending:
+                f.cancel()
+
+    def _merge(self, result, stats: QueryStats):
+        # bring the instrumentation of a worker into the query it ran for
+        # its requests are in the totals of the merge already, so the events themselves are only passed on
+        query = metrics.current()
+        if query is not None:
+            query.merge(stats)
+            if query.buffer:
+                query.events.extend(stats.events)
+                return result
+        if len(self.observers) > 0:
+            for event in stats.events:
+                metrics.notify(self.observers, 'on_request', event)
+        return result
+
+    def _record(self, event: RequestEvent):
+        stats = metrics.current()
+        if stats is not None:
+            stats.add(event)
+        if (stats is None or not stats.buffer) and len(self.observers) > 0:
+            metrics.notify(self.observers, 'on_request', event)
+
+    def _json(self, r: requests.Response):
+        stats = metrics.current()
+        if stats is None:
+            return r.json()
+        start = perf_counter()
+        body = r.json()
+        stats.decode += perf_counter() - start
+        return body
+
+    def _get(self, url: str, params: dict = None, stream: bool = False) -> requests.Response:
+        # all requests go through here, served from the cache when a valid copy is available
+        # streamed responses (the day files of the mirror) are left to the caller to read and keep, so they skip
+        # the response cache and count the bytes from the headers
+        start = perf_counter()
+        if self.cache is not None and not stream:
+            content = self.cache.get(url, params)
+            if content is not None:
+                self._record(RequestEvent(url, params, 200, len(content), perf_counter() - start, cached=True))
+                return self.cache.response(url, content)
+        throttled = 0
+        retries = 0
+        for attempt in range(self.RATE_LIMIT_RETRIES + 1):
+            retries += attempt > 0
+            try:
+                # the session takes a token of the rate limiter before every attempt, also the ones it retries
+                r = self.s.get(url, params=params, limiter=self.rate_limiter, stream=stream)
+            except requests.RequestException as e:
+                self._record(RequestEvent(url, params, None, latency=perf_counter() - start - throttled,
+                                          retries=retries, throttled=throttled, error=e))
+                raise
+            retries += getattr(r, 'retries', 0)
+            # keep track of the time held back so it does not count as slow responses in the page size tuning
+            throttled += getattr(r, 'throttled', 0)
+            if r.status_code != 429 or self.RATE_LIMIT_HANDLER <= 0:
+                break
+            # running into the rate limit anyway (other programs, other ips), hold back all requests of this
+            # client as long as jao asks for
+            wait = parse_retry_after(r.headers.get('Retry-After'))
+            wait = self.RATE_LIMIT_HANDLER if wait is None else wait
+            wait_start = perf_counter()
+            if self.rate_limiter is not None:
+                self.rate_limiter.block(wait)
+            else:
+                sleep(wait)
+            throttled += perf_counter() - wait_start
+        _worker_state.throttled = getattr(_worker_state, 'throttled', 0) + throttled
+        size = int(r.headers.get('Content-Length', 0)) if stream else len(r.content)
+        self._record(RequestEvent(url, params, r.status_code, size, perf_counter() - start - throttled,
+                                  retries=retries, throttled=throttled))
+        if self.cache is not None and r.status_code == 200 and not stream:
+            self.cache.set(url, params, r.content)
+        return r
 
     def _starmap_pull(self, url, params, keyname=None):
-        r = self.s.get(url, params=params)
+        r = self._get(url, params=params)
         r.raise_for_status()
         if keyname is not None:
-            return r.json()[keyname]
-        return r.json()
+            return self._json(r)[keyname]
+        return self._json(r)
 
     def _query_domain(
         self,
@@ -78,11 +359,37 @@ class JaoPublicationToolClientBase:
         if not isinstance(mtu, pd.Timestamp) or mtu.tzinfo is None:
             raise Exception("Please use a timezoned pandas Timestamp object for mtu")
 
+        return self._query_domain_fromto(
+            url,
+            d_from=mtu,
+            d_to=mtu + pd.Timedelta(hours=1),
+            presolved=presolved,
+            cne=cne,
+            co=co,
+            tso=tso,
+            urls_only=urls_only,
+        )
+
+    def _domain_params(
+        self,
+        d_from: pd.Timestamp,
+        d_to: pd.Timestamp,
+        presolved: bool | None = None,
+        cne: str | None = None,
+        co: str | None = None,
+        tso: str | list[str] | None = None,
+    ) -> dict:
+        # Guard clause for the window
+        for d in (d_from, d_to):
+            if not isinstance(d, pd.Timestamp) or d.tzinfo is None:
+                raise Exception("Please use timezoned pandas Timestamp objects for d_from and d_to")
+
         # Convert single TSO to list
         tso = [tso] if isinstance(tso, str) else tso
 
-        # Convert MTU to UTC
-        mtu = mtu.tz_convert("UTC")
+        # Convert window to UTC
+        d_from = d_from.tz_convert("UTC")
+        d_to = d_to.tz_convert("UTC")
 
         # Build filter and dump to json
         filter = {}
@@ -96,116 +403,252 @@ class JaoPublicationToolClientBase:
             filter["Tso"] = [
                 TSO_ALIASES.get(t, t) for t in tso
             ]  # Replace aliases if available
-        if len(filter) != 0:
-            filter_json = json.dumps(filter)
-        else:
-            filter_json = None
 
-        # first do a call with zero retrieved data to know how much data is available, then pull all at once
         params = {
-                "FromUtc": mtu.isoformat(),
-                "ToUtc": (mtu + pd.Timedelta(hours=1)).isoformat(),
-                "Skip": 0,
-                "Take": 0,
-            }
-        if filter_json:
-            params['Filter'] = filter_json
-
-        r = self.s.get(
-            self.BASEURL + url,
-            params=params,
-        )
-        r.raise_for_status()
-
-        if r.json()['totalRowsWithFilter'] == 0:
-            raise NoMatchingDataError
+            "FromUtc": d_from.isoformat(),
+            "ToUtc": d_to.isoformat(),
+        }
+        if len(filter) != 0:
+            params['Filter'] = json.dumps(filter)
+        return params
 
-        # now do new call with all data requested
-        # jao servers are not great returning it all at once, but they let you choose your own pagination
-        # lets go for chunks of 5000, arbitrarily chosen
-
-        total_num_data = r.json()['totalRowsWithFilter']
-        args = []
-        for i in range(0, total_num_data, 5000):
-            params = {
-                "FromUtc": mtu.isoformat(),
-                "ToUtc": (mtu + pd.Timedelta(hours=1)).isoformat(),
-                "Skip": i,
-                "Take": 5000,
-            }
-            if filter_json:
-                params['Filter'] = filter_json
-            args.append(
-                (
-                    self.BASEURL + url,
-                    params,
-                    "data",
-                )
-            )
+    def _query_domain_fromto(
+        self,
+        url: str,
+        d_from: pd.Timestamp,
+        d_to: pd.Timestamp,
+        presolved: bool | None = None,
+        cne: str | None = None,
+        co: str | None = None,
+        tso: str | list[str] | None = None,
+        urls_only: bool = False,
+    ):
+        # queries all mtus starting in [d_from, d_to), paginated over the whole window at once
+        params = self._domain_params(d_from, d_to, presolved=presolved, cne=cne, co=co, tso=tso)
 
         if urls_only:
-            return args
-
-        with Pool() as pool:
-            results = pool.starmap(self._starmap_pull, args)
+            # a page of one row is enough to know how much data is available
+            total = self._domain_total(self.BASEURL + url, params)
+            take = self._page_size(self.BASEURL + url)
+            return [(self.BASEURL + url, {**params, "Skip": i, "Take": min(take, total - i)}, "data")
+                    for i in range(0, total, take)]
+
+        # the first page doubles as the count of how much data is available, then pull the rest all at once
+        # when the data changed in between the count does not add up anymore, then the whole window is pulled again
+        for attempt in range(2):
+            first, args, total = self._domain_pages(self.BASEURL + url, params)
+            results = self._starmap(self._pull_page, args, parallel=True)
+            data = list(itertools.chain(first, *results))
+            if len(data) == total:
+                return data
+        raise IncompleteDataError(f"jao announced {total} rows for {url} but returned {len(data)}")
+
+    def _iter_query_domain_fromto(
+        self,
+        url: str,
+        d_from: pd.Timestamp,
+        d_to: pd.Timestamp,
+        presolved: bool | None = None,
+        cne: str | None = None,
+        co: str | None = None,
+        tso: str | list[str] | None = None,
+    ):
+        # same as _query_domain_fromto but yields the data page by page as it comes in
+        params = self._domain_params(d_from, d_to, presolved=presolved, cne=cne, co=co, tso=tso)
+        first, args, total = self._domain_pages(self.BASEURL + url, params)
+        yield first
+        rows = len(first)
+        for page in self._istarmap(self._pull_page, args):
+            if len(page) == 0:
+                continue
+            rows += len(page)
+            yield page
+        # pages are already handed out, so pulling again is up to the caller
+        if rows != total:
+            raise IncompleteDataError(f"jao announced {total} rows for {url} but returned {rows}")
+
+    def _page_size(self, url: str) -> int:
+        # with a cache the pages are kept fixed, otherwise cached pages would not match anymore once the size changed
+        if self.cache is not None:
+            return self.PAGE_SIZE
+        return self._page_sizes.get(url, self.PAGE_SIZE)
+
+    def _tune_page_size(self, url: str, rows: int, latency: float):
+        # aim for pages that take PAGE_SECONDS to come in, at most doubling or halving the size at a time
+        # short pages (the last one of a query) say too little about the throughput
+        if self.cache is not None or rows < self.MIN_PAGE_SIZE:
+            return
+        size = self._page_size(url)
+        target = rows / max(latency, 1e-3) * self.PAGE_SECONDS
+        target = min(max(target, size / 2, self.MIN_PAGE_SIZE), size * 2, self.MAX_PAGE_SIZE)
+        self._page_sizes[url] = int(target // self.MIN_PAGE_SIZE * self.MIN_PAGE_SIZE)
+
+    def _splittable(self, e: requests.RequestException, take: int) -> bool:
+        # whether a failed page is worth splitting: jao failed on it, not on the request, and it is big enough
+        server_error = not isinstance(e, requests.HTTPError) or e.response.status_code >= 500
+        return server_error and take >= 2 * self.MIN_PAGE_SIZE
+
+    def _pull_page(self, url: str, params: dict, keyname: str = "data") -> list[dict]:
+        # one page of a domain query, split in two when jao chokes on it
+        start = perf_counter()
+        _worker_state.throttled = 0
+        try:
+            data = self._starmap_pull(url, params, keyname)
+        except (requests.HTTPError, requests.ConnectionError, requests.Timeout) as e:
+            if not self._splittable(e, params["Take"]):
+                raise
+            half = params["Take"] // 2
+            if self.cache is None:
+                self._page_sizes[url] = max(self.MIN_PAGE_SIZE, min(self._page_size(url), half))
+            return self._pull_page(url, {**params, "Take": half}, keyname) + \
+                self._pull_page(url, {**params, "Skip": params["Skip"] + half, "Take": params["Take"] - half}, keyname)
+        self._tune_page_size(url, len(data), perf_counter() - start - _worker_state.throttled)
+        stats = metrics.current()
+        if stats is not None:
+            stats.pages += 1
+        if 0 < len(data) < params["Take"]:
+            # jao caps the page below what was asked for, the rest of the page is pulled separately
+            data = data + self._pull_page(
+                url, {**params, "Skip": params["Skip"] + len(data), "Take": params["Take"] - len(data)}, keyname
+            )
+        return data
 
-        return list(itertools.chain(*results))
+    def _domain_total(self, url: str, params: dict) -> int:
+        # amount of rows of a domain query, from a page of a single row
+        r = self._get(url, params={**params, "Skip": 0, "Take": 1})
+        r.raise_for_status()
+        total = self._json(r)['totalRowsWithFilter']
+        if total == 0:
+            raise NoMatchingDataError
+        return total
+
+    def _domain_pages(self, url: str, params: dict, take: int | None = None) -> tuple[list[dict], list[tuple], int]:
+        # the first page tells how much data is available, the rest is planned with the page size tuned on it
+        # returns the data of the first page, the args of the remaining pages for _pull_page and the total row count
+        # every page asks for exactly the rows it should get, so a short page means jao capped it
+        if take is None:
+            take = self._page_size(url)
+        start = perf_counter()
+        _worker_state.throttled = 0
+        try:
+            r = self._get(url, params={**params, "Skip": 0, "Take": take})
+            r.raise_for_status()
+        except (requests.HTTPError, requests.ConnectionError, requests.Timeout) as e:
+            if not self._splittable(e, take):
+                raise
+            if self.cache is None:
+                self._page_sizes[url] = max(self.MIN_PAGE_SIZE, min(self._page_size(url), take // 2))
+            return self._domain_pages(url, params, take // 2)
+        body = self._json(r)
+        stats = metrics.current()
+        if stats is not None:
+            stats.pages += 1
+            stats.mtus += int((pd.Timestamp(params['ToUtc']) - pd.Timestamp(params['FromUtc'])) / pd.Timedelta(hours=1))
+        if body['totalRowsWithFilter'] == 0:
+            raise NoMatchingDataError
+        first = body['data']
+        if not getattr(r, 'from_cache', False):
+            self._tune_page_size(url, len(first), perf_counter() - start - _worker_state.throttled)
+
+        total_num_data = body['totalRowsWithFilter']
+        if 0 < len(first) < min(take, total_num_data):
+            # capped by jao, plan the rest with pages that fit under the cap
+            take = len(first)
+        elif len(first) > 0:
+            take = self._page_size(url)
+        # else jao counted rows but returned none, which tells nothing about a cap. the rest is planned at the size
+        # asked for and the rows missing in the end are reported as incomplete
+        args = [
+            (url, {**params, "Skip": i, "Take": min(take, total_num_data - i)}, "data")
+            for i in range(len(first), total_num_data, take)
+        ]
+        return first, args, total_num_data
 
     def _query_call(self, url: str, type: str, d_from: pd.Timestamp, d_to: pd.Timestamp):
-        return self.s.get(url + type, params={
+        return self._get(url + type, params={
             'FromUTC': d_from.tz_convert('UTC').strftime('%Y-%m-%dT%H:%M:%S.000Z'),
             'ToUTC': d_to.tz_convert('UTC').strftime('%Y-%m-%dT%H:%M:%S.000Z')
         })
 
-    def _query_base_fromto(self, d_from: pd.Timestamp, d_to: pd.Timestamp, type: str, split_days=True) -> list[dict]:
+    def _max_window(self, type: str) -> pd.Timedelta:
+        return self._max_windows.get(type, self.MAX_WINDOW.get(type, self.DEFAULT_MAX_WINDOW))
+
+    def _grow_window(self, type: str, windows: list[tuple]):
+        # the windows of a query all came through, try a day longer next time when they were (about) full
+        # with a cache the windows are kept fixed, otherwise cached windows would not match anymore
+        step = self.GROW_WINDOW.get(type) if isinstance(self.GROW_WINDOW, dict) else self.GROW_WINDOW
+        if step is None or self.cache is not None:
+            return
+        max_window = self._max_window(type)
+        if max(end - start for start, end in windows) <= max_window - pd.Timedelta(days=1):
+            return
+        grown = min(max_window + step, self.LONGEST_WINDOW)
+        if type in self._rejected_windows:
+            grown = min(grown, self._rejected_windows[type] - pd.Timedelta(minutes=1))
+        if grown > max_window:
+            self._max_windows[type] = grown
+
+    @staticmethod
+    def _plan_windows(d_from: pd.Timestamp, d_to: pd.Timestamp, max_window: pd.Timedelta) -> list[tuple]:
+        # pack the SDAC/SIDC business days (so in timezone amsterdam) of [d_from, d_to] into as few windows as possible
+        # that are at most max_window long. a business day runs from 00:00 up to 23:59 local time, which is 23 or 25
+        # hours on DST days because the next day is added in local time. a window is never shorter than one day
+        windows = []
+        start = d_from
+        end = None
+        day = d_from.normalize()
+        while day <= d_to:
+            next_day = day + pd.DateOffset(days=1)
+            day_end = min(next_day - pd.Timedelta(minutes=1), d_to)
+            if end is not None and day_end - start > max_window:
+                windows.append((start, end))
+                start = day
+            end = day_end
+            day = next_day
+        if end is not None:
+            windows.append((start, end))
+        return windows
+
+    def _query_base_window(self, url: str, type: str, d_from: pd.Timestamp, d_to: pd.Timestamp) -> list[dict]:
+        r = self._query_call(url, type, d_from, d_to)
+        if r.status_code == 400 and d_to - d_from > pd.Timedelta(hours=25):
+            # jao does not accept a window this long for this endpoint after all, remember that so later
+            # windows are planned smaller, never grow this long again, and split up this one
+            self._rejected_windows[type] = min(self._rejected_windows.get(type, d_to - d_from), d_to - d_from)
+            self._max_windows[type] = min(self._max_window(type), d_to - d_from - pd.Timedelta(minutes=1))
+            windows = self._plan_windows(d_from, d_to, self._max_window(type))
+            return list(itertools.chain(*(self._query_base_window(url, type, *w) for w in windows)))
+        r.raise_for_status()
+        return self._json(r)['data']
+
+    def _query_base_fromto(self, d_from: pd.Timestamp, d_to: pd.Timestamp, type: str,
+                           baseurl: str = None) -> list[dict]:
+        # baseurl overrides the one of the client for this query only, without touching shared state
+        url = self.BASEURL if baseurl is None else baseurl
         if type in ['monitoring']:
-            url = self.BASEURL.replace('/data/', '/system/')
-        else:
-            url = self.BASEURL
-        # align on SDAC/SIDC business days, so in timezone amsterdam
-        d_from = d_from.tz_convert('Europe/Amsterdam')
-        d_to = d_to.tz_convert('Europe/Amsterdam')
-        data_total = []
-        for day in pd.date_range(d_from.strftime('%Y-%m-%d'), d_to.strftime('%Y-%m-%d'), tz='Europe/Amsterdam', freq='2D'):
-            d_from_part = day
-            if d_from_part < d_from:
-                d_from_part = d_from
-            # for DST days, make sure we always query a full day by doing a string conversion trick
-            # looks a bit ugly, works great
-            d_to_part = pd.Timestamp((day+pd.Timedelta(days=1)).strftime('%Y-%m-%d 23:59'), tz='Europe/Amsterdam')
-            if d_to_part > d_to:
-                d_to_part = d_to
-            r = self._query_call(url, type, d_from_part, d_to_part)
-            if r.status_code == 429 and self.RATE_LIMIT_HANDLER > 0:
-                # running into rate limit, then just wait a minute. This is a VERY naive way of handling things but it works
-                # if you dont want this set DISABLE_RATE_LIMIT_HANDLER=1 and handle 429 yourself
-                sleep(self.RATE_LIMIT_HANDLER)
-                r = self._query_call(url, type, d_from_part, d_to_part)
-            if r.status_code == 400:
-                # at dst it is possible to get 400 error because jao thinks its more days then 2
-                # simply try both of days seperate
-                for d in pd.date_range(d_from_part, d_to_part):
-                    r = self._query_call(url, type,
-                                         pd.Timestamp(d.strftime('%Y-%m-%d'), tz='Europe/Amsterdam'),
-                                         pd.Timestamp(d.strftime('%Y-%m-%d 23:59'), tz='Europe/Amsterdam'))
-                    r.raise_for_status()
-                    data_total += r.json()['data']
-                continue
-            r.raise_for_status()
-            data_total += r.json()['data']
+            url = url.replace('/data/', '/system/')
+        windows = self._plan_windows(
+            d_from.tz_convert('Europe/Amsterdam'), d_to.tz_convert('Europe/Amsterdam'), self._max_window(type)
+        )
+
+        # all windows are known up front, so fetch them in parallel on the executor. the order is kept
+        data_total = list(itertools.chain(*self._starmap(
+            self._query_base_window, [(url, type, *w) for w in windows], parallel=True
+        )))
+        self._grow_window(type, windows)
 
         if len(data_total) == 0:
             raise NoMatchingDataError
         return data_total
 
-    def _query_base_day(self, day: pd.Timestamp, type: str) -> list[dict]:
+    def _query_base_day(self, day: pd.Timestamp, type: str, baseurl: str = None) -> list[dict]:
         d_from = day.replace(hour=0, minute=0)
         d_to = day.replace(hour=23, minute=59)
         return self._query_base_fromto(
             d_from=d_from,
             d_to=d_to,
             type=type,
-            split_days=False
+            baseurl=baseurl
         )
 
 class JaoPublicationToolClient(JaoPublicationToolClientBase):
@@ -270,6 +713,134 @@ class JaoPublicationToolClient(JaoPublicationToolClientBase):
             urls_only=urls_only,
         )
 
+    def query_final_domain_fromto(
+        self,
+        d_from: pd.Timestamp,
+        d_to: pd.Timestamp,
+        presolved: bool = None,
+        cne: str = None,
+        co: str = None,
+        tso: str | list[str] | None = None,
+        urls_only: bool = False,
+    ) -> list[dict]:
+        """
+        query all mtus starting from d_from up to (not including) d_to in one paginated go
+
+        """
+        return self._query_domain_fromto(
+            "finalComputation",
+            d_from=d_from,
+            d_to=d_to,
+            presolved=presolved,
+            cne=cne,
+            co=co,
+            tso=tso,
+            urls_only=urls_only,
+        )
+
+    def query_prefinal_domain_fromto(
+        self,
+        d_from: pd.Timestamp,
+        d_to: pd.Timestamp,
+        presolved: bool = None,
+        cne: str = None,
+        co: str = None,
+        tso: str | list[str] | None = None,
+        urls_only: bool = False,
+    ) -> list[dict]:
+        return self._query_domain_fromto(
+            "preFinalComputation",
+            d_from=d_from,
+            d_to=d_to,
+            presolved=presolved,
+            cne=cne,
+            co=co,
+            tso=tso,
+            urls_only=urls_only,
+        )
+
+    def query_initial_domain_fromto(
+        self,
+        d_from: pd.Timestamp,
+        d_to: pd.Timestamp,
+        presolved: bool = None,
+        cne: str = None,
+        co: str = None,
+        tso: str | list[str] | None = None,
+        urls_only: bool = False,
+    ) -> list[dict]:
+        return self._query_domain_fromto(
+            "initialComputation",
+            d_from=d_from,
+            d_to=d_to,
+            presolved=presolved,
+            cne=cne,
+            co=co,
+            tso=tso,
+            urls_only=urls_only,
+        )
+
+    def iter_final_domain_fromto(
+        self,
+        d_from: pd.Timestamp,
+        d_to: pd.Timestamp,
+        presolved: bool = None,
+        cne: str = None,
+        co: str = None,
+        tso: str | list[str] | None = None,
+    ):
+        """
+        same as query_final_domain_fromto but yields the data per page (a list of at most 5000 dicts) as it comes in
+
+        """
+        yield from self._iter_query_domain_fromto(
+            "finalComputation",
+            d_from=d_from,
+            d_to=d_to,
+            presolved=presolved,
+            cne=cne,
+            co=co,
+            tso=tso,
+        )
+
+    def iter_prefinal_domain_fromto(
+        self,
+        d_from: pd.Timestamp,
+        d_to: pd.Timestamp,
+        presolved: bool = None,
+        cne: str = None,
+        co: str = None,
+        tso: str | list[str] | None = None,
+    ):
+        yield from self._iter_query_domain_fromto(
+            "preFinalComputation",
+            d_from=d_from,
+            d_to=d_to,
+            presolved=presolved,
+            cne=cne,
+            co=co,
+            tso=tso,
+        )
+
+    def iter_initial_domain_fromto(
+        self,
+        d_from: pd.Timestamp,
+        d_to: pd.Timestamp,
+        presolved: bool = None,
+        cne: str = None,
+        co: str = None,
+        tso: str | list[str] | None = None,
+    ):
+        yield from self._iter_query_domain_fromto(
+            "initialComputation",
+            d_from=d_from,
+            d_to=d_to,
+            presolved=presolved,
+            cne=cne,
+            co=co,
+            tso=tso,
+        )
+
     def query_net_position(self, day: pd.Timestamp) -> list[dict]:
         return self._query_base_day(
             day=day,
@@ -341,14 +912,43 @@ class JaoPublicationToolClient(JaoPublicationToolClientBase):
         )
 
 class JaoPublicationToolPandasClient(JaoPublicationToolClient):
-    def _query_mirror(self, name: str, date: str) -> pd.DataFrame:
-        r = requests.get(f'https://mirror.flowbased.eu/dacc/{name}/{date}')
-        if r.status_code != 200:
+    # endpoints of query_day_bundle: (query method, whether it takes a day instead of d_from and d_to,
+    #                                  whether it has one row per mtu)
+    BUNDLE_ENDPOINTS = {
+        'netPos': ('query_net_position', True, True),
+        'maxExchanges': ('query_maxbex', True, True),
+        'maxNetPos': ('query_minmax_np', True, True),
+        'shadowPrices': ('query_active_constraints', True, False),
+        'lta': ('query_lta', False, True),
+        'alphaFactor': ('query_alpha_factor', False, True),
+        'priceSpread': ('query_price_spread', False, True),
+        'scheduledExchanges': ('query_scheduled_exchange', False, True),
+        'congestionIncome': ('query_congestion_income', False, True),
+    }
+
+    def _query_mirror(
+        self,
+        name: str,
+        mtu: pd.Timestamp,
+        presolved: bool | None = None,
+        cne: str | None = None,
+        co: str | None = None,
+        tso: str | list[str] | None = None,
+    ) -> pd.DataFrame | None:
+        # the mtu from the day file of the mirror, filtered like the publication tool does. None if the mirror
+        # does not have the day
+        df = self.mirror.day(self._get, name, mtu.tz_convert('Europe/Amsterdam').strftime('%Y-%m-%d'))
+        if df is None:
             return None
-
-        zf = ZipFile(BytesIO(r.content))
-        zf.namelist()
-        return pd.read_csv(zf.open(zf.namelist()[0]))
+        if tso is not None:
+            # the mirror can have the tso as name or eic, so match on both
+            tso = [tso] if isinstance(tso, str) else tso
+            eics = {TSO_ALIASES.get(t, t) for t in tso}
+            tso = eics | {alias for alias, eic in TSO_ALIASES.items() if eic in eics}
+        df = self.mirror.filter(df, mtu, mtu + pd.Timedelta(hours=1), presolved=presolved, cne=cne, co=co, tso=tso)
+        if len(df) == 0:
+            raise NoMatchingDataError
+        return _compact(df) if self.compact else df
 
     def query_final_domain(
         self,
@@ -358,20 +958,27 @@ class JaoPublicationToolPandasClient(JaoPublicationToolClient):
         co: str = None,
         tso: str | list[str] | None = None,
         use_mirror: bool = False,
+        all_contingencies: bool = False,
     ) -> pd.DataFrame:
         """
-        when use_mirror (or JAO_USE_MIRROR=1 in env) is set the whole day is returned from mirror.flowbased.eu
+        when use_mirror (or JAO_USE_MIRROR=1 in env) is set the mtu is taken from the day file of mirror.flowbased.eu
+        with the same filters applied, falling back on the publication tool when the mirror does not have the day
+        when all_contingencies is set a row is returned for every contingency of a cnec instead of only the first,
+        this is only available from the publication tool
 
         """
-        if (use_mirror or os.environ.get('JAO_USE_MIRROR', '0') == '1') and self.version is None:
-            df = self._query_mirror(name='final_domain', date=mtu.tz_convert('Europe/Amsterdam').strftime('%Y-%m-%d'))
+        if (use_mirror or os.environ.get('JAO_USE_MIRROR', '0') == '1') and self.version is None \
+                and not all_contingencies:
+            df = self._query_mirror('final_domain', mtu=mtu, presolved=presolved, cne=cne, co=co, tso=tso)
             if df is not None:
                 return df
 
         return parse_final_domain(
             super().query_final_domain(
                 mtu=mtu, presolved=presolved, cne=cne, co=co, tso=tso
-            )
+            ),
+            all_contingencies=all_contingencies,
+            compact=self.compact
         )
 
     def query_prefinal_domain(
@@ -382,20 +989,27 @@ class JaoPublicationToolPandasClient(JaoPublicationToolClient):
         co: str = None,
         tso: str | list[str] | None = None,
         use_mirror: bool = False,
+        all_contingencies: bool = False,
     ) -> pd.DataFrame:
         """
-        when use_mirror (or JAO_USE_MIRROR=1 in env) is set the whole day is returned from mirror.flowbased.eu
+        when use_mirror (or JAO_USE_MIRROR=1 in env) is set the mtu is taken from the day file of mirror.flowbased.eu
+        with the same filters applied, falling back on the publication tool when the mirror does not have the day
+        when all_contingencies is set a row is returned for every contingency of a cnec instead of only the first,
+        this is only available from the publication tool
 
         """
-        if (use_mirror or os.environ.get('JAO_USE_MIRROR', '0') == '1') and self.version is None:
-            df = self._query_mirror(name='prefinal_domain', date=mtu.tz_convert('Europe/Amsterdam').strftime('%Y-%m-%d'))
+        if (use_mirror or os.environ.get('JAO_USE_MIRROR', '0') == '1') and self.version is None \
+                and not all_contingencies:
+            df = self._query_mirror('prefinal_domain', mtu=mtu, presolved=presolved, cne=cne, co=co, tso=tso)
             if df is not None:
                 return df
 
         return parse_final_domain(
             super().query_prefinal_domain(
                 mtu=mtu, presolved=presolved, cne=cne, co=co, tso=tso
-            )
+            ),
+            all_contingencies=all_contingencies,
+            compact=self.compact
         )
 
     def query_initial_domain(
@@ -405,41 +1019,153 @@ class JaoPublicationToolPandasClient(JaoPublicationToolClient):
         cne: str = None,
         tso: str | list[str] | None = None,
         co: str = None,
+        all_contingencies: bool = False,
     ) -> pd.DataFrame:
         return parse_final_domain(
             super().query_initial_domain(
                 mtu=mtu, presolved=presolved, cne=cne, co=co, tso=tso
-            )
+            ),
+            all_contingencies=all_contingencies,
+            compact=self.compact
         )
 
+    def query_final_domain_fromto(
+        self,
+        d_from: pd.Timestamp,
+        d_to: pd.Timestamp,
+        presolved: bool = None,
+        cne: str = None,
+        co: str = None,
+        tso: str | list[str] | None = None,
+        all_contingencies: bool = False,
+    ) -> pd.DataFrame:
+        return parse_final_domain(
+            super().query_final_domain_fromto(
+                d_from=d_from, d_to=d_to, presolved=presolved, cne=cne, co=co, tso=tso
+            ),
+            all_contingencies=all_contingencies,
+            compact=self.compact
+        )
+
+    def query_prefinal_domain_fromto(
+        self,
+        d_from: pd.Timestamp,
+        d_to: pd.Timestamp,
+        presolved: bool = None,
+        cne: str = None,
+        co: str = None,
+        tso: str | list[str] | None = None,
+        all_contingencies: bool = False,
+    ) -> pd.DataFrame:
+        return parse_final_domain(
+            super().query_prefinal_domain_fromto(
+                d_from=d_from, d_to=d_to, presolved=presolved, cne=cne, co=co, tso=tso
+            ),
+            all_contingencies=all_contingencies,
+            compact=self.compact
+        )
+
+    def query_initial_domain_fromto(
+        self,
+        d_from: pd.Timestamp,
+        d_to: pd.Timestamp,
+        presolved: bool = None,
+        cne: str = None,
+        co: str = None,
+        tso: str | list[str] | None = None,
+        all_contingencies: bool = False,
+    ) -> pd.DataFrame:
+        return parse_final_domain(
+            super().query_initial_domain_fromto(
+                d_from=d_from, d_to=d_to, presolved=presolved, cne=cne, co=co, tso=tso
+            ),
+            all_contingencies=all_contingencies,
+            compact=self.compact
+        )
+
+    def iter_final_domain_fromto(
+        self,
+        d_from: pd.Timestamp,
+        d_to: pd.Timestamp,
+        presolved: bool = None,
+        cne: str = None,
+        co: str = None,
+        tso: str | list[str] | None = None,
+        all_contingencies: bool = False,
+    ):
+        """
+        yields a parsed dataframe per page as soon as it comes in, for example to write it away directly
+        while keeping memory flat. concatenated they are the same as query_final_domain_fromto
+
+        """
+        for page in super().iter_final_domain_fromto(
+            d_from=d_from, d_to=d_to, presolved=presolved, cne=cne, co=co, tso=tso
+        ):
+            yield parse_final_domain(page, all_contingencies=all_contingencies, compact=self.compact)
+
+    def iter_prefinal_domain_fromto(
+        self,
+        d_from: pd.Timestamp,
+        d_to: pd.Timestamp,
+        presolved: bool = None,
+        cne: str = None,
+        co: str = None,
+        tso: str | list[str] | None = None,
+        all_contingencies: bool = False,
+    ):
+        for page in super().iter_prefinal_domain_fromto(
+            d_from=d_from, d_to=d_to, presolved=presolved, cne=cne, co=co, tso=tso
+        ):
+            yield parse_final_domain(page, all_contingencies=all_contingencies, compact=self.compact)
+
+    def iter_initial_domain_fromto(
+        self,
+        d_from: pd.Timestamp,
+        d_to: pd.Timestamp,
+        presolved: bool = None,
+        cne: str = None,
+        co: str = None,
+        tso: str | list[str] | None = None,
+        all_contingencies: bool = False,
+    ):
+        for page in super().iter_initial_domain_fromto(
+            d_from=d_from, d_to=d_to, presolved=presolved, cne=cne, co=co, tso=tso
+        ):
+            yield parse_final_domain(page, all_contingencies=all_contingencies, compact=self.compact)
+
     def query_allocationconstraint(self, d_from: pd.Timestamp, d_to: pd.Timestamp) -> pd.DataFrame:
         return parse_base_output(
-            super().query_allocationconstraint(d_from=d_from, d_to=d_to)
+            super().query_allocationconstraint(d_from=d_from, d_to=d_to),
+            compact=self.compact
         ).rename(columns=lambda c: c.split('_')[1] + '_' + ('import' if 'Down' in c.split('_')[0] else 'export'))
 
     def query_net_position(self, day: pd.Timestamp) -> pd.DataFrame:
         return parse_base_output(
-            super().query_net_position(day=day)
+            super().query_net_position(day=day),
+            compact=self.compact
         ).rename(columns=lambda x: x.replace('hub_', '')) \
             .rename(columns={'DE': 'DE_LU'})
 
     def query_net_position_fromto(self, d_from: pd.Timestamp, d_to: pd.Timestamp) -> pd.DataFrame:
         return parse_base_output(
-            super().query_net_position_fromto(d_from=d_from, d_to=d_to)
+            super().query_net_position_fromto(d_from=d_from, d_to=d_to),
+            compact=self.compact
         ).rename(columns=lambda x: x.replace('hub_', '')) \
             .rename(columns={'DE': 'DE_LU'})
 
 
     def query_active_constraints(self, day: pd.Timestamp) -> pd.DataFrame:
         return parse_base_output(
-            super().query_active_constraints(day=day)
+            super().query_active_constraints(day=day),
+            compact=self.compact
         ).rename(columns=lambda x: to_snake_case(x) if 'hub' not in x else x) \
             .rename(columns={'id': 'id_original'}) \
             .rename(columns=lambda x: x.replace('hub_', 'ptdf_'))
 
     def query_maxbex(self, day: pd.Timestamp, from_zone: str = None, to_zone: str = None) -> pd.DataFrame:
         df = parse_base_output(
-            super().query_maxbex(day=day)
+            super().query_maxbex(day=day),
+            compact=self.compact
         ).rename(columns=lambda x: x.lstrip('border_').replace('_', '>'))
 
         if from_zone is not None:
@@ -452,17 +1178,20 @@ class JaoPublicationToolPandasClient(JaoPublicationToolClient):
 
     def query_minmax_np(self, day: pd.Timestamp) -> pd.DataFrame:
         return parse_base_output(
-            super().query_minmax_np(day=day)
+            super().query_minmax_np(day=day),
+            compact=self.compact
         )
 
     def query_lta(self, d_from: pd.Timestamp, d_to: pd.Timestamp) -> pd.DataFrame:
         return parse_base_output(
-            super().query_lta(d_from=d_from, d_to=d_to)
+            super().query_lta(d_from=d_from, d_to=d_to),
+            compact=self.compact
         )
 
     def query_validations(self, d_from: pd.Timestamp, d_to: pd.Timestamp) -> pd.DataFrame:
         df = parse_base_output(
-            super().query_validations(d_from=d_from, d_to=d_to)
+            super().query_validations(d_from=d_from, d_to=d_to),
+            compact=self.compact
         ).rename(columns=to_snake_case)
         # sometimes JAO returns some strange data, probably because its still loading, filter that out here
         df = df[~df['tso'].str.contains('CBCO')]
@@ -472,24 +1201,28 @@ class JaoPublicationToolPandasClient(JaoPublicationToolClient):
 
     def query_status(self, d_from: pd.Timestamp, d_to: pd.Timestamp) -> pd.DataFrame:
         return parse_base_output(
-            super().query_status(d_from=d_from, d_to=d_to)
+            super().query_status(d_from=d_from, d_to=d_to),
+            compact=self.compact
         ).drop(columns=['lastModifiedOn'])
 
     def query_alpha_factor(self, d_from: pd.Timestamp, d_to: pd.Timestamp) -> pd.DataFrame:
         return parse_base_output(
-            super().query_alpha_factor(d_from=d_from, d_to=d_to)
+            super().query_alpha_factor(d_from=d_from, d_to=d_to),
+            compact=self.compact
         ).drop(columns=['lastModifiedOn'])
 
     def query_price_spread(self, d_from: pd.Timestamp, d_to: pd.Timestamp) -> (
             pd.DataFrame):
         return parse_base_output(
-            super().query_price_spread(d_from=d_from, d_to=d_to)
+            super().query_price_spread(d_from=d_from, d_to=d_to),
+            compact=self.compact
         )
 
     def query_scheduled_exchange(self, d_from: pd.Timestamp, d_to: pd.Timestamp) -> (
             pd.DataFrame):
         return parse_base_output(
-            super().query_scheduled_exchange(d_from=d_from, d_to=d_to)
+            super().query_scheduled_exchange(d_from=d_from, d_to=d_to),
+            compact=self.compact
         ).drop(columns=['border_DK1_DE', 'border_DE_DK1'])
 
     def query_monitoring(self, day: pd.Timestamp) -> pd.DataFrame:
@@ -499,15 +1232,57 @@ class JaoPublicationToolPandasClient(JaoPublicationToolClient):
 
     def query_d2cf(self, d_from: pd.Timestamp, d_to: pd.Timestamp) -> pd.DataFrame:
         return parse_base_output(
-            super().query_d2cf(d_from=d_from, d_to=d_to)
+            super().query_d2cf(d_from=d_from, d_to=d_to),
+            compact=self.compact
         )
 
     def query_refprog(self, d_from: pd.Timestamp, d_to: pd.Timestamp) -> pd.DataFrame:
         return parse_base_output(
-            super().query_refprog(d_from=d_from, d_to=d_to)
+            super().query_refprog(d_from=d_from, d_to=d_to),
+            compact=self.compact
         )
 
     def query_congestion_income(self, d_from: pd.Timestamp, d_to: pd.Timestamp) -> pd.DataFrame:
         return parse_base_output(
-            super().query_congestion_income(d_from=d_from, d_to=d_to)
+            super().query_congestion_income(d_from=d_from, d_to=d_to),
+            compact=self.compact
         )
+
+    def _query_bundle_part(self, endpoint: str, day: pd.Timestamp) -> pd.DataFrame | None:
+        method, per_day, _ = self.BUNDLE_ENDPOINTS[endpoint]
+        try:
+            if per_day:
+                return getattr(self, method)(day)
+            return getattr(self, method)(day, day + pd.DateOffset(days=1) - pd.Timedelta(minutes=1))
+        except NoMatchingDataError:
+            return None
+
+    def query_day_bundle(self, day: pd.Timestamp, endpoints: list[str] = None) -> dict[str, pd.DataFrame]:
+        """
+        fetch a set of datasets of one business day in parallel, the wait is that of the slowest endpoint
+
+        :param day: timezoned business day
+        :param endpoints: endpoints to fetch from BUNDLE_ENDPOINTS, by default all of them
+        :return: dict of endpoint to dataframe. datasets with one row per mtu share the same mtu index (the mtus of all
+            of them together), shadowPrices keeps a row per active constraint. endpoints without data are left out
+        """
+        if not isinstance(day, pd.Timestamp) or day.tzinfo is None:
+            raise Exception("Please use a timezoned pandas Timestamp object for day")
+        endpoints = list(self.BUNDLE_ENDPOINTS) if endpoints is None else endpoints
+        for endpoint in endpoints:
+            if endpoint not in self.BUNDLE_ENDPOINTS:
+                raise ValueError(f"unknown endpoint {endpoint}, choose from {list(self.BUNDLE_ENDPOINTS)}")
+
+        day = day.tz_convert('Europe/Amsterdam').normalize()
+        dfs = self._starmap(self._query_bundle_part, [(endpoint, day) for endpoint in endpoints], parallel=True)
+        bundle = {endpoint: df for endpoint, df in zip(endpoints, dfs) if df is not None}
+
+        # align the datasets with one row per mtu on the same index so they can be combined directly
+        aligned = [endpoint for endpoint in bundle if self.BUNDLE_ENDPOINTS[endpoint][2]]
+        if len(aligned) > 0:
+            mtus = bundle[aligned[0]].index
+            for endpoint in aligned[1:]:
+                mtus = mtus.union(bundle[endpoint].index)
+            for endpoint in aligned:
+                bundle[endpoint] = bundle[endpoint].reindex(mtus)
+        return bundle
@@ -0,0 +1,82 @@
+import asyncio
+import itertools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial, wraps
+from requests.adapters import HTTPAdapter
+from time import time, perf_counter
+from .jao import JaoPublicationToolClientBase, JaoPublicationToolPandasClient, _run_in_worker, _worker_state
+
+
+class JaoPublicationToolAsyncClient:
+    """
+    asyncio counterpart of the publication tool clients. wraps any of the (pandas) publication tool clients and
+    exposes all of its query_* methods as coroutines, so many queries can run from one event loop.
+
+    the pages of domain queries and the windows of range queries are fired concurrently on a shared pool,
+    with at most max_concurrency requests in flight over all running queries
+    """
+
+    def __init__(self, client: JaoPublicationToolClientBase = None, max_concurrency: int = 8, **kwargs):
+        """
+        :param client: publication tool client to wrap, defaults to JaoPublicationToolPandasClient. it is left as it
+            is and not closed by this wrapper
+        :param max_concurrency: maximum amount of requests in flight at the same time
+        :param kwargs: passed on to JaoPublicationToolPandasClient when no client is given
+        """
+        self._own_client = client is None
+        if client is None:
+            # the client does not need an executor of its own, all fan out happens on the pool of this wrapper
+            client = JaoPublicationToolPandasClient(executor=None, **kwargs)
+            # make sure the session keeps enough connections alive for all requests in flight
+            adapter = HTTPAdapter(pool_connections=max_concurrency, pool_maxsize=max_concurrency)
+            client.s.mount('https://', adapter)
+            client.s.mount('http://', adapter)
+        self._wrapped = client
+        self._pool = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix='jao-py')
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+
+        # a copy of the client that fans out on the pool of this wrapper and takes a slot for every request, so the
+        # client that was passed in keeps working as before. the copy shares its session, cache and rate limiter
+        self._client = object.__new__(type(client))
+        self._client.__dict__.update(client.__dict__)
+        self._client._starmap = self._starmap
+        self._client._get = partial(self._get, partial(type(client)._get, self._client))
+
+    def _get(self, get, *args, **kwargs):
+        # every request of every query waits for a slot, also the ones of queries that do not fan out at all
+        start = perf_counter()
+        with self._slots:
+            # waiting for a slot is no slow response, keep it out of the page size tuning
+            _worker_state.throttled = getattr(_worker_state, 'throttled', 0) + perf_counter() - start
+            return get(*args, **kwargs)
+
+    def _starmap(self, func, args: list[tuple], parallel: bool = False) -> list:
+        # runs in the worker thread of a query, blocks that thread but never the event loop. fan outs from within
+        # a worker of the pool (the windows of an endpoint of query_day_bundle) run inline, waiting on the pool
+        # from inside it deadlocks as soon as all its threads do the same
+        if not parallel or len(args) <= 1 or getattr(_worker_state, 'busy', False):
+            return list(itertools.starmap(func, args))
+        return [self._client._merge(*out) for out in self._pool.map(lambda a: _run_in_worker(func, a, time()), args)]
+
+    def __getattr__(self, name):
+        attr = getattr(self._client, name)
+        if not name.startswith('query_') or not callable(attr):
+            return attr
+
+        @wraps(attr)
+        async def wrapper(*args, **kwargs):
+            return await asyncio.get_running_loop().run_in_executor(None, partial(attr, *args, **kwargs))
+
+        return wrapper
+
+    def close(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        if self._own_client:
+            self._wrapped.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        self.close()
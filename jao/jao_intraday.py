@@ -1,6 +1,6 @@
 from .jao import JaoPublicationToolPandasClient
 import pandas as pd
-from .parsers import parse_base_output
+from .parsers import parse_base_output, parse_monitoring
 
 
 class JaoPublicationToolPandasIntraDay(JaoPublicationToolPandasClient):
@@ -32,17 +32,17 @@ class JaoPublicationToolPandasIntraDay(JaoPublicationToolPandasClient):
     def query_alpha_factor(self, d_from: pd.Timestamp, d_to: pd.Timestamp):
         raise NotImplementedError
 
-    def query_monitoring(self, day: pd.Timestamp) -> list[dict]:
-        # use this quick hack because this monitoring endpoint differs from all others
-        base_url_old = self.BASEURL
-        self.BASEURL = self.BASEURL_BARE
-        data = self._query_base_day(day, 'monitoring')
-        self.BASEURL = base_url_old
-        return data
+    def query_monitoring(self, day: pd.Timestamp) -> pd.DataFrame:
+        # the monitoring endpoint is shared by all versions so it has no prefix. the url is passed along instead of
+        # swapping BASEURL, which would break queries running in parallel
+        return parse_monitoring(
+            self._query_base_day(day, 'monitoring', baseurl=self.BASEURL_BARE)
+        )
 
     def query_sidc_atc(self, day: pd.Timestamp, from_zone: str = None, to_zone: str = None) -> pd.DataFrame:
         df = parse_base_output(
-            self._query_base_day(day, 'intradayAtc')
+            self._query_base_day(day, 'intradayAtc'),
+            compact=self.compact
         ).rename(columns=lambda x: x.lstrip('border_').replace('_', '>'))
 
         if from_zone is not None:
@@ -55,7 +55,8 @@ class JaoPublicationToolPandasIntraDay(JaoPublicationToolPandasClient):
 
     def query_sidc_ntc(self, day: pd.Timestamp, from_zone: str = None, to_zone: str = None) -> pd.DataFrame:
         df = parse_base_output(
-            self._query_base_day(day, 'intradayNtc')
+            self._query_base_day(day, 'intradayNtc'),
+            compact=self.compact
         ).rename(columns=lambda x: x.lstrip('border_').replace('_', '>'))
 
         if from_zone is not None:
@@ -70,7 +71,8 @@ class JaoPublicationToolPandasIntraDay(JaoPublicationToolPandasClient):
         if self.version == 'a':
             raise NotImplementedError
         return parse_base_output(
-            self._query_base_day(day, 'fallbacks')
+            self._query_base_day(day, 'fallbacks'),
+            compact=self.compact
         ).drop(columns=['lastModifiedOn'])
 
 
@@ -78,5 +80,6 @@ class JaoPublicationToolPandasIntraDay(JaoPublicationToolPandasClient):
         if self.version == 'a':
             raise NotImplementedError
         return parse_base_output(
-            self._query_base_day(day, 'validationReductionsATCs')
+            self._query_base_day(day, 'validationReductionsATCs'),
+            compact=self.compact
         )
@@ -2,10 +2,13 @@ from .jao import JaoPublicationToolPandasClient
 import pandas as pd
 
 class JaoPublicationToolPandasIntraDayIda:
-    def __init__(self, version: int, api_key: str = None, proxies: dict = None):
-        self._client = JaoPublicationToolPandasClient(api_key=api_key, proxies=proxies)
+    def __init__(self, version: int, api_key: str = None, proxies: dict = None, **kwargs):
+        self._client = JaoPublicationToolPandasClient(api_key=api_key, proxies=proxies, **kwargs)
         self._client.BASEURL = f"https://publicationtool.jao.eu/coreID/api/data/ID{version}_"
 
+    def close(self):
+        self._client.close()
+
     def query_net_position(self, day: pd.Timestamp) -> pd.DataFrame:
         return self._client.query_net_position(day=day)
 
@@ -61,7 +61,8 @@ class JaoPublicationToolPandasItalyNorth(JaoPublicationToolItalyNorth):
             super().query_cnecs(
                 mtu=mtu,
                 dayahead=dayahead
-            )
+            ),
+            compact=self.compact
         )
 
     def query_grid_forecasts(self,
@@ -70,7 +71,8 @@ class JaoPublicationToolPandasItalyNorth(JaoPublicationToolItalyNorth):
                              dayahead: bool = True
                              ) -> pd.DataFrame:
         return parse_base_output(
-            super().query_grid_forecasts(d_from=d_from, d_to=d_to, dayahead=dayahead)
+            super().query_grid_forecasts(d_from=d_from, d_to=d_to, dayahead=dayahead),
+            compact=self.compact
         )
 
     def query_final_ntc_ttc(self,
@@ -79,7 +81,8 @@ class JaoPublicationToolPandasItalyNorth(JaoPublicationToolItalyNorth):
                              dayahead: bool = True
                              ) -> pd.DataFrame:
         return parse_base_output(
-            super().query_final_ntc_ttc(d_from=d_from, d_to=d_to, dayahead=dayahead)
+            super().query_final_ntc_ttc(d_from=d_from, d_to=d_to, dayahead=dayahead),
+            compact=self.compact
         )
 
     def query_allocation_constraint(self,
@@ -88,5 +91,6 @@ class JaoPublicationToolPandasItalyNorth(JaoPublicationToolItalyNorth):
                              dayahead: bool = True
                              ) -> pd.DataFrame:
         return parse_base_output(
-            super().query_allocation_constraint(d_from=d_from, d_to=d_to, dayahead=dayahead)
+            super().query_allocation_constraint(d_from=d_from, d_to=d_to, dayahead=dayahead),
+            compact=self.compact
         )
@@ -28,7 +28,8 @@ class JaoPublicationToolPandasNordics(JaoPublicationToolPandasClient):
 
     def query_active_constraints(self, mtu: pd.Timestamp, shadow_price_only: bool = False) -> pd.DataFrame:
         df = parse_final_domain(
-            super()._query_domain('fbDomainShadowPrice', mtu=mtu)
+            super()._query_domain('fbDomainShadowPrice', mtu=mtu),
+            compact=self.compact
         )
 
         if shadow_price_only:
@@ -1,6 +1,6 @@
 from .jao import JaoPublicationToolPandasClient
 import pandas as pd
-from .parsers import parse_base_output
+from .parsers import parse_base_output, parse_monitoring
 import warnings
 
 
@@ -9,16 +9,18 @@ class JaoPublicationToolPandasParRun(JaoPublicationToolPandasClient):
 
 
 class JaoPublicationToolPandasIntraDayParRun(JaoPublicationToolPandasClient):
+    BASEURL_BARE = "https://parallelrun-publicationtool.jao.eu/coreID/api/data/"
+
     def __init__(self, version, *args, **kwargs):
         super().__init__(*args, **kwargs)
         if version == 'c':
-            self.BASEURL = "https://parallelrun-publicationtool.jao.eu/coreID/api/data/IDCCC_"
+            self.BASEURL = self.BASEURL_BARE + "IDCCC_"
             warnings.warn("Parallel run of IDCC(c) is over, for production data use the normal client", DeprecationWarning)
         elif version == 'd':
-            self.BASEURL = "https://parallelrun-publicationtool.jao.eu/coreID/api/data/IDCCD_"
+            self.BASEURL = self.BASEURL_BARE + "IDCCD_"
             warnings.warn("Parallel run of IDCC(d) is over, for production data use the normal client", DeprecationWarning)
         elif version == 'e':
-            self.BASEURL = "https://parallelrun-publicationtool.jao.eu/coreID/api/data/IDCCE_"
+            self.BASEURL = self.BASEURL_BARE + "IDCCE_"
         else:
             raise NotImplementedError
 
@@ -34,22 +36,22 @@ class JaoPublicationToolPandasIntraDayParRun(JaoPublicationToolPandasClient):
     def query_alpha_factor(self, d_from: pd.Timestamp, d_to: pd.Timestamp):
         raise NotImplementedError
 
-    def query_monitoring(self, day: pd.Timestamp) -> list[dict]:
-        # use this quick hack because this monitoring endpoint differs from all others
-        base_url_old = self.BASEURL
-        self.BASEURL = self.BASEURL.replace("IDCCC_", '')
-        data = self._query_base_day(day, 'monitoring')
-        self.BASEURL = base_url_old
-        return data
+    def query_monitoring(self, day: pd.Timestamp) -> pd.DataFrame:
+        # the monitoring endpoint is shared by all versions so it has no prefix, see JaoPublicationToolPandasIntraDay
+        return parse_monitoring(
+            self._query_base_day(day, 'monitoring', baseurl=self.BASEURL_BARE)
+        )
 
     def query_fallbacks(self, day: pd.Timestamp) -> pd.DataFrame:
         return parse_base_output(
-            self._query_base_day(day, 'fallbacks')
+            self._query_base_day(day, 'fallbacks'),
+            compact=self.compact
         ).drop(columns=['lastModifiedOn'])
 
     def query_sidc_atc(self, day: pd.Timestamp, from_zone: str = None, to_zone: str = None) -> pd.DataFrame:
         df = parse_base_output(
-            self._query_base_day(day, 'intradayAtc')
+            self._query_base_day(day, 'intradayAtc'),
+            compact=self.compact
         ).rename(columns=lambda x: x.lstrip('border_').replace('_', '>'))
 
         if from_zone is not None:
@@ -62,7 +64,8 @@ class JaoPublicationToolPandasIntraDayParRun(JaoPublicationToolPandasClient):
 
     def query_sidc_ntc(self, day: pd.Timestamp, from_zone: str = None, to_zone: str = None) -> pd.DataFrame:
         df = parse_base_output(
-            self._query_base_day(day, 'intradayNtc')
+            self._query_base_day(day, 'intradayNtc'),
+            compact=self.compact
         ).rename(columns=lambda x: x.lstrip('border_').replace('_', '>'))
 
         if from_zone is not None:
@@ -0,0 +1,232 @@
+import functools
+import threading
+import warnings
+from time import perf_counter
+
+
+# stats of the query running in this thread, None outside of queries
+_current = threading.local()
+
+
+def current():
+    return getattr(_current, 'stats', None)
+
+
+class collecting:
+    # context manager that makes stats the ones of the current thread for its duration
+    def __init__(self, stats):
+        self.stats = stats
+
+    def __enter__(self):
+        self.previous = current()
+        _current.stats = self.stats
+        return self.stats
+
+    def __exit__(self, *exc):
+        _current.stats = self.previous
+
+
+def timed(field: str):
+    """
+    decorator that adds the seconds spent in the function to field of the stats of the running query
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            stats = current()
+            if stats is None:
+                return func(*args, **kwargs)
+            start = perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                setattr(stats, field, getattr(stats, field) + perf_counter() - start)
+        return wrapper
+    return decorator
+
+
+class RequestEvent:
+    """
+    one http request of a client, as passed to Observer.on_request
+
+        endpoint: last part of the url path, for example finalComputation or netPos
+        url, params: of the request
+        status: http status, None when no response came at all (connection errors, time outs, open circuit)
+        bytes: size of the response body
+        latency: seconds from sending the request up to the whole body being in, including retries after server
+            errors but not the time held back by the rate limiter
+        retries: amount of retries, both after server errors and after 429s
+        throttled: seconds held back by the rate limiter and Retry-After
+        cached: served from the response cache
+        error: the exception when the request failed without response
+    """
+    __slots__ = ('endpoint', 'url', 'params', 'status', 'bytes', 'latency', 'retries', 'throttled', 'cached', 'error')
+
+    def __init__(self, url: str, params: dict | None, status: int | None, bytes: int = 0, latency: float = 0,
+                 retries: int = 0, throttled: float = 0, cached: bool = False, error: Exception | None = None):
+        self.endpoint = url.rstrip('/').rsplit('/', 1)[-1]
+        self.url = url
+        self.params = params
+        self.status = status
+        self.bytes = bytes
+        self.latency = latency
+        self.retries = retries
+        self.throttled = throttled
+        self.cached = cached
+        self.error = error
+
+    def __repr__(self):
+        return f"RequestEvent({self.endpoint}, status={self.status}, bytes={self.bytes}, latency={self.latency:.3f})"
+
+
+class QueryStats:
+    """
+    summary of one query_* call of a client, as passed to Observer.on_query
+
+        query: name of the method
+        seconds: wall time of the query
+        requests, retries, bytes, cached: totals over all requests of the query
+        pages: pages pulled of domain queries, mtus: hours of domain data queried
+        network: seconds waiting on jao, summed over all requests
+        decode: seconds spent decoding json
+        parse: seconds spent turning the data into dataframes
+        throttled: seconds held back by the rate limiter and Retry-After
+        queued: seconds pages and windows waited on the executor before a worker picked them up
+        error: the exception the query failed with, None when it succeeded
+
+    the network, decode, throttled and queued seconds are summed over all workers, so with parallel fetching
+    they can add up to more than the wall time
+    """
+
+    def __init__(self, query: str | None = None, buffer: bool = False):
+        self.query = query
+        self.seconds = 0
+        self.requests = 0
+        self.retries = 0
+        self.bytes = 0
+        self.cached = 0
+        self.pages = 0
+        self.mtus = 0
+        self.network = 0
+        self.decode = 0
+        self.parse = 0
+        self.throttled = 0
+        self.queued = 0
+        self.error = None
+        # stats of workers keep their request events until they are merged into the stats of the query
+        self.buffer = buffer
+        self.events = []
+
+    @property
+    def pages_per_mtu(self) -> float:
+        return self.pages / self.mtus if self.mtus > 0 else 0
+
+    def add(self, event: RequestEvent):
+        self.requests += 1
+        self.retries += event.retries
+        self.bytes += event.bytes
+        self.cached += event.cached
+        self.throttled += event.throttled
+        if not event.cached:
+            self.network += event.latency
+        if self.buffer:
+            self.events.append(event)
+
+    def merge(self, other: 'QueryStats'):
+        for field in ('requests', 'retries', 'bytes', 'cached', 'pages', 'mtus', 'network', 'decode', 'parse',
+                      'throttled', 'queued'):
+            setattr(self, field, getattr(self, field) + getattr(other, field))
+
+    def as_dict(self) -> dict:
+        return {
+            'query': self.query, 'seconds': self.seconds, 'requests': self.requests, 'retries': self.retries,
+            'bytes': self.bytes, 'cached': self.cached, 'pages': self.pages, 'mtus': self.mtus,
+            'network': self.network, 'decode': self.decode, 'parse': self.parse, 'throttled': self.throttled,
+            'queued': self.queued, 'error': type(self.error).__name__ if self.error is not None else None,
+        }
+
+    def __repr__(self):
+        return (f"QueryStats({self.query}, seconds={self.seconds:.3f}, requests={self.requests}, "
+                f"network={self.network:.3f}, decode={self.decode:.3f}, parse={self.parse:.3f}, "
+                f"throttled={self.throttled:.3f}, queued={self.queued:.3f})")
+
+
+class Observer:
+    """
+    receives the instrumentation of a client, pass them to the client with observers=[...]. override the methods
+    of interest, both are called in the thread that called the query, also for requests done on the executor.
+    exceptions raised by observers are turned into warnings, metrics never break a query
+    """
+
+    def on_request(self, event: RequestEvent):
+        pass
+
+    def on_query(self, stats: QueryStats):
+        pass
+
+
+def notify(observers: list, method: str, arg):
+    for observer in observers:
+        try:
+            getattr(observer, method)(arg)
+        except Exception as e:
+            warnings.warn(f"observer {observer!r} failed on {method}: {e!r}", RuntimeWarning)
+
+
+class MetricsCollector(Observer):
+    """
+    observer that keeps running totals per endpoint and per query, to be scraped or pushed periodically into
+    a metrics system like prometheus or statsd. snapshot() returns plain dicts:
+
+        {'requests': {endpoint: {'requests', 'errors', 'retries', 'bytes', 'cached', 'latency', 'latency_max',
+                                 'throttled', 'statuses': {status: count}}},
+         'queries': {query: {'queries', 'errors', 'seconds', 'seconds_max', 'requests', 'pages', 'mtus',
+                             'network', 'decode', 'parse', 'throttled', 'queued'}}}
+
+    latency and seconds are sums, divide by the counts for averages
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._requests = {}
+            self._queries = {}
+
+    def on_request(self, event: RequestEvent):
+        with self._lock:
+            m = self._requests.setdefault(event.endpoint, {
+                'requests': 0, 'errors': 0, 'retries': 0, 'bytes': 0, 'cached': 0, 'latency': 0, 'latency_max': 0,
+                'throttled': 0, 'statuses': {}
+            })
+            m['requests'] += 1
+            m['errors'] += event.status is None or event.status >= 400
+            m['retries'] += event.retries
+            m['bytes'] += event.bytes
+            m['cached'] += event.cached
+            m['latency'] += event.latency
+            m['latency_max'] = max(m['latency_max'], event.latency)
+            m['throttled'] += event.throttled
+            m['statuses'][event.status] = m['statuses'].get(event.status, 0) + 1
+
+    def on_query(self, stats: QueryStats):
+        with self._lock:
+            m = self._queries.setdefault(stats.query, {
+                'queries': 0, 'errors': 0, 'seconds': 0, 'seconds_max': 0, 'requests': 0, 'pages': 0, 'mtus': 0,
+                'network': 0, 'decode': 0, 'parse': 0, 'throttled': 0, 'queued': 0
+            })
+            m['queries'] += 1
+            m['errors'] += stats.error is not None
+            m['seconds_max'] = max(m['seconds_max'], stats.seconds)
+            for field in ('seconds', 'requests', 'pages', 'mtus', 'network', 'decode', 'parse', 'throttled',
+                          'queued'):
+                m[field] += getattr(stats, field)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                'requests': {k: {**v, 'statuses': dict(v['statuses'])} for k, v in self._requests.items()},
+                'queries': {k: dict(v) for k, v in self._queries.items()},
+            }
@@ -0,0 +1,133 @@
+import os
+import shutil
+import tempfile
+import threading
+from collections import OrderedDict
+from zipfile import ZipFile
+import pandas as pd
+
+
+class MirrorBackend:
+    """
+    backend for the flowbased domain mirror (mirror.flowbased.eu), which serves a zipped csv per business day.
+    the zip is streamed to a temporary file instead of read into memory, and every day is kept as a dataframe in
+    memory (the last memory_days) and, when a path is given and pyarrow is installed, as a parquet file on disk.
+    so repeated mtus of the same day only download that day once.
+
+    on top of the day files the same mtu selection and filters as the publication tool are applied
+    """
+
+    def __init__(self, baseurl: str = 'https://mirror.flowbased.eu/dacc/', path: str = None, memory_days: int = 4):
+        """
+        :param baseurl: url of the mirror, the files are at <baseurl><name>/<YYYY-MM-DD>
+        :param path: optional directory to keep the day files in as parquet
+        :param memory_days: amount of days kept in memory
+        """
+        self.baseurl = baseurl
+        self.path = path
+        self.memory_days = memory_days
+        self._days = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        # copies in worker processes start with an empty memory, the files on disk are shared
+        state = self.__dict__.copy()
+        state['_days'] = OrderedDict()
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def _file(self, name: str, date: str) -> str:
+        return os.path.join(self.path, name, date + '.parquet')
+
+    def _download(self, get, name: str, date: str) -> pd.DataFrame | None:
+        with get(f'{self.baseurl}{name}/{date}', stream=True) as r:
+            if r.status_code != 200:
+                return None
+            r.raw.decode_content = True
+            with tempfile.SpooledTemporaryFile(max_size=64 * 1024 * 1024) as f:
+                shutil.copyfileobj(r.raw, f)
+                f.seek(0)
+                with ZipFile(f) as zf:
+                    df = pd.read_csv(zf.open(zf.namelist()[0]))
+        df = df.drop(columns=[c for c in df.columns if c.startswith('Unnamed:')])
+        df['mtu'] = pd.to_datetime(df['mtu'], utc=True, format='ISO8601').dt.tz_convert('Europe/Amsterdam')
+        return df
+
+    def _store(self, name: str, date: str, df: pd.DataFrame):
+        fname = self._file(name, date)
+        os.makedirs(os.path.dirname(fname), exist_ok=True)
+        # write to a temporary file first so parallel readers never see half a file
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(fname))
+        os.close(fd)
+        try:
+            df.to_parquet(tmp, index=False)
+        except ImportError:
+            # no parquet engine installed, just keep the day in memory
+            os.remove(tmp)
+            return
+        os.replace(tmp, fname)
+
+    def day(self, get, name: str, date: str) -> pd.DataFrame | None:
+        """
+        the whole business day of the given domain, None when the mirror does not have it
+
+        :param get: function to download with as get(url, stream=True), for example the _get of a client so its
+            rate limit, retries and instrumentation apply, or the get of a requests.Session
+        :param name: name of the domain on the mirror, final_domain or prefinal_domain
+        :param date: business day as YYYY-MM-DD
+        """
+        key = (name, date)
+        with self._lock:
+            if key in self._days:
+                self._days.move_to_end(key)
+                return self._days[key]
+
+        df = None
+        if self.path is not None and os.path.exists(self._file(name, date)):
+            df = pd.read_parquet(self._file(name, date))
+        if df is None:
+            df = self._download(get, name, date)
+            if df is None:
+                return None
+            if self.path is not None:
+                self._store(name, date, df)
+
+        with self._lock:
+            self._days[key] = df
+            while len(self._days) > self.memory_days:
+                self._days.popitem(last=False)
+        return df
+
+    @staticmethod
+    def filter(
+        df: pd.DataFrame,
+        d_from: pd.Timestamp,
+        d_to: pd.Timestamp,
+        presolved: bool | None = None,
+        cne: str | None = None,
+        co: str | None = None,
+        tso: set[str] | None = None,
+    ) -> pd.DataFrame:
+        """
+        select the mtus starting in [d_from, d_to) and apply the filters of the publication tool.
+        cne and co match when they are part of the cnec or contingency name (ignoring case), like the publication tool
+        tso is the set of tso names and eics to keep
+        """
+        mask = (df['mtu'] >= d_from) & (df['mtu'] < d_to)
+        if presolved is not None:
+            mask &= df['presolved'] == presolved
+        if cne is not None:
+            mask &= df['cnec_name'].str.contains(cne, case=False, regex=False, na=False)
+        if co is not None:
+            column = 'cont_name' if 'cont_name' in df.columns else 'contingency_branchname'
+            mask &= df[column].str.contains(co, case=False, regex=False, na=False)
+        if tso is not None:
+            tso_mask = df['tso'].isin(tso)
+            if 'tso_eic' in df.columns:
+                tso_mask |= df['tso_eic'].isin(tso)
+            mask &= tso_mask
+        return df[mask].reset_index(drop=True)
@@ -1,37 +1,122 @@
+import itertools
+import numpy as np
 import pandas as pd
+from pandas.api.types import union_categoricals
 from .util import to_snake_case
+from .metrics import timed
 
 
-def parse_final_domain(data: list[dict]) -> pd.DataFrame:
-    # flatten the data
-    # note: this only selects first CO
+# keys of a contingency as jao returns them, used when no row of a domain has a contingency
+CONTINGENCY_KEYS = ['number', 'branchname', 'branchEic']
+
+
+# string columns that become categoricals in compact mode. the list is fixed so every page and every query gives
+# the same dtypes, whatever values they happen to hold
+CATEGORICAL_COLUMNS = frozenset([
+    'tso', 'tso_eic', 'cnec_name', 'cnec_eic', 'cne_name', 'cne_type', 'cne_status', 'cne_eic', 'direction',
+    'hub_from', 'hub_to', 'substation_from', 'substation_to', 'element_type', 'fmax_type', 'cont_tso', 'cont_name',
+    'cont_status', 'contingency_branchname', 'contingency_branch_eic', 'contingency_hub_from', 'contingency_hub_to',
+    'contingency_substation_from', 'contingency_substation_to', 'contingency_element_type',
+])
+
+# nullable counterpart of every integer dtype
+NULLABLE_INTEGERS = {
+    'int8': 'Int8', 'int16': 'Int16', 'int32': 'Int32', 'int64': 'Int64',
+    'uint8': 'UInt8', 'uint16': 'UInt16', 'uint32': 'UInt32', 'uint64': 'UInt64',
+}
+
+
+def _compact(df: pd.DataFrame) -> pd.DataFrame:
+    # shrink the memory footprint of a dataframe:
+    #   the repetitive strings of CATEGORICAL_COLUMNS (tso, cnec and contingency names and eics, hubs) become
+    #   categoricals, floats (ptdfs, margins, flows, net positions) become float32
+    #   integers become the smallest fitting nullable integer, bools with missing values nullable booleans
+    # ids are left alone, they are unique anyway
+    for c in df.columns:
+        if c in ('id', 'id_original'):
+            continue
+        s = df[c]
+        if pd.api.types.is_float_dtype(s.dtype):
+            df[c] = s.astype(np.float32)
+        elif pd.api.types.is_bool_dtype(s.dtype):
+            continue
+        elif pd.api.types.is_integer_dtype(s.dtype):
+            s = pd.to_numeric(s, downcast='integer')
+            df[c] = s.astype(NULLABLE_INTEGERS[np.dtype(s.dtype).name])
+        elif c in CATEGORICAL_COLUMNS:
+            df[c] = s.astype('category')
+        elif pd.api.types.is_object_dtype(s.dtype) or pd.api.types.is_string_dtype(s.dtype):
+            values = s.dropna()
+            if len(values) == 0:
+                df[c] = s.astype(np.float32)
+            elif values.map(type).eq(bool).all():
+                df[c] = s.astype('boolean')
+    return df
+
+
+def concat_compact(dfs, **kwargs) -> pd.DataFrame:
+    """
+    pd.concat for compact frames, for example the pages of the iter_*_domain methods. categoricals of frames with
+    different categories would become object columns with pd.concat, here they keep the union of the categories
+
+    :param dfs: frames to concatenate
+    :param kwargs: passed on to pd.concat
+    """
+    dfs = list(dfs)
+    categorical = {c for df in dfs for c in df.columns if isinstance(df[c].dtype, pd.CategoricalDtype)}
+    for c in categorical:
+        categories = union_categoricals(
+            [df[c] for df in dfs if c in df.columns and isinstance(df[c].dtype, pd.CategoricalDtype)]
+        ).categories
+        dfs = [df.assign(**{c: df[c].astype(pd.CategoricalDtype(categories))}) if c in df.columns else df
+               for df in dfs]
+    return pd.concat(dfs, **kwargs)
+
+
+@timed('parse')
+def parse_final_domain(data: list[dict], all_contingencies: bool = False, compact: bool = False) -> pd.DataFrame:
+    """
+    flatten the domain into a dataframe. the columns of the rows are built straight from the records by pandas, only
+    the contingencies are picked out in python (one list lookup per row, the nested dicts can not be read by pandas
+    otherwise) and added as columns afterwards
+
+    :param data: list of domain rows as returned by JAO
+    :param all_contingencies: by default only the first contingency of a row is kept, set this to True to get a row
+        for every contingency instead (with their contingency_number)
+    :param compact: return memory compact dtypes: categoricals for repetitive strings, float32 for ptdfs and margins
+        and nullable integers and booleans
+    """
     # save the order of keys to keep output consistent
     # (note in p3.7+ dict order is guaranteed: https://stackoverflow.com/a/39980744
+    keys = list(data[0].keys())
+    i = keys.index('contingencies')
+    # the columns of the contingencies come from the first row that has one, rows can have none at all
+    first = next((d['contingencies'][0] for d in data if len(d['contingencies']) > 0), None)
+    contingency_keys = list(first.keys()) if first is not None else list(CONTINGENCY_KEYS)
+    if not all_contingencies:
+        contingency_keys.remove('number')
 
-    columns = list(data[0].keys())
-    # get keys of second level and insert them at right place in columns
-    i = columns.index('contingencies')
-    columns = columns[:i] + ['contingency_' + x for x in data[0]['contingencies'][0].keys()] + columns[i + 1:]
-    for d in data:
-        for c_k, c_d in d['contingencies'][0].items():
-            d['contingency_' + c_k] = c_d
-        del d['contingencies']
-    # now build the dataframe and convert column names
-    df = pd.DataFrame(data)
-    df = df.rename(columns=lambda x: to_snake_case(x) if 'ptdf' not in x else x)
-    # also convert our earlier column list
-    columns = [to_snake_case(x) if 'ptdf' not in x else x for x in columns]
-    # drop needless columns
-    columns.remove('contingency_number')
-    df = df.drop(columns=['contingency_number'])
-    # fix order of columns
-    df = df[columns]
-    df = df.rename(columns={'id': 'id_original'})
-    # parse datetime, convert to localtime and adjust column name
-    df['date_time_utc'] = pd.to_datetime(df['date_time_utc'], utc=True).dt.tz_convert('Europe/Amsterdam')
-    return df.rename(columns={'date_time_utc': 'mtu'})
+    df = pd.DataFrame.from_records(data, columns=keys[:i] + keys[i + 1:])
+    if all_contingencies:
+        contingencies = [d['contingencies'] if len(d['contingencies']) > 0 else [{}] for d in data]
+        df = df.iloc[np.repeat(np.arange(len(df)), [len(c) for c in contingencies])].reset_index(drop=True)
+        contingencies = list(itertools.chain.from_iterable(contingencies))
+    else:
+        contingencies = [d['contingencies'][0] if len(d['contingencies']) > 0 else {} for d in data]
+    contingencies = pd.DataFrame.from_records(contingencies, columns=contingency_keys).add_prefix('contingency_')
+    df = pd.concat([df.iloc[:, :i], contingencies, df.iloc[:, i:]], axis=1)
+
+    # convert column names, ptdf columns are kept as they are
+    df.columns = [to_snake_case(x) if 'ptdf' not in x else x for x in df.columns]
+    df = df.rename(columns={'id': 'id_original', 'date_time_utc': 'mtu'})
+    # parse datetime, convert to localtime
+    df['mtu'] = pd.to_datetime(df['mtu'], utc=True, format='ISO8601').dt.tz_convert('Europe/Amsterdam')
+    if compact:
+        df = _compact(df)
+    return df
 
 
+@timed('parse')
 def parse_monitoring(data: list[dict]) -> pd.DataFrame:
     df = pd.DataFrame(data)
     if 'businessDayUtc' in df:
@@ -42,9 +127,12 @@ def parse_monitoring(data: list[dict]) -> pd.DataFrame:
     return df.drop(columns=['id'])
 
 
-def parse_base_output(data: list[dict]) -> pd.DataFrame:
+@timed('parse')
+def parse_base_output(data: list[dict], compact: bool = False) -> pd.DataFrame:
     df = pd.DataFrame(data).drop(columns='id')
     df['dateTimeUtc'] = pd.to_datetime(df['dateTimeUtc'], utc=True).dt.tz_convert('Europe/Amsterdam')
     df = df.set_index('dateTimeUtc')
     df.index.name = 'mtu'
+    if compact:
+        df = _compact(df)
     return df
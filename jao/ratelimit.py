@@ -0,0 +1,154 @@
+import json
+import os
+import tempfile
+import threading
+import time
+import weakref
+from email.utils import parsedate_to_datetime
+
+try:
+    import fcntl
+except ImportError:  # windows
+    fcntl = None
+    import msvcrt
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """
+    seconds to wait according to a Retry-After header, which is either an amount of seconds or a http date
+    returns None when the header is missing or cannot be parsed
+    """
+    if value is None:
+        return None
+    value = value.strip()
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError, IndexError):
+        return None
+
+
+def _remove(path: str, pid: int):
+    # forked workers inherit the finalizers of their parent, only the process that made the file removes it
+    if os.getpid() != pid:
+        return
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+class RateLimiter:
+    """
+    budget of requests, by default the 100 requests per minute that jao allows. the times of the last requests are
+    kept, so no period long window ever holds more than requests of them: short bursts go out directly, after that
+    a request goes out as soon as the oldest one in the window is a period old.
+
+    one limiter can be shared by any amount of clients and threads. as soon as it is sent to another process
+    (for example the workers of a process pool) its state moves to a file that all processes lock and update,
+    so all of them together stay under the budget. pass a path to share a budget between separate programs
+    """
+
+    def __init__(self, requests: int = 100, period: float = 60, path: str = None, margin: float = 0.02):
+        """
+        :param requests: amount of requests allowed per period
+        :param period: length of the period in seconds
+        :param path: optional file to keep the state in, shared by every limiter using the same file
+        :param margin: fraction the window is taken longer than the period. requests reach the server a varying
+            time after they leave, without margin the server can count one too many in its window
+        """
+        self.requests = requests
+        self.period = period
+        self.margin = margin
+        self.path = path
+        self._lock = threading.Lock()
+        self._state = {'sent': [], 'blocked_until': 0.0}
+
+    def __getstate__(self):
+        self._share()
+        state = self.__dict__.copy()
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def _share(self):
+        # move the state to a file so copies in other processes use the same budget
+        with self._lock:
+            if self.path is not None:
+                return
+            fd, path = tempfile.mkstemp(prefix='jao-py-ratelimit-', suffix='.json')
+            with os.fdopen(fd, 'w') as f:
+                json.dump(self._state, f)
+            self.path = path
+            # the file goes when the limiter it was made for does, copies in other processes leave it alone
+            weakref.finalize(self, _remove, path, os.getpid())
+
+    def _update(self, func):
+        # apply func on the state under a lock over threads and, when file backed, over processes
+        with self._lock:
+            if self.path is None:
+                return func(self._state)
+            with open(self.path, 'a+') as f:
+                if fcntl is not None:
+                    fcntl.flock(f, fcntl.LOCK_EX)
+                else:
+                    f.seek(0)
+                    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                try:
+                    f.seek(0)
+                    content = f.read()
+                    state = json.loads(content) if content else dict(self._state)
+                    result = func(state)
+                    f.seek(0)
+                    f.truncate()
+                    json.dump(state, f)
+                    f.flush()
+                    return result
+                finally:
+                    if fcntl is not None:
+                        fcntl.flock(f, fcntl.LOCK_UN)
+                    else:
+                        f.seek(0)
+                        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+    def _take(self, state: dict) -> float:
+        # claim a spot in the window, returns 0 when one was free or otherwise the seconds to wait
+        now = time.time()
+        # a bucket that refills over time would let a full bucket plus the refill of a period go out in one period
+        window = self.period * (1 + self.margin)
+        state['sent'] = [t for t in state.get('sent', []) if t > now - window]
+        if now < state['blocked_until']:
+            return state['blocked_until'] - now
+        if len(state['sent']) < self.requests:
+            state['sent'].append(now)
+            return 0
+        return state['sent'][0] + window - now
+
+    def acquire(self) -> float:
+        """
+        blocks until a request is allowed to go out, returns the seconds it was held back
+        """
+        start = time.monotonic()
+        while True:
+            wait = self._update(self._take)
+            if wait <= 0:
+                return time.monotonic() - start
+            time.sleep(wait)
+
+    def block(self, seconds: float):
+        """
+        hold all requests for the given amount of seconds, after the server answered 429. the window is filled up
+        to the end of the block so requests resume at the steady rate instead of in a burst
+        """
+        def _block(state):
+            state['blocked_until'] = max(state['blocked_until'], time.time() + seconds)
+            step = self.period / self.requests
+            state['sent'] = [state['blocked_until'] - self.period + (i + 1) * step for i in range(self.requests)]
+
+        self._update(_block)
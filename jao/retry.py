@@ -0,0 +1,130 @@
+import random
+import threading
+import time
+from urllib.parse import urlparse
+import requests
+from .exceptions import CircuitOpenError
+from .ratelimit import parse_retry_after
+
+
+class RetryPolicy:
+    """
+    how the sessions of the clients deal with hiccups of the server.
+    failed requests (connection errors, time outs and the statuses below) are retried with exponential backoff
+    and full jitter: before retry n a random time between 0 and min(backoff * 2 ** n, max_backoff) is waited,
+    or the Retry-After of the response when that is longer.
+
+    after breaker_threshold requests in a row on a host failed (after all their retries, so a request counts once
+    however often it was tried) the circuit opens and all requests to that host fail directly with CircuitOpenError,
+    until breaker_reset seconds later one request is let through to try again
+    """
+
+    def __init__(self, retries: int = 4, backoff: float = 1, max_backoff: float = 60,
+                 timeout: float | tuple[float, float] | None = (10, 120), statuses: tuple[int, ...] = (500, 502, 503, 504),
+                 methods: tuple[str, ...] = ('GET', 'HEAD'), breaker_threshold: int = 10, breaker_reset: float = 60):
+        """
+        :param retries: amount of retries after the first attempt, 0 to not retry at all
+        :param backoff: base of the exponential backoff in seconds
+        :param max_backoff: maximum wait in seconds between two attempts
+        :param timeout: per request time out in seconds as accepted by requests, either one value or (connect, read)
+        :param statuses: http statuses that are retried
+        :param methods: http methods that are retried, only the ones that are safe to repeat
+        :param breaker_threshold: failed requests in a row on a host after which the circuit opens
+        :param breaker_reset: seconds the circuit stays open before trying again
+        """
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.timeout = timeout
+        self.statuses = statuses
+        self.methods = methods
+        self.breaker_threshold = breaker_threshold
+        self.breaker_reset = breaker_reset
+
+    def wait(self, attempt: int, retry_after: float | None = None) -> float:
+        wait = random.uniform(0, min(self.backoff * 2 ** attempt, self.max_backoff))
+        if retry_after is not None:
+            wait = max(wait, min(retry_after, self.max_backoff))
+        return wait
+
+
+class CircuitBreaker:
+    # consecutive failed requests per host, shared by all threads using the session
+    def __init__(self, threshold: int, reset: float):
+        self.threshold = threshold
+        self.reset = reset
+        self._lock = threading.Lock()
+        self._failures = {}
+        self._opened_on = {}
+
+    def check(self, host: str) -> bool:
+        # raises when the circuit is open, returns whether the request is the trial of a half open circuit
+        with self._lock:
+            opened_on = self._opened_on.get(host)
+            if opened_on is None:
+                return False
+            if time.monotonic() - opened_on < self.reset:
+                raise CircuitOpenError(f"{host} failed {self._failures[host]} times in a row, not trying again until "
+                                       f"{self.reset - (time.monotonic() - opened_on):.0f}s from now")
+            # half open: this request goes through as a trial and the circuit counts as opened again, so the
+            # others keep failing directly until the trial succeeds or another breaker_reset seconds have passed
+            self._opened_on[host] = time.monotonic()
+            return True
+
+    def success(self, host: str):
+        with self._lock:
+            self._failures.pop(host, None)
+            self._opened_on.pop(host, None)
+
+    def failure(self, host: str):
+        with self._lock:
+            self._failures[host] = self._failures.get(host, 0) + 1
+            if self._failures[host] >= self.threshold:
+                self._opened_on[host] = time.monotonic()
+
+
+class RetrySession(requests.Session):
+    """
+    requests session that applies a RetryPolicy to every request, a drop in replacement for requests.Session.
+    pass a RateLimiter as limiter to a request to take a token before every attempt, retries included. the seconds
+    held back by it are kept on the response as throttled
+    """
+
+    def __init__(self, policy: RetryPolicy = None):
+        super().__init__()
+        self.policy = policy if policy is not None else RetryPolicy()
+        self.breaker = CircuitBreaker(self.policy.breaker_threshold, self.policy.breaker_reset)
+
+    def request(self, method, url, *args, limiter=None, **kwargs):
+        policy = self.policy
+        kwargs.setdefault('timeout', policy.timeout)
+        host = urlparse(url).netloc
+        retries = policy.retries if method.upper() in policy.methods else 0
+        throttled = 0
+        # the breaker is checked before every attempt, except for the retries of the trial of a half open circuit
+        trial = False
+        for attempt in range(retries + 1):
+            if not trial:
+                trial = self.breaker.check(host)
+            if limiter is not None:
+                throttled += limiter.acquire()
+            try:
+                r = super().request(method, url, *args, **kwargs)
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt == retries:
+                    # the breaker counts requests, not attempts
+                    self.breaker.failure(host)
+                    raise
+                time.sleep(policy.wait(attempt))
+                continue
+            # how often it took and how long it was held back, for the instrumentation of the clients
+            r.retries = attempt
+            r.throttled = throttled
+            if r.status_code not in policy.statuses:
+                self.breaker.success(host)
+                return r
+            if attempt == retries:
+                self.breaker.failure(host)
+                return r
+            time.sleep(policy.wait(attempt, parse_retry_after(r.headers.get('Retry-After'))))
+        return r
@@ -0,0 +1,377 @@
+import itertools
+from concurrent.futures import Executor, ThreadPoolExecutor
+import numpy as np
+import pandas as pd
+from .domain import FlowBasedDomain
+
+
+def _highspy():
+    try:
+        import highspy
+    except ImportError:
+        raise ImportError("the min/max net position solver needs highspy, install it with "
+                          "python3 -m pip install jao-py[solver]") from None
+    return highspy
+
+
+def _scenarios(domain: FlowBasedDomain, ram: np.ndarray | None) -> np.ndarray:
+    # (n_scenario, n_cnec) rams, the ram of the domain itself when no scenarios are given
+    ram = domain.ram if ram is None else np.asarray(ram, dtype=domain.ram.dtype)
+    return ram.reshape(-1, len(domain))
+
+
+def _index(domain: FlowBasedDomain, scenarios: int) -> pd.Index:
+    if scenarios == 1:
+        return pd.Index(domain.mtus, name='mtu')
+    return pd.MultiIndex.from_product([range(scenarios), domain.mtus], names=['scenario', 'mtu'])
+
+
+def maxbex(domain: FlowBasedDomain, borders: list[tuple[str, str]] = None, base: pd.Series | dict = None,
+           ram: np.ndarray = None) -> pd.DataFrame:
+    """
+    maximum bilateral exchange per border and mtu: the largest exchange from one zone to the other that fits
+    in the domain when all other exchanges are kept at base (zero by default):
+        max t with ptdf . (base + t * (e_from - e_to)) <= ram
+    this one dimensional lp is solved in closed form for all mtus, borders and scenarios at once
+
+    :param domain: the domain to compute on
+    :param borders: list of (from zone, to zone), defaults to every ordered pair of zones
+    :param base: net positions per zone the exchange comes on top of, zones not in it are zero
+    :param ram: what if rams, either (n_cnec,) or (n_scenario, n_cnec) in the row order of the domain
+    :return: frame with a column per border named like query_maxbex (from>to), indexed by mtu or by
+        (scenario, mtu) when several scenarios are given. inf when no cnec limits the exchange
+    """
+    borders = domain.borders() if borders is None else borders
+    rams = _scenarios(domain, ram)
+    if base is not None:
+        base = np.array([dict(base).get(z, 0) for z in domain.zones], dtype=domain.ptdf.dtype)
+        rams = rams - domain.ptdf @ base
+
+    z2z = domain.zone_to_zone(borders)
+    # only cnecs loaded by the exchange limit it, the others get inf
+    limiting = z2z > 1e-9
+    inv = np.divide(1, z2z, out=np.zeros_like(z2z), where=limiting)
+    out = []
+    for r in rams:
+        t = np.where(limiting, r[:, None] * inv, np.inf)
+        out.append(np.minimum.reduceat(t, domain.offsets[:-1], axis=0) if len(domain) > 0 else t)
+    return pd.DataFrame(np.concatenate(out), index=_index(domain, len(rams)),
+                        columns=[f'{a}>{b}' for a, b in borders])
+
+
+def _highs():
+    h = _highspy().Highs()
+    h.setOptionValue('output_flag', False)
+    # presolve would throw away the basis, these lps are small enough without
+    h.setOptionValue('presolve', 'off')
+    # only costs and row bounds change between the lps, the basis of the last one stays primal feasible for a new
+    # cost so primal simplex carries on from it
+    h.setOptionValue('simplex_strategy', 4)
+    return h
+
+
+def _pass_model(h, a: np.ndarray, ram: np.ndarray, lower: np.ndarray, upper: np.ndarray, balance: bool):
+    # net positions within [lower, upper] with a . np <= ram, and when balance the sum of the net positions zero
+    highspy = _highspy()
+    inf = highspy.kHighsInf
+    n_row, n_zone = a.shape
+    if balance:
+        a = np.vstack([a, np.ones(n_zone)])
+    lp = highspy.HighsLp()
+    lp.num_col_ = n_zone
+    lp.num_row_ = len(a)
+    lp.col_cost_ = np.zeros(n_zone)
+    lp.col_lower_ = np.where(np.isfinite(lower), lower, -inf)
+    lp.col_upper_ = np.where(np.isfinite(upper), upper, inf)
+    lp.row_lower_ = np.where(np.arange(len(a)) < n_row, -inf, 0)
+    lp.row_upper_ = np.concatenate([ram, np.zeros(len(a) - n_row)]).astype(np.float64)
+    # column wise sparse matrix, the ptdfs are dense anyway
+    lp.a_matrix_.format_ = highspy.MatrixFormat.kColwise
+    lp.a_matrix_.start_ = np.arange(0, (n_zone + 1) * len(a), len(a), dtype=np.int32)
+    lp.a_matrix_.index_ = np.tile(np.arange(len(a), dtype=np.int32), n_zone)
+    lp.a_matrix_.value_ = np.asfortranarray(a).ravel(order='F').astype(np.float64)
+    h.passModel(lp)
+
+
+def _maximize(h, cost: np.ndarray) -> float:
+    # max cost . np on the model of h, inf when unbounded, nan when infeasible
+    highspy = _highspy()
+    h.changeColsCost(len(cost), np.arange(len(cost), dtype=np.int32), -np.asarray(cost, dtype=np.float64))
+    h.run()
+    status = h.getModelStatus()
+    if status == highspy.HighsModelStatus.kOptimal:
+        return -h.getInfo().objective_function_value
+    if status in (highspy.HighsModelStatus.kUnbounded, highspy.HighsModelStatus.kUnboundedOrInfeasible):
+        return np.inf
+    return np.nan
+
+
+def _bounds(domain: FlowBasedDomain, bounds) -> tuple[np.ndarray, np.ndarray]:
+    # (n_mtu, n_zone) lower and upper net positions out of a dict of zone: (lower, upper) or a frame with
+    # min<zone> and max<zone> columns indexed by mtu, like query_minmax_np
+    lower = np.full((len(domain.mtus), len(domain.zones)), -np.inf)
+    upper = np.full((len(domain.mtus), len(domain.zones)), np.inf)
+    if isinstance(bounds, pd.DataFrame):
+        bounds = bounds.reindex(domain.mtus)
+        for i, z in enumerate(domain.zones):
+            if f'min{z}' in bounds.columns:
+                lower[:, i] = bounds[f'min{z}'].to_numpy(dtype=np.float64, na_value=-np.inf)
+            if f'max{z}' in bounds.columns:
+                upper[:, i] = bounds[f'max{z}'].to_numpy(dtype=np.float64, na_value=np.inf)
+    elif bounds is not None:
+        for z, (lo, up) in bounds.items():
+            i = domain.zone_positions([z])[0]
+            lower[:, i] = lo
+            upper[:, i] = up
+    return lower, upper
+
+
+def _run_blocks(func, domain: FlowBasedDomain, block_args, executor: Executor | str | None,
+                max_workers: int) -> list:
+    # func(ptdf, offsets, *block_args(mtus of the block)) for blocks of consecutive mtus, spread over the executor
+    blocks = np.array_split(np.arange(len(domain.mtus)), max(min(max_workers, len(domain.mtus)), 1))
+    calls = [(domain.ptdf, domain.offsets[b[0]:b[-1] + 2], *block_args(b)) for b in blocks if len(b) > 0]
+    own_executor = executor == 'thread'
+    if own_executor:
+        executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='jao-py')
+    try:
+        if executor is None or len(calls) <= 1:
+            return list(itertools.starmap(func, calls))
+        return list(executor.map(func, *zip(*calls)))
+    finally:
+        if own_executor:
+            executor.shutdown()
+
+
+def _solve_block(ptdf: np.ndarray, offsets: np.ndarray, cnec_index: np.ndarray, rams: np.ndarray, zones: list[int],
+                 lower: np.ndarray, upper: np.ndarray, balance: bool) -> np.ndarray:
+    # min and max net position of zones for a block of consecutive mtus, on one highs instance
+    # the basis is carried over from lp to lp: within an mtu only the objective (zones) or the rams (scenarios)
+    # change, and between mtus with the same cnecs only the ptdfs do
+    h = _highs()
+    n_zone = ptdf.shape[1]
+    out = np.full((len(rams), len(offsets) - 1, 2 * len(zones)), np.nan)
+    previous = None
+    for m in range(len(offsets) - 1):
+        start, stop = offsets[m], offsets[m + 1]
+        _pass_model(h, ptdf[start:stop], rams[0, start:stop], lower[m], upper[m], balance)
+        cnecs = cnec_index[start:stop]
+        if previous is not None and np.array_equal(previous[0], cnecs):
+            h.setBasis(previous[1])
+        rows = np.arange(stop - start, dtype=np.int32)
+
+        for s, ram in enumerate(rams):
+            h.changeRowsBounds(len(rows), rows, np.full(len(rows), -np.inf), ram[start:stop].astype(np.float64))
+            for i, z in enumerate(zones):
+                cost = np.eye(n_zone)[z]
+                out[s, m, 2 * i] = -_maximize(h, -cost)
+                out[s, m, 2 * i + 1] = _maximize(h, cost)
+        previous = (cnecs, h.getBasis())
+    return out
+
+
+def minmax_np(domain: FlowBasedDomain, zones: list[str] = None, ram: np.ndarray = None, balance: bool = True,
+              bounds: dict[str, tuple[float, float]] | pd.DataFrame = None, executor: Executor | str | None = 'thread',
+              max_workers: int = 8) -> pd.DataFrame:
+    """
+    minimum and maximum net position per zone and mtu within the domain, an lp per zone, direction, mtu and
+    scenario. the lps run with highs (python3 -m pip install jao-py[solver]) in blocks of consecutive mtus that
+    are spread over the executor, within a block every lp starts from the basis of the one before
+
+    :param domain: the domain to compute on
+    :param zones: zones to compute, defaults to all zones of the domain
+    :param ram: what if rams, either (n_cnec,) or (n_scenario, n_cnec) in the row order of the domain
+    :param balance: keep the sum of all net positions at zero
+    :param bounds: optional (lower, upper) net position per zone, for example to fix the virtual hubs. or a frame
+        with min<zone> and max<zone> columns per mtu
+    :param executor: 'thread' for a pool of max_workers threads, an existing concurrent.futures Executor, or None
+        to solve everything in the calling thread
+    :param max_workers: amount of threads for 'thread', and the amount of blocks the mtus are split into
+    :return: frame with columns min<zone> and max<zone> like query_minmax_np, indexed by mtu or by (scenario, mtu)
+        when several scenarios are given. -inf/inf when the domain is open in that direction, nan when infeasible
+    """
+    zones = domain.zones if zones is None else zones
+    positions = list(domain.zone_positions(zones))
+    rams = _scenarios(domain, ram)
+    lower, upper = _bounds(domain, bounds)
+
+    results = _run_blocks(_solve_block, domain, lambda b: (domain.cnec_index, rams, positions, lower[b], upper[b],
+                                                           balance), executor, max_workers)
+    out = np.concatenate(results, axis=1) if len(results) > 0 else np.empty((len(rams), 0, 2 * len(zones)))
+    columns = [f'{sense}{z}' for z in zones for sense in ('min', 'max')]
+    return pd.DataFrame(out.reshape(-1, 2 * len(zones)), index=_index(domain, len(rams)), columns=columns)
+
+
+def _box_redundant(a: np.ndarray, ram: np.ndarray, lower: np.ndarray, upper: np.ndarray) -> np.ndarray:
+    # rows that can not be reached anywhere within the box of net positions, all rows at once
+    with np.errstate(invalid='ignore'):
+        reach = np.where(a > 0, a * upper, np.where(a < 0, a * lower, 0)).sum(axis=1)
+    return reach <= ram
+
+
+def _cheap_presolve(a: np.ndarray, ram: np.ndarray, lower: np.ndarray, upper: np.ndarray) -> np.ndarray:
+    # non redundant candidates without any lp:
+    #   rows without (significant) ptdfs or ram do not limit anything
+    #   of rows pointing in the same direction only the tightest one can limit
+    #   rows that can not be reached within the bounds on the net positions do not limit anything
+    norm = np.linalg.norm(a, axis=1)
+    keep = (norm > 1e-9) & np.isfinite(ram)
+    idx = np.flatnonzero(keep)
+    direction = np.round(a[idx] / norm[idx, None], 9)
+    _, group = np.unique(direction, axis=0, return_inverse=True)
+    group = group.ravel()
+    order = np.lexsort((ram[idx] / norm[idx], group))
+    first = np.ones(len(order), dtype=bool)
+    first[1:] = group[order][1:] != group[order][:-1]
+    keep[idx[order[~first]]] = False
+    keep[keep] &= ~_box_redundant(a[keep], ram[keep], lower, upper)
+    return keep
+
+
+class _WorkingSet:
+    # lps over a growing subset of the rows of one mtu (constraint generation). the domain of a subset contains the
+    # whole domain, so whatever the subset keeps out of reach is out of reach in the whole domain as well.
+    # optima that are feasible for all rows are optima of the whole domain, otherwise the most violated rows
+    # are added and the lp is solved again, starting from the basis it had
+    BATCH = 8
+
+    def __init__(self, a: np.ndarray, b: np.ndarray, lower: np.ndarray, upper: np.ndarray, balance: bool,
+                 tolerance: float):
+        self.a = a
+        self.b = b
+        self.tolerance = tolerance
+        self.h = _highs()
+        _pass_model(self.h, a[:0], b[:0], lower, upper, balance)
+        # row of the model of every row in it, the balance row is the first one
+        self.position = {}
+        self.redundant = np.zeros(len(b), dtype=bool)
+
+    def add(self, rows: np.ndarray):
+        rows = [int(r) for r in rows if int(r) not in self.position]
+        if len(rows) == 0:
+            return
+        n_zone = self.a.shape[1]
+        first = self.h.getNumRow()
+        for i, r in enumerate(rows):
+            self.position[r] = first + i
+        self.h.addRows(len(rows), np.full(len(rows), -np.inf), self.b[rows], len(rows) * n_zone,
+                       np.arange(0, len(rows) * n_zone, n_zone, dtype=np.int32),
+                       np.tile(np.arange(n_zone, dtype=np.int32), len(rows)), self.a[rows].ravel())
+
+    def bound(self, row: int, upper: float):
+        self.h.changeRowBounds(self.position[row], -np.inf, upper)
+
+    def maximize(self, cost: np.ndarray, skip: int = None) -> float:
+        # max cost . np over all rows except the redundant ones and skip, inf when unbounded and nan when infeasible
+        while True:
+            reach = _maximize(self.h, cost)
+            if np.isnan(reach):
+                return reach
+            if np.isinf(reach):
+                # cut the ray along which the subset is open with the rows that are most against it
+                _, has_ray, ray = self.h.getPrimalRay()
+                cut = self.a @ (ray if has_ray else cost)
+            else:
+                x = np.asarray(self.h.getSolution().col_value)
+                cut = self.a @ x - self.b
+            cut[self.redundant] = -np.inf
+            if skip is not None:
+                cut[skip] = -np.inf
+            for r in self.position:
+                cut[r] = -np.inf
+            worst = np.argpartition(cut, -self.BATCH)[-self.BATCH:] if len(cut) > self.BATCH else np.arange(len(cut))
+            worst = worst[cut[worst] > (self.tolerance if np.isfinite(reach) else 1e-12)]
+            if len(worst) == 0:
+                return reach
+            self.add(worst)
+
+    def shaping(self) -> np.ndarray:
+        # rows with a dual in the last lp
+        dual = np.abs(np.asarray(self.h.getSolution().row_dual))
+        rows = np.array(list(self.position), dtype=np.intp)
+        return rows[dual[[self.position[r] for r in rows]] > 1e-9] if len(rows) > 0 else rows
+
+
+def _presolve_block(ptdf: np.ndarray, offsets: np.ndarray, ram: np.ndarray, lower: np.ndarray, upper: np.ndarray,
+                    balance: bool, tolerance: float) -> np.ndarray:
+    # non redundant rows of a block of consecutive mtus
+    out = np.zeros(offsets[-1] - offsets[0], dtype=bool)
+    for m in range(len(offsets) - 1):
+        start, stop = offsets[m], offsets[m + 1]
+        a = ptdf[start:stop].astype(np.float64)
+        b = ram[start:stop].astype(np.float64)
+        keep = _cheap_presolve(a, b, lower[m], upper[m])
+        candidates = np.flatnonzero(keep)
+        if len(candidates) > 1:
+            ws = _WorkingSet(a[candidates], b[candidates], lower[m], upper[m], balance, tolerance)
+            # the box the domain itself spans is usually much tighter than the given bounds. the box stays the
+            # same without any of the rows that have no dual in its lps, so those rows can be checked against it
+            n_zone = a.shape[1]
+            lo, up = np.full(n_zone, -np.inf), np.full(n_zone, np.inf)
+            shaping = np.zeros(len(candidates), dtype=bool)
+            for z in range(n_zone):
+                for sense in (-1, 1):
+                    reach = ws.maximize(sense * np.eye(n_zone)[z])
+                    if np.isfinite(reach):
+                        shaping[ws.shaping()] = True
+                        if sense == 1:
+                            up[z] = reach
+                        else:
+                            lo[z] = -reach
+            tight = ~_box_redundant(a[candidates], b[candidates], np.fmax(lo, lower[m]), np.fmin(up, upper[m]))
+            tight |= shaping
+            ws.redundant = ~tight
+
+            # the rows that are left each get an lp: relax the row and see if the domain grows over it. rows closest
+            # to the origin go first, they are the most likely to limit the domain and keep the working set small
+            rows = np.flatnonzero(tight)
+            rows = rows[np.argsort(b[candidates][rows] / np.linalg.norm(a[candidates][rows], axis=1))]
+            for r in rows:
+                ws.add([r])
+                ws.bound(r, ws.b[r] + max(1, abs(ws.b[r])))
+                reach = ws.maximize(ws.a[r], skip=r)
+                if reach <= ws.b[r] + tolerance:
+                    ws.bound(r, np.inf)
+                    ws.redundant[r] = True
+                else:
+                    ws.bound(r, ws.b[r])
+            keep[candidates[ws.redundant]] = False
+        out[start - offsets[0]:stop - offsets[0]] = keep
+    return out
+
+
+def presolve(domain: FlowBasedDomain | pd.DataFrame, bounds: dict[str, tuple[float, float]] | pd.DataFrame = None,
+             balance: bool = True, tolerance: float = 1e-6, executor: Executor | str | None = 'thread',
+             max_workers: int = 8) -> np.ndarray | pd.Series:
+    """
+    finds the non redundant cnecs of a domain, the ones that shape the domain (per mtu), like the presolved flag
+    of the final domain. cheap checks go first for all rows of an mtu at once: rows without ptdfs, rows parallel
+    to a tighter one and rows out of reach of the net position bounds. then the box the domain spans is computed
+    with an lp per zone and direction to rule out more rows. only the rows left after that get an lp each,
+    with highs (python3 -m pip install jao-py[solver]). the lps only hold the rows that turned out to matter
+    for them instead of all thousands of rows. mtus are spread over the executor in blocks
+
+    :param domain: FlowBasedDomain or a domain frame of the pandas clients, for example of query_initial_domain
+    :param bounds: optional bounds on the net positions, (lower, upper) per zone or a frame with min<zone> and
+        max<zone> columns per mtu like query_minmax_np
+    :param balance: keep the sum of all net positions at zero
+    :param tolerance: MW a relaxed row has to be exceeded by to count as non redundant
+    :param executor: 'thread' for a pool of max_workers threads, an existing concurrent.futures Executor, or None
+        to solve everything in the calling thread
+    :param max_workers: amount of threads for 'thread', and the amount of blocks the mtus are split into
+    :return: for a domain a bool array in its row order, for a frame a bool Series non_redundant on its index.
+        of rows that limit the domain in exactly the same way only one is marked
+    """
+    frame = None
+    if isinstance(domain, pd.DataFrame):
+        frame = domain
+        domain = FlowBasedDomain.from_frame(frame)
+    lower, upper = _bounds(domain, bounds)
+    results = _run_blocks(_presolve_block, domain, lambda b: (domain.ram, lower[b], upper[b], balance, tolerance),
+                          executor, max_workers)
+    keep = np.concatenate(results) if len(results) > 0 else np.zeros(0, dtype=bool)
+    if frame is None:
+        return keep
+    out = np.zeros(len(frame), dtype=bool)
+    out[domain.rows] = keep
+    return pd.Series(out, index=frame.index, name='non_redundant')
@@ -0,0 +1,56 @@
+import json
+import os
+import tempfile
+import pandas as pd
+
+
+class PartitionedStore:
+    """
+    local store of query results, partitioned hive style per endpoint and business day:
+        <root>/endpoint=<endpoint>/business_day=<YYYY-MM-DD>/data.parquet
+    next to every data file a small meta.json is kept with information about when and what was stored.
+    writing parquet requires pyarrow (or fastparquet) to be installed
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+
+    def _partition(self, endpoint: str, day) -> str:
+        return os.path.join(self.root, f'endpoint={endpoint}', f'business_day={pd.Timestamp(day).strftime("%Y-%m-%d")}')
+
+    def has(self, endpoint: str, day) -> bool:
+        return os.path.exists(os.path.join(self._partition(endpoint, day), 'data.parquet'))
+
+    def days(self, endpoint: str) -> list[pd.Timestamp]:
+        path = os.path.join(self.root, f'endpoint={endpoint}')
+        if not os.path.isdir(path):
+            return []
+        return sorted(
+            pd.Timestamp(d.split('=')[1], tz='Europe/Amsterdam') for d in os.listdir(path)
+            if d.startswith('business_day=') and self.has(endpoint, d.split('=')[1])
+        )
+
+    def read(self, endpoint: str, day) -> pd.DataFrame | None:
+        if not self.has(endpoint, day):
+            return None
+        return pd.read_parquet(os.path.join(self._partition(endpoint, day), 'data.parquet'))
+
+    def meta(self, endpoint: str, day) -> dict:
+        try:
+            with open(os.path.join(self._partition(endpoint, day), 'meta.json')) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+
+    def write(self, endpoint: str, day, df: pd.DataFrame, meta: dict = None):
+        path = self._partition(endpoint, day)
+        os.makedirs(path, exist_ok=True)
+        # write to temporary files first and move them in place, so an interrupted run never leaves half a partition
+        fd, tmp = tempfile.mkstemp(dir=path, suffix='.tmp')
+        os.close(fd)
+        df.to_parquet(tmp)
+        os.replace(tmp, os.path.join(path, 'data.parquet'))
+        fd, tmp = tempfile.mkstemp(dir=path, suffix='.tmp')
+        with os.fdopen(fd, 'w') as f:
+            json.dump(meta or {}, f, default=str)
+        os.replace(tmp, os.path.join(path, 'meta.json'))
@@ -0,0 +1,261 @@
+import itertools
+import re
+import pandas as pd
+from .exceptions import NoMatchingDataError
+from .jao import JaoPublicationToolPandasClient
+from .jao_italynorth import JaoPublicationToolItalyNorth
+from .jao_nordic import JaoPublicationToolPandasNordics
+from .store import PartitionedStore
+
+
+# endpoint: (query method of the pandas client, how it is called, whether every mtu of a business day has data)
+#   domain: method(d_from, d_to) with d_to exclusive, returns mtu as a column
+#   fromto: method(d_from, d_to), returns mtu as index
+#   day: method(day), returns mtu as index. always fetched as a whole business day
+#   mtu: method(mtu) for every mtu, returns mtu as a column
+ENDPOINTS = {
+    'finalComputation': ('query_final_domain_fromto', 'domain', True),
+    'preFinalComputation': ('query_prefinal_domain_fromto', 'domain', True),
+    'initialComputation': ('query_initial_domain_fromto', 'domain', True),
+    'netPos': ('query_net_position_fromto', 'fromto', True),
+    'shadowPrices': ('query_active_constraints', 'day', False),
+    'maxExchanges': ('query_maxbex', 'day', True),
+    'maxNetPos': ('query_minmax_np', 'day', True),
+    'lta': ('query_lta', 'fromto', True),
+    'validationReductions': ('query_validations', 'fromto', False),
+    'allocationConstraint': ('query_allocationconstraint', 'fromto', True),
+    'spanningDefaultFBP': ('query_status', 'fromto', False),
+    'priceSpread': ('query_price_spread', 'fromto', True),
+    'scheduledExchanges': ('query_scheduled_exchange', 'fromto', True),
+    'alphaFactor': ('query_alpha_factor', 'fromto', True),
+    'd2CF': ('query_d2cf', 'fromto', True),
+    'refprog': ('query_refprog', 'fromto', True),
+    'congestionIncome': ('query_congestion_income', 'fromto', True),
+}
+
+# the nordic active constraints are the domain with shadow prices, queried per mtu
+NORDIC_ENDPOINTS = {
+    **ENDPOINTS,
+    'shadowPrices': ('query_active_constraints', 'mtu', True),
+}
+
+# same for the (day ahead) endpoints of the italy north client
+IBWT_ENDPOINTS = {
+    'CCR_forecasted': ('query_grid_forecasts', 'fromto', True),
+    'CCR_FinalTtcNtc': ('query_final_ntc_ttc', 'fromto', True),
+    'CCR_allocationConstraint': ('query_allocation_constraint', 'fromto', True),
+}
+
+# columns of the monitoring endpoint that can hold the name of the dataset of a row
+DATASET_COLUMNS = ['dataset', 'datasetName', 'dataSet', 'name', 'pageName', 'type']
+
+
+def business_days(d_from, d_to) -> pd.DatetimeIndex:
+    d_from = pd.Timestamp(d_from)
+    d_to = pd.Timestamp(d_to)
+    if d_from.tzinfo is not None:
+        d_from = d_from.tz_convert('Europe/Amsterdam').tz_localize(None)
+    if d_to.tzinfo is not None:
+        d_to = d_to.tz_convert('Europe/Amsterdam').tz_localize(None)
+    return pd.date_range(d_from.normalize(), d_to.normalize(), freq='D', tz='Europe/Amsterdam')
+
+
+def expected_mtus(day: pd.Timestamp, resolution: pd.Timedelta) -> pd.DatetimeIndex:
+    # adding a calendar day in local time gives 23 or 25 hours on DST days
+    return pd.date_range(day, day + pd.DateOffset(days=1), freq=resolution, inclusive='left')
+
+
+def _mtus(df: pd.DataFrame) -> pd.DatetimeIndex:
+    return pd.DatetimeIndex(df['mtu'] if 'mtu' in df.columns else df.index).unique().sort_values()
+
+
+def _resolution(mtus: pd.DatetimeIndex) -> pd.Timedelta:
+    # infer the mtu length from the data itself, anything coarser than an hour is a gap and not the resolution
+    if len(mtus) < 2:
+        return pd.Timedelta(hours=1)
+    return min(pd.Series(mtus).diff().min(), pd.Timedelta(hours=1))
+
+
+def _normalize(name: str) -> str:
+    # IDCCA_finalComputation, Final Computation and finalComputation all become finalcomputation
+    return re.sub(r'[^a-z0-9]', '', re.sub(r'^idcc[a-d]_', '', str(name).lower()))
+
+
+def _dataset_rows(monitoring: pd.DataFrame, endpoint: str) -> pd.DataFrame:
+    # the monitoring rows of the dataset of an endpoint. names are matched loosely (netPos is published as net
+    # positions), when no row matches all rows are used so a change is never missed
+    column = next((c for c in DATASET_COLUMNS if c in monitoring.columns), None)
+    if column is None:
+        return monitoring
+    key = _normalize(endpoint)
+    names = monitoring[column].map(_normalize)
+    mask = names.map(lambda n: len(n) > 0 and (n.startswith(key) or key.startswith(n))).to_numpy(dtype=bool)
+    return monitoring[mask] if mask.any() else monitoring
+
+
+def _gaps(missing: pd.DatetimeIndex, resolution: pd.Timedelta) -> list[tuple[pd.Timestamp, pd.Timestamp]]:
+    # contiguous runs of missing mtus as (first mtu, last mtu)
+    runs = []
+    for mtu in missing:
+        if runs and mtu - runs[-1][1] == resolution:
+            runs[-1] = (runs[-1][0], mtu)
+        else:
+            runs.append((mtu, mtu))
+    return runs
+
+
+class JaoSync:
+    """
+    keeps a local PartitionedStore up to date for a set of endpoints.
+    per business day the lastModifiedOn and deadline of the monitoring endpoint decide what needs to be done:
+    days that are not stored yet or were modified since they were stored are fetched completely,
+    of all other days only the missing mtus are fetched (DST aware). days whose data is complete and
+    past its deadline are skipped without a single request
+    """
+
+    # whether to consult the monitoring endpoint at all
+    MONITORING = True
+    # length of the mtus of endpoints that are queried per mtu
+    MTU = pd.Timedelta(hours=1)
+
+    def __init__(self, client: JaoPublicationToolPandasClient, store: PartitionedStore | str, endpoints: list[str]):
+        """
+        :param client: pandas publication tool client to fetch with
+        :param store: PartitionedStore or the root directory of one
+        :param endpoints: names of the endpoints to keep up to date, see ENDPOINTS (NORDIC_ENDPOINTS for the
+            nordics, IBWT_ENDPOINTS for italy north)
+        """
+        if isinstance(client, JaoPublicationToolItalyNorth):
+            self.endpoint_map = IBWT_ENDPOINTS
+        elif isinstance(client, JaoPublicationToolPandasNordics):
+            self.endpoint_map = NORDIC_ENDPOINTS
+        else:
+            self.endpoint_map = ENDPOINTS
+        unknown = [e for e in endpoints if e not in self.endpoint_map]
+        if len(unknown) > 0:
+            raise ValueError(f"unknown endpoints {unknown}, choose from {list(self.endpoint_map)}")
+        self.client = client
+        self.store = PartitionedStore(store) if isinstance(store, str) else store
+        self.endpoints = endpoints
+
+    def _monitoring(self, day: pd.Timestamp) -> pd.DataFrame | None:
+        if not hasattr(self.client, 'query_monitoring'):
+            return None
+        try:
+            return pd.DataFrame(self.client.query_monitoring(day))
+        except NoMatchingDataError:
+            return None
+
+    @staticmethod
+    def _modified(monitoring: pd.DataFrame | None, endpoint: str) -> tuple[pd.Timestamp | None, pd.Timestamp | None]:
+        # lastModifiedOn and deadline of the dataset of an endpoint on one business day
+        if monitoring is None or len(monitoring) == 0:
+            return None, None
+        rows = _dataset_rows(monitoring, endpoint)
+        return (pd.to_datetime(rows['lastModifiedOn'], utc=True).max() if 'lastModifiedOn' in rows else None,
+                pd.to_datetime(rows['deadline'], utc=True).max() if 'deadline' in rows else None)
+
+    def _fetch(self, endpoint: str, d_from: pd.Timestamp, d_to: pd.Timestamp) -> pd.DataFrame:
+        method, kind, _ = self.endpoint_map[endpoint]
+        method = getattr(self.client, method)
+        if kind == 'day':
+            return method(d_from)
+        if kind == 'mtu':
+            parts = []
+            for mtu in pd.date_range(d_from, d_to, freq=self.MTU, inclusive='left'):
+                try:
+                    parts.append(method(mtu))
+                except NoMatchingDataError:
+                    pass
+            if len(parts) == 0:
+                raise NoMatchingDataError
+            return pd.concat(parts, ignore_index=True)
+        if kind == 'domain':
+            return method(d_from=d_from, d_to=d_to)
+        # the base endpoints take the start of the last mtu as end, like _query_base_day does
+        return method(d_from=d_from, d_to=d_to - pd.Timedelta(minutes=1))
+
+    def plan(self, endpoint: str, day: pd.Timestamp, last_modified: pd.Timestamp | None) -> str | list | None:
+        """
+        decide what to do for one endpoint and business day
+
+        :return: 'full' to fetch the whole day, a list of (first, last) missing mtus to fetch or None to skip
+        """
+        _, kind, dense = self.endpoint_map[endpoint]
+        if not self.store.has(endpoint, day):
+            return 'full'
+        meta = self.store.meta(endpoint, day)
+        if last_modified is not None and (meta.get('last_modified') is None
+                                          or pd.Timestamp(meta['last_modified']) < last_modified):
+            return 'full'
+        if not dense or meta.get('complete', False):
+            return None
+        stored = _mtus(self.store.read(endpoint, day))
+        resolution = _resolution(stored)
+        missing = expected_mtus(day, resolution).difference(stored)
+        if len(missing) == 0:
+            return None
+        if kind == 'day':
+            return 'full'
+        return _gaps(missing, resolution)
+
+    def _sync_partition(self, endpoint: str, day: pd.Timestamp, action, last_modified, deadline) -> str | None:
+        try:
+            if action == 'full':
+                df = self._fetch(endpoint, day, day + pd.DateOffset(days=1))
+            else:
+                parts = [self.store.read(endpoint, day)]
+                resolution = _resolution(_mtus(parts[0]))
+                for first, last in action:
+                    try:
+                        parts.append(self._fetch(endpoint, first, last + resolution))
+                    except NoMatchingDataError:
+                        pass
+                df = pd.concat(parts)
+                if 'mtu' in df.columns:
+                    df = df.drop_duplicates().sort_values('mtu', kind='stable')
+                else:
+                    df = df[~df.index.duplicated(keep='last')].sort_index()
+        except NoMatchingDataError:
+            # nothing published (yet) for this day
+            return None
+        except NotImplementedError:
+            # endpoint does not exist for this client
+            return None
+
+        _, _, dense = self.endpoint_map[endpoint]
+        stored = _mtus(df)
+        complete = deadline is not None and deadline < pd.Timestamp.now(tz='Europe/Amsterdam') and \
+            (not dense or len(expected_mtus(day, _resolution(stored)).difference(stored)) == 0)
+        self.store.write(endpoint, day, df, meta={
+            'synced_on': pd.Timestamp.now(tz='Europe/Amsterdam'),
+            'last_modified': last_modified,
+            'deadline': deadline,
+            'complete': complete,
+        })
+        return 'full' if action == 'full' else 'gaps'
+
+    def sync(self, d_from, d_to) -> list[tuple[str, pd.Timestamp, str]]:
+        """
+        bring the store up to date for all business days from d_from up to and including d_to
+
+        :param d_from: first business day, anything accepted by pandas Timestamp
+        :param d_to: last business day, anything accepted by pandas Timestamp
+        :return: list of (endpoint, business day, 'full' or 'gaps') of everything that was fetched
+        """
+        days = business_days(d_from, d_to)
+        if self.MONITORING:
+            monitoring = self.client._starmap(self._monitoring, [(day,) for day in days], parallel=True)
+        else:
+            monitoring = [None] * len(days)
+
+        tasks = []
+        for (day, rows), endpoint in itertools.product(zip(days, monitoring), self.endpoints):
+            # only a change of the dataset of the endpoint itself makes it fetch the day again
+            last_modified, deadline = self._modified(rows, endpoint)
+            action = self.plan(endpoint, day, last_modified)
+            if action is not None:
+                tasks.append((endpoint, day, action, last_modified, deadline))
+
+        results = self.client._starmap(self._sync_partition, tasks, parallel=True)
+        return [(t[0], t[1], r) for t, r in zip(tasks, results) if r is not None]
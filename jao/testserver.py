@@ -0,0 +1,240 @@
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+import numpy as np
+import pandas as pd
+
+
+REGIONS = ['core', 'nordic', 'coreID', 'ibwt']
+
+
+def _utc(d: str) -> np.datetime64:
+    return pd.Timestamp(d).tz_convert('UTC').tz_localize(None).to_datetime64()
+
+
+class _Endpoint:
+    # rows of one endpoint with their mtus parsed once, so every request is a couple of numpy masks
+    def __init__(self, rows: list[dict]):
+        self.rows = rows
+        self.mtus = pd.to_datetime(
+            [r.get('dateTimeUtc', r.get('businessDayUtc')) for r in rows], utc=True, format='ISO8601'
+        ).tz_localize(None).to_numpy()
+        self.columns = {}
+
+    def column(self, key: str) -> np.ndarray:
+        if key not in self.columns:
+            self.columns[key] = np.array([r.get(key) for r in self.rows], dtype=object)
+        return self.columns[key]
+
+
+class JaoTestServer:
+    """
+    local stand-in for the publication tool, for load and correctness tests without network.
+    serves the data and system endpoints of the core, nordic, coreID and ibwt regions from fixture data:
+        data: {region: {endpoint: [rows as the publication tool returns them]}}
+    the intraday endpoints are served under their full name (IDCCA_finalComputation), or under the bare name
+    when there is no fixture for the full one.
+
+    emulated behaviour of the publication tool:
+        - domain queries (FromUtc/ToUtc): mtus in [FromUtc, ToUtc), the Filter (Presolved/NonRedundant, CnecName,
+          Contingency, Tso) and Skip/Take pagination with totalRowsWithFilter, pages capped at max_take rows and
+          a 503 on pages asking for more than overload_take rows like jao does when it chokes on a big page
+        - base queries (FromUTC/ToUTC): mtus in [FromUTC, ToUTC], a 400 when the window is longer than max_window
+          like jao does on the DST weekends
+        - a rate limit of rate_limit requests per rate_period seconds, answered with a 429 and Retry-After
+        - latency per request and per row returned, and a fraction of requests failing with a 503
+
+    use as a context manager, point a client at it with its BASEURL:
+        with JaoTestServer(data) as server:
+            client = JaoPublicationToolPandasClient()
+            client.BASEURL = server.baseurl('core')
+    """
+
+    def __init__(self, data: dict, host: str = '127.0.0.1', port: int = 0, latency: float = 0,
+                 row_latency: float = 0, rate_limit: int | None = None, rate_period: float = 60,
+                 max_window: pd.Timedelta = pd.Timedelta(hours=48), error_rate: float = 0,
+                 max_take: int | None = None, overload_take: int | None = None):
+        """
+        :param data: fixture data per region and endpoint
+        :param host: host to listen on
+        :param port: port to listen on, 0 for any free port
+        :param latency: seconds every request takes
+        :param row_latency: extra seconds per row returned
+        :param rate_limit: amount of requests per rate_period, None for no limit
+        :param rate_period: length of the rate limit window in seconds
+        :param max_window: longest window base queries accept
+        :param error_rate: fraction of requests answered with a 503
+        :param max_take: most rows returned per page whatever the Take, None for no cap
+        :param overload_take: Take above which domain pages fail with a 503, None to serve any size
+        """
+        unknown = [r for r in data if r not in REGIONS]
+        if len(unknown) > 0:
+            raise ValueError(f"unknown regions {unknown}, choose from {REGIONS}")
+        self.endpoints = {region: {name: _Endpoint(rows) for name, rows in endpoints.items()}
+                          for region, endpoints in data.items()}
+        self.latency = latency
+        self.row_latency = row_latency
+        self.rate_limit = rate_limit
+        self.rate_period = rate_period
+        self.max_window = max_window
+        self.error_rate = error_rate
+        self.max_take = max_take
+        self.overload_take = overload_take
+
+        # every request that came in as (path, query, status), for assertions in tests
+        self.log = []
+        # requests being answered right now, and the most there were at the same time
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+        self._window_start = time.monotonic()
+        self._window_count = 0
+
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def baseurl(self, region: str, prefix: str = '') -> str:
+        """
+        BASEURL for a client of the region, prefix is the version of intraday clients, for example IDCCA_
+        """
+        return f'{self.url}/{region}/api/data/{prefix}'
+
+    def update(self, region: str, endpoint: str, rows: list[dict]):
+        """
+        replace the fixture data of one endpoint while running, for example to publish a day bit by bit
+        """
+        if region not in REGIONS:
+            raise ValueError(f"unknown region {region}, choose from {REGIONS}")
+        with self._lock:
+            self.endpoints.setdefault(region, {})[endpoint] = _Endpoint(rows)
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _rate_limited(self) -> float | None:
+        # seconds until the next window when over the limit
+        if self.rate_limit is None:
+            return None
+        with self._lock:
+            now = time.monotonic()
+            if now - self._window_start >= self.rate_period:
+                self._window_start = now
+                self._window_count = 0
+            self._window_count += 1
+            if self._window_count > self.rate_limit:
+                return self.rate_period - (now - self._window_start)
+        return None
+
+    def _endpoint(self, region: str, name: str) -> _Endpoint | None:
+        endpoints = self.endpoints.get(region, {})
+        if name in endpoints:
+            return endpoints[name]
+        return endpoints.get(name.split('_', 1)[-1])
+
+    @staticmethod
+    def _filter(endpoint: _Endpoint, mask: np.ndarray, filter: dict) -> np.ndarray:
+        for key, column in [('Presolved', 'presolved'), ('NonRedundant', 'nonRedundant')]:
+            if key in filter:
+                mask &= endpoint.column(column) == filter[key]
+        for key, column in [('CnecName', 'cnecName'), ('Contingency', 'contName')]:
+            if key in filter:
+                needle = filter[key].lower()
+                mask &= np.array([v is not None and needle in v.lower() for v in endpoint.column(column)], dtype=bool)
+        if 'Tso' in filter:
+            tsos = list(filter['Tso'])
+            mask &= np.isin(endpoint.column('tsoEic'), tsos) | np.isin(endpoint.column('tso'), tsos)
+        return mask
+
+    def respond(self, path: str, query: dict) -> tuple[int, dict, dict | None]:
+        """
+        answer of the publication tool to a request, as (status, headers, body)
+        """
+        retry_after = self._rate_limited()
+        if retry_after is not None:
+            return 429, {'Retry-After': str(max(int(np.ceil(retry_after)), 1))}, {'message': 'Too Many Requests'}
+        if self.error_rate > 0 and random.random() < self.error_rate:
+            return 503, {}, {'message': 'Service Unavailable'}
+
+        parts = path.strip('/').split('/')
+        if len(parts) != 4 or parts[1] != 'api' or parts[2] not in ('data', 'system'):
+            return 404, {}, None
+        endpoint = self._endpoint(parts[0], parts[3])
+        if endpoint is None:
+            return 404, {}, None
+
+        if 'FromUtc' in query:
+            # domain query, paginated
+            d_from, d_to = _utc(query['FromUtc']), _utc(query['ToUtc'])
+            mask = (endpoint.mtus >= d_from) & (endpoint.mtus < d_to)
+            mask = self._filter(endpoint, mask, json.loads(query.get('Filter', '{}')))
+            idx = np.flatnonzero(mask)
+            skip, take = int(query.get('Skip', 0)), int(query.get('Take', 10))
+            if self.overload_take is not None and take > self.overload_take:
+                return 503, {}, {'message': 'Service Unavailable'}
+            if self.max_take is not None:
+                take = min(take, self.max_take)
+            rows = [endpoint.rows[i] for i in idx[skip:skip + take]]
+            return 200, {}, {'totalRowsWithFilter': len(idx), 'data': rows}
+
+        if 'FromUTC' not in query:
+            return 400, {}, {'message': 'FromUTC and ToUTC are required'}
+        d_from, d_to = _utc(query['FromUTC']), _utc(query['ToUTC'])
+        if d_to - d_from > self.max_window.to_timedelta64():
+            return 400, {}, {'message': 'Maximum range is 2 days'}
+        mask = (endpoint.mtus >= d_from) & (endpoint.mtus <= d_to)
+        return 200, {}, {'data': [endpoint.rows[i] for i in np.flatnonzero(mask)]}
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                url = urlparse(self.path)
+                query = {k: v[0] for k, v in parse_qs(url.query).items()}
+                with server._lock:
+                    server.in_flight += 1
+                    server.max_in_flight = max(server.max_in_flight, server.in_flight)
+                try:
+                    status, headers, body = server.respond(url.path, query)
+                except Exception as e:
+                    status, headers, body = 500, {}, {'message': repr(e)}
+                if status == 200:
+                    time.sleep(server.latency + server.row_latency * len(body['data']))
+                with server._lock:
+                    server.in_flight -= 1
+                    server.log.append((url.path, query, status))
+
+                content = json.dumps(body).encode() if body is not None else b''
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(content)))
+                for k, v in headers.items():
+                    self.send_header(k, v)
+                self.end_headers()
+                self.wfile.write(content)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
@@ -1,5 +1,7 @@
 import re
+from functools import lru_cache
 
 
+@lru_cache(maxsize=4096)
 def to_snake_case(camelCase):
     return re.sub(r'(?<!^)(?=[A-Z])', '_', camelCase).lower()
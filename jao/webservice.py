@@ -1,8 +1,8 @@
-import requests
 import pandas as pd
 from datetime import timedelta, date
 from calendar import monthrange
 from dateutil.relativedelta import relativedelta
+from .retry import RetryPolicy, RetrySession
 
 
 class JaoAPIClient:
@@ -10,8 +10,8 @@ class JaoAPIClient:
 
     BASEURL = "https://api.jao.eu/OWSMP/"
 
-    def __init__(self, api_key):
-        self.s = requests.Session()
+    def __init__(self, api_key, retry: RetryPolicy = None):
+        self.s = RetrySession(retry)
         self.s.headers.update({
             'user-agent': 'jao-py (github.com/fboerman/jao-py)',
             'AUTH_API_KEY': api_key
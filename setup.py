@@ -59,4 +59,13 @@ setup(
     package_data={
         'jao-py': ['LICENSE.md', 'README.md'],
     },
+
+    extras_require={
+        'store': ['pyarrow'],
+        'solver': ['highspy'],
+    },
+
+    entry_points={
+        'console_scripts': ['jao=jao.cli:main'],
+    },
 )
@@ -0,0 +1,52 @@
+import asyncio
+import pandas as pd
+from jao import JaoPublicationToolPandasClient
+from jao.jao_async import JaoPublicationToolAsyncClient
+from jao.testserver import JaoTestServer
+
+
+ENDPOINTS = ['netPos', 'maxExchanges', 'maxNetPos', 'shadowPrices', 'lta', 'alphaFactor', 'priceSpread',
+             'congestionIncome']
+
+
+def test_nested_fan_out_at_low_concurrency(base_rows):
+    # every endpoint of the bundle runs on the pool and fans out its windows again, with more endpoints
+    # than threads that would wait on the pool from inside it
+    day = pd.Timestamp('2025-10-26', tz='Europe/Amsterdam')
+    mtus = pd.date_range(day, day + pd.DateOffset(days=1), freq='h', inclusive='left')
+    rows = [dict(r, lastModifiedOn='2025-10-25T10:00:00Z') for r in base_rows(mtus)]
+
+    async def bundle(server):
+        client = JaoPublicationToolPandasClient(rate_limit=None, executor=None)
+        client.BASEURL = server.baseurl('core')
+        async with JaoPublicationToolAsyncClient(client, max_concurrency=2) as async_client:
+            return await asyncio.wait_for(async_client.query_day_bundle(day, endpoints=ENDPOINTS), 30)
+
+    with JaoTestServer({'core': {e: rows for e in ENDPOINTS}}) as server:
+        result = asyncio.run(bundle(server))
+    assert list(result) == ENDPOINTS
+    assert all(len(df) == 25 for e, df in result.items() if e != 'shadowPrices')
+    assert len(server.log) == len(ENDPOINTS)
+
+
+def test_max_concurrency_caps_requests(base_rows):
+    # queries that do not fan out at all count as well
+    day = pd.Timestamp('2025-10-20', tz='Europe/Amsterdam')
+    mtus = pd.date_range(day, day + pd.DateOffset(days=16), freq='h', inclusive='left')
+    days = pd.date_range(day, periods=16, freq='D')
+
+    async def query_days(client):
+        async with JaoPublicationToolAsyncClient(client, max_concurrency=2) as async_client:
+            return await asyncio.gather(*[async_client.query_net_position(d) for d in days])
+
+    with JaoTestServer({'core': {'netPos': base_rows(mtus)}}, latency=0.05) as server:
+        client = JaoPublicationToolPandasClient(rate_limit=None)
+        client.BASEURL = server.baseurl('core')
+        result = asyncio.run(query_days(client))
+        assert sum(len(df) for df in result) == len(mtus)
+        assert len(server.log) == 16 and server.max_in_flight <= 2
+
+        # the client passed in is left as it is and still works after the wrapper is closed
+        assert '_starmap' not in vars(client) and '_get' not in vars(client)
+        assert len(client.query_net_position(days[0])) == 24
+        client.close()
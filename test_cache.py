@@ -0,0 +1,72 @@
+import os
+import time
+from types import SimpleNamespace
+import pandas as pd
+from jao.cache import ResponseCache
+import pytest
+
+
+@pytest.fixture()
+def cache(tmp_path):
+    cache = ResponseCache(str(tmp_path))
+    yield cache
+
+
+def _params(day: pd.Timestamp) -> dict:
+    return {
+        'FromUTC': day.tz_convert('UTC').strftime('%Y-%m-%dT%H:%M:%S.000Z'),
+        'ToUTC': (day + pd.Timedelta(hours=23, minutes=59)).tz_convert('UTC').strftime('%Y-%m-%dT%H:%M:%S.000Z')
+    }
+
+
+def _age(cache, url, params, seconds):
+    fname = cache._file(url, params)
+    os.utime(fname, (time.time() - seconds, time.time() - seconds))
+
+
+def test_roundtrip(cache):
+    url = 'https://publicationtool.jao.eu/core/api/data/shadowPrices'
+    params = _params(pd.Timestamp('2025-03-23', tz='Europe/Amsterdam'))
+    assert cache.get(url, params) is None
+    cache.set(url, params, b'{"data": []}')
+    assert cache.get(url, params) == b'{"data": []}'
+    assert cache.response(url, cache.get(url, params)).json() == {'data': []}
+    # parameter order does not matter
+    assert cache.get(url, dict(reversed(params.items()))) == b'{"data": []}'
+
+
+def _store(cache, url, params, stored_on: pd.Timestamp):
+    cache.set(url, params, b'{}')
+    os.utime(cache._file(url, params), (stored_on.timestamp(), stored_on.timestamp()))
+
+
+def test_final_data_never_expires(cache, monkeypatch):
+    # pinned clock: a year after the business day, so the outcome does not depend on the day the test runs
+    day = pd.Timestamp('2025-03-23', tz='Europe/Amsterdam')
+    now = day + pd.Timedelta(days=365)
+    monkeypatch.setattr('jao.cache.time', SimpleNamespace(time=now.timestamp))
+    url = 'https://publicationtool.jao.eu/core/api/data/finalComputation'
+    params = _params(day)
+    # stored when the day was final (2 days after it), so it is still valid now
+    _store(cache, url, params, day + pd.Timedelta(days=3, hours=1))
+    assert cache.get(url, params) == b'{}'
+    # stored the day after, while it could still change, so expired long ago
+    _store(cache, url, params, day + pd.Timedelta(days=1, hours=1))
+    assert cache.get(url, params) is None
+
+
+def test_recent_data_expires(cache):
+    url = 'https://publicationtool.jao.eu/core/api/data/IDCCA_initialComputation'
+    params = _params(pd.Timestamp.now(tz='Europe/Amsterdam').normalize())
+    cache.set(url, params, b'{}')
+    assert cache.get(url, params) == b'{}'
+    _age(cache, url, params, 3600)
+    assert cache.get(url, params) is None
+
+
+def test_monitoring_always_expires(cache):
+    url = 'https://publicationtool.jao.eu/core/api/system/monitoring'
+    params = _params(pd.Timestamp('2025-03-23', tz='Europe/Amsterdam'))
+    cache.set(url, params, b'{}')
+    _age(cache, url, params, 365 * 24 * 3600)
+    assert cache.get(url, params) is None
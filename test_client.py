@@ -0,0 +1,194 @@
+import io
+import json
+import threading
+import zipfile
+from urllib.parse import urlparse, parse_qs
+import pandas as pd
+import pytest
+import requests
+from requests.adapters import BaseAdapter
+from jao import JaoPublicationToolPandasClient
+from jao.exceptions import NoMatchingDataError
+from jao.metrics import Observer
+
+
+class Recorder(Observer):
+    def __init__(self):
+        self.requests = []
+
+    def on_request(self, event):
+        self.requests.append(event)
+
+
+class FakeJao(BaseAdapter):
+    # answers base output queries offline with one row per hour of the requested window
+    # windows longer than max_window are turned down with a 400, like jao does
+    def __init__(self, max_window: pd.Timedelta = pd.Timedelta(hours=48)):
+        super().__init__()
+        self.max_window = max_window
+        self.requests = []
+        self.threads = set()
+        self._lock = threading.Lock()
+
+    def send(self, request, **kwargs):
+        query = {k: v[0] for k, v in parse_qs(urlparse(request.url).query).items()}
+        with self._lock:
+            self.requests.append(query)
+            self.threads.add(threading.current_thread().name)
+        if urlparse(request.url).netloc == 'mirror.flowbased.eu':
+            return self._mirror(request)
+        mtus = pd.date_range(query['FromUTC'], query['ToUTC'], freq='h', inclusive='left')
+        r = requests.Response()
+        r.status_code = 200
+        r.url = request.url
+        if pd.Timestamp(query['ToUTC']) - pd.Timestamp(query['FromUTC']) > self.max_window:
+            r.status_code = 400
+            r._content = b'{}'
+            return r
+        if request.url.split('?')[0].endswith('congestionIncome'):
+            # not published yet
+            mtus = []
+        elif request.url.split('?')[0].endswith('lta'):
+            # only part of the day
+            mtus = mtus[:12]
+        r._content = json.dumps({'data': [
+            {'id': i, 'dateTimeUtc': mtu.strftime('%Y-%m-%dT%H:%M:%SZ'), 'hub_NL': float(i)}
+            for i, mtu in enumerate(mtus)
+        ]}).encode()
+        return r
+
+    def _mirror(self, request):
+        # zipped csv of a day of final domain, two cnecs per hour
+        date = urlparse(request.url).path.rsplit('/', 1)[-1]
+        mtus = pd.date_range(date, periods=24, freq='h', tz='Europe/Amsterdam')
+        df = pd.DataFrame({
+            'mtu': mtus.repeat(2),
+            'tso': ['TENNETBV', 'ELIA'] * 24,
+            'cnec_name': ['Line A', 'Line B'] * 24,
+            'cont_name': ['Basecase', 'Trafo X'] * 24,
+            'presolved': [True, False] * 24,
+            'ram': 100.0,
+        })
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, 'w') as zf:
+            zf.writestr(f'final_domain_{date}.csv', df.to_csv())
+        r = requests.Response()
+        r.status_code = 200
+        r.url = request.url
+        r.raw = io.BytesIO(buffer.getvalue())
+        return r
+
+    def close(self):
+        pass
+
+
+@pytest.fixture()
+def fake():
+    yield FakeJao()
+
+
+@pytest.fixture()
+def client(fake, tmp_path, monkeypatch):
+    monkeypatch.setenv('JAO_MIRROR_DIR', str(tmp_path / 'mirror'))
+    client = JaoPublicationToolPandasClient(max_workers=4, rate_limit=None)
+    client.s.mount('https://', fake)
+    yield client
+    client.close()
+
+
+def test_base_fromto_windows_in_parallel(client, fake):
+    d_from = pd.Timestamp('2025-03-01', tz='Europe/Amsterdam')
+    d_to = pd.Timestamp('2025-03-31 23:00', tz='Europe/Amsterdam')
+    df = client.query_net_position_fromto(d_from, d_to)
+    assert len(fake.requests) == 16
+    assert len(fake.threads) > 1
+    # the windows come back in order without gaps or duplicates
+    assert df.index.is_monotonic_increasing and df.index.is_unique
+    assert df.index[0] == d_from
+
+
+def test_windows_around_dst(client, fake):
+    # the 25 hour day does not fit in a window with another day, but is planned on its own without any 400
+    d_from = pd.Timestamp('2025-10-23', tz='Europe/Amsterdam')
+    d_to = pd.Timestamp('2025-10-30 23:59', tz='Europe/Amsterdam')
+    df = client.query_net_position_fromto(d_from, d_to)
+    assert len(fake.requests) == 5
+    assert len(df) == 8 * 24 + 1 and df.index.is_unique
+
+
+def test_learns_max_window(client, fake):
+    fake.max_window = pd.Timedelta(hours=25)
+    d_from = pd.Timestamp('2025-03-01', tz='Europe/Amsterdam')
+    d_to = pd.Timestamp('2025-03-08 23:59', tz='Europe/Amsterdam')
+    df = client.query_net_position_fromto(d_from, d_to)
+    assert len(df) == 8 * 24 and df.index.is_unique
+    # after the first turned down window all days are planned on their own
+    fake.requests.clear()
+    client.query_net_position_fromto(d_from, d_to)
+    assert len(fake.requests) == 8
+
+
+def test_grows_max_window(client, fake):
+    # jao accepts four days, the client starts at two and grows a day per query until it is turned down once
+    fake.max_window = pd.Timedelta(hours=96)
+    d_from = pd.Timestamp('2025-03-01', tz='Europe/Amsterdam')
+    d_to = pd.Timestamp('2025-03-12 23:59', tz='Europe/Amsterdam')
+    # by default the windows stay at two days
+    client.query_net_position_fromto(d_from, d_to)
+    assert client._max_window('netPos') == pd.Timedelta(hours=48)
+    client.GROW_WINDOW = {'netPos': pd.Timedelta(days=1)}
+    requests_per_query = []
+    for _ in range(4):
+        fake.requests.clear()
+        df = client.query_net_position_fromto(d_from, d_to)
+        assert len(df) == 12 * 24 and df.index.is_unique
+        requests_per_query.append(len(fake.requests))
+    # 6 windows of two days, 4 of three, 3 of four, then 4 of five which are turned down and split
+    assert requests_per_query[:3] == [6, 4, 3]
+    assert client._max_window('netPos') < pd.Timedelta(hours=120)
+    fake.requests.clear()
+    client.query_net_position_fromto(d_from, d_to)
+    assert len(fake.requests) == 3
+
+
+def test_mirror_filters(client, fake):
+    mtu = pd.Timestamp('2025-03-23 12:00', tz='Europe/Amsterdam')
+    df = client.query_final_domain(mtu, use_mirror=True)
+    assert len(df) == 2 and (df['mtu'] == mtu).all()
+    assert len(client.query_final_domain(mtu, presolved=True, use_mirror=True)) == 1
+    assert client.query_final_domain(mtu, cne='line b', use_mirror=True)['tso'].to_list() == ['ELIA']
+    assert client.query_final_domain(mtu, co='trafo', use_mirror=True)['tso'].to_list() == ['ELIA']
+    assert client.query_final_domain(mtu, tso='10X1001A1001A361', use_mirror=True)['tso'].to_list() == ['TENNETBV']
+    with pytest.raises(NoMatchingDataError):
+        client.query_final_domain(mtu, tso='RTE', use_mirror=True)
+    # the day was only downloaded once
+    assert len(fake.requests) == 1
+
+
+def test_mirror_through_client(client, fake, tmp_path):
+    pytest.importorskip('pyarrow')
+    recorder = Recorder()
+    client.observers.append(recorder)
+    mtu = pd.Timestamp('2025-03-23 12:00', tz='Europe/Amsterdam')
+    assert len(client.query_final_domain(mtu, use_mirror=True)) == 2
+    # downloaded by the client, so rate limited, retried and instrumented like any other request
+    assert [e.endpoint for e in recorder.requests] == ['2025-03-23'] and recorder.requests[0].status == 200
+    # and kept as parquet without a response cache, a new client does not download it again
+    assert (tmp_path / 'mirror' / 'final_domain' / '2025-03-23.parquet').exists()
+    other = JaoPublicationToolPandasClient(rate_limit=None)
+    other.s.mount('https://', fake)
+    fake.requests.clear()
+    assert len(other.query_final_domain(mtu + pd.Timedelta(hours=1), use_mirror=True)) == 2
+    assert fake.requests == []
+    other.close()
+
+
+def test_day_bundle(client, fake):
+    day = pd.Timestamp('2025-10-26', tz='Europe/Amsterdam')
+    bundle = client.query_day_bundle(day, endpoints=['netPos', 'maxNetPos', 'lta', 'shadowPrices', 'congestionIncome'])
+    assert set(bundle) == {'netPos', 'maxNetPos', 'lta', 'shadowPrices'}
+    assert len(fake.threads) > 1
+    # all datasets with a row per mtu are on the same index of the 25 hour day
+    assert len(bundle['netPos']) == 25
+    assert bundle['netPos'].index.equals(bundle['lta'].index)
+    assert bundle['lta']['hub_NL'].isna().sum() == 13
@@ -207,3 +207,12 @@ def test_range_2(client, mtu):
         pd.Timestamp('2025-10-27', tz='Europe/Amsterdam')
     )
     assert len(df) == 49
+
+def test_final_domain_range(client, mtu):
+    df = client.query_final_domain_fromto(
+        d_from=mtu,
+        d_to=mtu + pd.Timedelta(hours=2),
+        presolved=True
+    )
+    assert df['mtu'].nunique() == 2
+    assert len(df[df['mtu'] == mtu]) == 123
@@ -0,0 +1,226 @@
+import itertools
+import numpy as np
+import pandas as pd
+import pytest
+from jao import JaoPublicationToolPandasClient
+from jao.domain import FlowBasedDomain
+from jao.parsers import parse_final_domain
+from jao.testserver import JaoTestServer
+
+
+ZONES = ['BE', 'DE', 'FR', 'NL']
+
+
+def _rows(mtus: list[str], cnecs: int) -> list[dict]:
+    rng = np.random.default_rng(0)
+    return [
+        {
+            'id': i,
+            'dateTimeUtc': mtu,
+            'cnecName': f'line {i % cnecs}',
+            'contName': 'Basecase' if i % 2 == 0 else 'trafo',
+            'contingencies': [{'number': 1, 'branchname': 'trafo', 'branchEic': 'EIC'}],
+            'ram': float(100 + i),
+            **{f'ptdf_{z}': float(p) for z, p in zip(ZONES, rng.uniform(-0.3, 0.3, len(ZONES)))},
+        }
+        for mtu in mtus for i in range(cnecs)
+    ]
+
+
+@pytest.fixture()
+def df():
+    # mtus out of order, like after concatenating queries
+    return parse_final_domain(
+        _rows(['2025-03-23T12:00:00Z', '2025-03-23T10:00:00Z', '2025-03-23T11:00:00Z'], 5)
+    )
+
+
+def test_from_frame(df):
+    domain = FlowBasedDomain.from_frame(df)
+    assert domain.zones == ZONES
+    assert domain.ptdf.shape == (15, 4) and domain.ptdf.flags['C_CONTIGUOUS']
+    assert domain.mtus.is_monotonic_increasing and len(domain.mtus) == 3
+    assert list(domain.offsets) == [0, 5, 10, 15]
+    # rows map back to the frame
+    assert np.array_equal(domain.ram, df['ram'].to_numpy()[domain.rows])
+    assert np.array_equal(domain.ptdf[:, 1], df['ptdf_DE'].to_numpy()[domain.rows])
+    assert (domain.mtus[domain.mtu_index] == df['mtu'].to_numpy()[domain.rows]).all()
+    assert list(domain.cnecs[domain.cnec_index[:5]]) == [f'line {i}' for i in range(5)]
+    assert set(domain.contingencies) == {'Basecase', 'trafo'}
+
+
+def test_mtu_slices_are_views(df):
+    domain = FlowBasedDomain.from_frame(df)
+    mtu = pd.Timestamp('2025-03-23 12:00', tz='Europe/Amsterdam')
+    part = domain.mtu(mtu)
+    assert len(part) == 5 and np.shares_memory(part.ptdf, domain.ptdf) and np.shares_memory(part.ram, domain.ram)
+    assert (part.mtus[part.mtu_index] == mtu).all()
+    assert list(part.offsets) == [0, 5]
+
+    both = domain.mtu_range(mtu, mtu + pd.Timedelta(hours=2))
+    assert len(both) == 10 and list(both.mtus) == list(domain.mtus[1:])
+    assert [len(d) for _, d in domain.iter_mtus()] == [5, 5, 5]
+
+
+def test_zone_to_zone(df):
+    domain = FlowBasedDomain.from_frame(df, zones=['NL', 'DE', 'BE'])
+    assert domain.zones == ['NL', 'DE', 'BE']
+    z2z = domain.zone_to_zone([('NL', 'DE'), ('DE', 'BE')])
+    assert np.allclose(z2z[:, 0], domain.ptdf[:, 0] - domain.ptdf[:, 1])
+    assert np.allclose(z2z[:, 1], domain.ptdf[:, 1] - domain.ptdf[:, 2])
+    assert domain.zone_to_zone().shape == (15, 6)
+    with pytest.raises(ValueError):
+        domain.zone_to_zone([('NL', 'FR')])
+
+
+def test_to_frame(df):
+    out = FlowBasedDomain.from_frame(df, dtype=np.float32).to_frame()
+    assert list(out.columns) == ['mtu', 'cnec', 'contingency', 'ram'] + [f'ptdf_{z}' for z in ZONES]
+    assert out['ptdf_NL'].dtype == np.float32
+    assert out['mtu'].is_monotonic_increasing
+
+
+def _net_positions(mtus: pd.DatetimeIndex) -> pd.DataFrame:
+    rng = np.random.default_rng(1)
+    values = rng.uniform(-1000, 1000, (len(mtus), len(ZONES)))
+    df = pd.DataFrame(values - values.mean(axis=1, keepdims=True), columns=[f'hub_{z}' for z in ZONES], index=mtus)
+    df.index.name = 'mtu'
+    return df
+
+
+def test_flows_match_loop(df):
+    domain = FlowBasedDomain.from_frame(df)
+    nps = _net_positions(domain.mtus)
+    result = domain.flows(nps, tolerance=50)
+
+    for i, mtu in enumerate(domain.mtus):
+        part = df[df['mtu'] == mtu]
+        flow = part[[f'ptdf_{z}' for z in ZONES]].to_numpy() @ nps.loc[mtu].to_numpy()
+        r = result.rows[result.offsets[i]:result.offsets[i + 1]]
+        assert np.allclose(result.flow[result.offsets[i]:result.offsets[i + 1]], flow)
+        assert np.array_equal(domain.rows[r], part.index.to_numpy())
+
+    summary = result.summary()
+    assert list(summary.index) == list(domain.mtus)
+    assert np.allclose(summary['min_margin'], [m.min() for m in np.split(result.margin, result.offsets[1:-1])])
+    assert (summary['feasible'] == (summary['min_margin'] >= -50)).all()
+    binding = result.binding_frame()
+    assert len(binding) == result.binding.sum() == summary['binding'].sum()
+    assert (binding['margin'] < 50).all()
+    assert np.allclose(binding['ram'] - binding['flow'], binding['margin'])
+
+
+def test_flows_quarter_hours_on_hourly_domain(df):
+    domain = FlowBasedDomain.from_frame(df)
+    quarters = pd.date_range(domain.mtus[0] - pd.Timedelta(hours=1), periods=16, freq='15min')
+    nps = _net_positions(quarters).rename(columns=lambda c: c[len('hub_'):])
+    domain.CHUNK = 7
+    result = domain.flows(nps)
+    # the hour before the domain is left out, the other 12 quarters get the 5 cnecs of their hour
+    assert list(result.timestamps) == list(quarters[4:])
+    assert len(result) == 12 * 5
+    first = domain.mtu(domain.mtus[1])
+    assert np.allclose(result.flow[20:25], first.ptdf @ nps.iloc[8].to_numpy())
+
+    with pytest.raises(ValueError):
+        domain.flows(nps.drop(columns='NL'))
+
+
+def _vertices_brute_force(a: np.ndarray, c: np.ndarray, bound: float) -> np.ndarray:
+    # every feasible intersection of two boundary lines is a vertex when the cnecs are in general position
+    a = np.vstack([a, [[1, 0], [-1, 0], [0, 1], [0, -1]]])
+    c = np.concatenate([c, [bound] * 4])
+    points = []
+    for i, j in itertools.combinations(range(len(c)), 2):
+        m = a[[i, j]]
+        if abs(np.linalg.det(m)) > 1e-12:
+            p = np.linalg.solve(m, c[[i, j]])
+            if (a @ p <= c + 1e-6).all():
+                points.append(p)
+    return np.unique(np.round(points, 6), axis=0) if points else np.empty((0, 2))
+
+
+@pytest.mark.parametrize('slack', [None, 'FR'])
+def test_project_matches_brute_force(df, slack):
+    domain = FlowBasedDomain.from_frame(df)
+    domain.CLIP = 2
+    base = {'DE': 300.0, 'FR': -200.0}
+    polygons = domain.project('NL', 'BE', base=base, slack=slack, bound=5000)
+    assert len(polygons) == 3
+
+    fixed = np.array([0, base['DE'], 0 if slack else base['FR'], 0])
+    for i, (mtu, d) in enumerate(domain.iter_mtus()):
+        ptdf = d.ptdf - (d.ptdf[:, [2]] if slack else 0)
+        expected = _vertices_brute_force(ptdf[:, [3, 0]], d.ram - ptdf @ fixed, 5000)
+        vertices = polygons.polygon(mtu)
+        assert np.array_equal(np.unique(np.round(vertices, 6), axis=0), expected)
+        # counterclockwise, every edge lies on the line of its cnec
+        assert polygons.area()[mtu] > 0
+        following = np.roll(vertices, -1, axis=0)
+        rows = polygons.rows[polygons.offsets[i]:polygons.offsets[i + 1]]
+        for v, w, r in zip(vertices, following, rows):
+            if r >= 0:
+                line = ptdf[r - domain.offsets[i], [3, 0]]
+                limit = d.ram[r - domain.offsets[i]] - ptdf[r - domain.offsets[i]] @ fixed
+                assert np.allclose([line @ v, line @ w], limit)
+
+    frame = polygons.to_frame()
+    assert list(frame.columns) == ['mtu', 'NL', 'BE', 'cnec', 'contingency', 'row']
+    assert len(frame) == len(polygons.vertices)
+    assert frame.loc[polygons.rows < 0, 'cnec'].isna().all()
+
+
+def test_project_base_frame_and_empty_domain(df):
+    domain = FlowBasedDomain.from_frame(df)
+    base = _net_positions(domain.mtus)
+    polygons = domain.project('DE', 'FR', base=base)
+    fixed = base.to_numpy().copy()
+    fixed[:, [1, 2]] = 0
+    for i, (mtu, d) in enumerate(domain.iter_mtus()):
+        limit = d.ram - d.ptdf @ fixed[i]
+        assert (polygons.polygon(mtu) @ d.ptdf[:, [1, 2]].T <= limit + 1e-6).all()
+
+    # a cnec without ptdfs on the axes that is overloaded by the other zones leaves nothing
+    df.loc[df.index[0], ['ptdf_DE', 'ptdf_FR', 'ram']] = [0, 0, -10]
+    domain = FlowBasedDomain.from_frame(df)
+    polygons = domain.project('DE', 'FR')
+    mtu = domain.mtus[domain.mtu_index[np.flatnonzero(domain.rows == df.index[0])[0]]]
+    assert len(polygons.polygon(mtu)) == 0 and polygons.area()[mtu] == 0
+    assert sum(len(polygons.polygon(m)) > 0 for m in domain.mtus) == 2
+    with pytest.raises(ValueError):
+        domain.project('DE', 'DE')
+    with pytest.raises(ValueError):
+        domain.project('DE', 'FR', base=base.iloc[1:])
+
+
+def _client_net_positions(mtus: pd.DatetimeIndex) -> pd.DataFrame:
+    # net positions as the pandas client returns them: hub_ stripped and DE called DE_LU
+    rows = [
+        {'id': i, 'dateTimeUtc': mtu.tz_convert('UTC').strftime('%Y-%m-%dT%H:%M:%SZ'),
+         **{f'hub_{z}': v for z, v in zip(ZONES, values)}}
+        for i, (mtu, values) in enumerate(_net_positions(mtus).iterrows())
+    ]
+    with JaoTestServer({'core': {'netPos': rows}}) as server, JaoPublicationToolPandasClient(rate_limit=None) as client:
+        client.BASEURL = server.baseurl('core')
+        nps = client.query_net_position_fromto(mtus[0], mtus[-1])
+    assert 'DE_LU' in nps.columns and 'DE' not in nps.columns
+    return nps
+
+
+def test_flows_of_client_net_positions(df):
+    domain = FlowBasedDomain.from_frame(df)
+    result = domain.flows(_client_net_positions(domain.mtus))
+    assert np.allclose(result.flow, domain.flows(_net_positions(domain.mtus)).flow)
+
+
+def test_project_base_of_client_net_positions(df):
+    domain = FlowBasedDomain.from_frame(df)
+    nps = _client_net_positions(domain.mtus)
+    expected = domain.project('NL', 'BE', base=_net_positions(domain.mtus))
+    polygons = domain.project('NL', 'BE', base=nps)
+    assert np.allclose(polygons.vertices, expected.vertices)
+    # a dict base can name the zone either way
+    assert np.allclose(
+        domain.project('NL', 'BE', base={'DE_LU': 300.0}).vertices,
+        domain.project('NL', 'BE', base={'DE': 300.0}).vertices,
+    )
@@ -0,0 +1,49 @@
+import pandas as pd
+from jao import JaoPublicationToolPandasClient, JaoPublicationToolPandasItalyNorth
+from jao.cli import main
+from jao.export import JaoExport
+from jao.store import PartitionedStore
+from jao.testserver import JaoTestServer
+
+
+def test_export_round_trip(tmp_path, domain_rows, base_rows):
+    mtus = pd.date_range('2025-10-25', '2025-10-27', freq='h', tz='Europe/Amsterdam', inclusive='left')
+    data = {'core': {'finalComputation': domain_rows(mtus, 3), 'netPos': base_rows(mtus)}}
+    with JaoTestServer(data) as server, JaoPublicationToolPandasClient(rate_limit=None) as client:
+        client.BASEURL = server.baseurl('core')
+        export = JaoExport(client, str(tmp_path), ['finalComputation', 'netPos'])
+        done = export.export('2025-10-25', '2025-10-26')
+        assert sorted((e, d.day) for e, d, _ in done) == [
+            ('finalComputation', 25), ('finalComputation', 26), ('netPos', 25), ('netPos', 26)
+        ]
+        # monitoring is not consulted at all
+        assert not any('/monitoring' in path for path, _, _ in server.log)
+
+        # what is stored is what the client returns, also for the 25 hour day
+        store = PartitionedStore(str(tmp_path))
+        day = pd.Timestamp('2025-10-26', tz='Europe/Amsterdam')
+        pd.testing.assert_frame_equal(
+            store.read('netPos', day), client.query_net_position_fromto(day, day + pd.Timedelta(hours=24)),
+            check_freq=False
+        )
+        assert len(store.read('finalComputation', day)) == 25 * 3
+
+        # stored partitions are skipped without any request, unless asked to overwrite
+        requests = len(server.log)
+        assert export.export('2025-10-25', '2025-10-26') == [] and len(server.log) == requests
+        assert len(JaoExport(client, str(tmp_path), ['netPos'], overwrite=True).export('2025-10-25', '2025-10-26')) == 2
+
+
+def test_cli_export_ibwt(tmp_path, base_rows, monkeypatch, capsys):
+    mtus = pd.date_range('2025-10-25', '2025-10-27', freq='h', tz='Europe/Amsterdam', inclusive='left')
+    data = {'ibwt': {'CCR_forecasted': base_rows(mtus), 'CCR_FinalTtcNtc': base_rows(mtus)}}
+    with JaoTestServer(data) as server:
+        monkeypatch.setattr(JaoPublicationToolPandasItalyNorth, 'BASEURL', server.baseurl('ibwt'))
+        main(['--region', 'ibwt', '--rate-limit', '0', 'export', '--store', str(tmp_path),
+              '--endpoints', 'CCR_forecasted,CCR_FinalTtcNtc', '--from', '2025-10-25', '--to', '2025-10-26'])
+        assert capsys.readouterr().out.splitlines()[-1] == 'exported 4 partitions'
+        assert all(path.startswith('/ibwt/api/data/CCR_') for path, _, _ in server.log)
+
+    store = PartitionedStore(str(tmp_path))
+    assert len(store.read('CCR_FinalTtcNtc', pd.Timestamp('2025-10-26', tz='Europe/Amsterdam'))) == 25
+    assert len(store.read('CCR_forecasted', pd.Timestamp('2025-10-25', tz='Europe/Amsterdam'))) == 24
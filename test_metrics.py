@@ -0,0 +1,80 @@
+import pandas as pd
+import pytest
+from jao import JaoPublicationToolPandasClient
+from jao.metrics import MetricsCollector, Observer
+from jao.testserver import JaoTestServer
+
+
+class Recorder(Observer):
+    def __init__(self):
+        self.requests = []
+        self.queries = []
+
+    def on_request(self, event):
+        self.requests.append(event)
+
+    def on_query(self, stats):
+        self.queries.append(stats)
+
+
+@pytest.fixture()
+def server(domain_rows, base_rows):
+    mtus = pd.date_range('2025-03-23', '2025-03-24', freq='h', tz='Europe/Amsterdam', inclusive='left')
+    october = pd.date_range('2025-10-20', '2025-11-03', freq='h', tz='Europe/Amsterdam', inclusive='left')
+    data = {'core': {'finalComputation': domain_rows(mtus[:1], 1200), 'netPos': base_rows(october)}}
+    with JaoTestServer(data, latency=0.01) as server:
+        yield server
+
+
+def _client(server, *observers, **kwargs) -> JaoPublicationToolPandasClient:
+    client = JaoPublicationToolPandasClient(rate_limit=None, observers=list(observers), **kwargs)
+    client.BASEURL = server.baseurl('core')
+    return client
+
+
+@pytest.mark.parametrize('executor', ['thread', None])
+def test_domain_query_stats(server, executor):
+    recorder = Recorder()
+    with _client(server, recorder, executor=executor) as client:
+        # pages of 500 whatever the tuning, so the last two go to the pool together
+        client.PAGE_SIZE = client.MAX_PAGE_SIZE = 500
+        mtu = pd.Timestamp('2025-03-23 00:00', tz='Europe/Amsterdam')
+        assert len(client.query_final_domain(mtu)) == 1200
+
+    # the pandas client calling the plain one is still one query, with the requests of the workers in it
+    assert [q.query for q in recorder.queries] == ['query_final_domain']
+    stats = recorder.queries[0]
+    assert stats.error is None
+    assert stats.requests == len(recorder.requests) == len(server.log) == stats.pages
+    assert stats.mtus == 1 and stats.pages_per_mtu == stats.pages
+    assert stats.bytes == sum(e.bytes for e in recorder.requests) > 0
+    assert stats.network >= 0.01 * stats.requests
+    assert stats.decode > 0 and stats.parse > 0
+    assert all(e.endpoint == 'finalComputation' and e.status == 200 for e in recorder.requests)
+
+
+def test_errors_and_collector(server):
+    collector = MetricsCollector()
+    with _client(server, collector) as client:
+        d_from = pd.Timestamp('2025-10-20', tz='Europe/Amsterdam')
+        client.query_net_position_fromto(d_from, pd.Timestamp('2025-10-25 23:00', tz='Europe/Amsterdam'))
+        with pytest.raises(Exception):
+            client.query_maxbex(d_from)
+
+    snapshot = collector.snapshot()
+    assert snapshot['requests']['netPos']['requests'] == 3
+    assert snapshot['requests']['maxExchanges']['statuses'] == {404: 1}
+    assert snapshot['queries']['query_net_position_fromto']['queries'] == 1
+    assert snapshot['queries']['query_maxbex']['errors'] == 1
+    collector.reset()
+    assert collector.snapshot() == {'requests': {}, 'queries': {}}
+
+
+def test_broken_observer_does_not_break_query(server):
+    class Broken(Observer):
+        def on_query(self, stats):
+            raise ValueError('sink is down')
+
+    with _client(server, Broken()) as client, pytest.warns(RuntimeWarning):
+        d_from = pd.Timestamp('2025-10-20', tz='Europe/Amsterdam')
+        assert len(client.query_net_position(d_from)) == 24
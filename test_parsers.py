@@ -0,0 +1,97 @@
+import pandas as pd
+import requests
+from jao.parsers import parse_final_domain, concat_compact
+import pytest
+
+
+@pytest.fixture()
+def data():
+    return [
+        {
+            'id': i,
+            'dateTimeUtc': '2025-03-23T11:00:00Z',
+            'tso': 'TENNETBV',
+            'cnecName': f'cnec {i}',
+            'contingencies': [
+                {'number': 1, 'branchname': f'co {i}', 'branchEic': f'EIC {i}'},
+                {'number': 2, 'branchname': 'co x', 'branchEic': 'EIC x'},
+            ][:i + 1],
+            'presolved': i == 0,
+            'ram': 100.0 * i,
+            'ptdf_NL': 0.1 * i,
+            'ptdf_BE': -0.1 * i,
+        }
+        for i in range(2)
+    ]
+
+
+def test_final_domain(data):
+    df = parse_final_domain(data)
+    assert list(df.columns) == [
+        'id_original', 'mtu', 'tso', 'cnec_name', 'contingency_branchname', 'contingency_branch_eic',
+        'presolved', 'ram', 'ptdf_NL', 'ptdf_BE'
+    ]
+    assert len(df) == 2
+    assert df['contingency_branchname'].to_list() == ['co 0', 'co 1']
+    assert (df['mtu'] == pd.Timestamp('2025-03-23 12:00', tz='Europe/Amsterdam')).all()
+    # input is left untouched
+    assert 'contingencies' in data[0]
+
+
+def test_final_domain_all_contingencies(data):
+    df = parse_final_domain(data, all_contingencies=True)
+    assert len(df) == 3
+    assert df['contingency_number'].to_list() == [1, 1, 2]
+    assert df['cnec_name'].to_list() == ['cnec 0', 'cnec 1', 'cnec 1']
+    assert df['contingency_branchname'].to_list() == ['co 0', 'co 1', 'co x']
+
+
+@pytest.mark.parametrize('all_contingencies', [False, True])
+def test_final_domain_first_row_without_contingency(data, all_contingencies):
+    data[0]['contingencies'] = []
+    df = parse_final_domain(data, all_contingencies=all_contingencies)
+    assert df['contingency_branchname'].isna().iloc[0] and df['contingency_branchname'].iloc[1] == 'co 1'
+    # and a domain without any contingency at all
+    df = parse_final_domain([dict(d, contingencies=[]) for d in data], all_contingencies=all_contingencies)
+    assert len(df) == 2 and df['contingency_branch_eic'].isna().all()
+
+
+def test_final_domain_compact(data):
+    df = parse_final_domain(data * 10, compact=True)
+    assert df['tso'].dtype == 'category'
+    assert df['ptdf_NL'].dtype == 'float32'
+    assert df['ram'].dtype == 'float32'
+    assert df['id_original'].dtype == 'int64'
+    assert df.memory_usage(deep=True).sum() < parse_final_domain(data * 10).memory_usage(deep=True).sum()
+
+
+def test_final_domain_compact_pages(data):
+    # every page gets the same dtypes, also a page of all different cnecs
+    pages = [parse_final_domain(data * 10, compact=True), parse_final_domain(data, compact=True)]
+    pages[1]['cnec_name'] = pages[1]['cnec_name'].cat.rename_categories(['cnec 2', 'cnec 3'])
+    assert all((pages[0].dtypes.astype(str) == page.dtypes.astype(str)).all() for page in pages)
+    assert pages[0]['presolved'].dtype == 'bool'
+    df = concat_compact(pages, ignore_index=True)
+    assert df['cnec_name'].dtype == 'category' and df['tso'].dtype == 'category'
+    assert df['cnec_name'].to_list()[-2:] == ['cnec 2', 'cnec 3']
+    assert df['ram'].dtype == 'float32' and len(df) == 22
+
+
+@pytest.mark.parametrize('day, periods, first_hours', [
+    ('28/03/2021', 23, ['00:00:00+01:00', '01:00:00+01:00', '03:00:00+02:00']),
+    ('31/10/2021', 25, ['00:00:00+02:00', '01:00:00+02:00', '02:00:00+02:00', '02:00:00+01:00', '03:00:00+01:00']),
+])
+def test_cwe_domain_dst(day, periods, first_hours):
+    from jao.CWE import JaoUtilityToolCSVClient
+    header = 'FileId;Row;DeliveryDate;Period;CriticalBranchName;RemainingAvailableMargin;Factor;BiddingArea_Shortname'
+    rows = [f'1|{p}|{day} 00:00:00|{p}|line;|{100 + p}|0.1|NL' for p in range(1, periods + 1)]
+    r = requests.Response()
+    r.encoding = 'utf-8'
+    r._content = '\r\n'.join([header] + rows).encode()
+
+    df = JaoUtilityToolCSVClient()._parse_domain(r)
+    # every period is a different hour, also the doubled one when the clock goes backward
+    assert len(df) == periods and df.index.is_unique and df.index.is_monotonic_increasing
+    assert [t.isoformat()[11:] for t in df.index[:len(first_hours)]] == first_hours
+    assert list(df['RAM']) == [100 + p for p in range(1, periods + 1)]
+    assert (df['CNE'] == 'line').all() and list(df.columns) == ['CNE', 'RAM', 'PTDF_NL']
@@ -0,0 +1,94 @@
+import gc
+import os
+import pickle
+import time
+from email.utils import formatdate
+import pandas as pd
+from jao import JaoPublicationToolPandasClient
+from jao.ratelimit import RateLimiter, parse_retry_after
+from jao.testserver import JaoTestServer
+
+
+def test_parse_retry_after():
+    assert parse_retry_after(None) is None
+    assert parse_retry_after('garbage') is None
+    assert parse_retry_after('12') == 12
+    assert 25 < parse_retry_after(formatdate(time.time() + 30, usegmt=True)) <= 30
+    assert parse_retry_after(formatdate(time.time() - 30, usegmt=True)) == 0
+
+
+def test_burst_then_steady_rate():
+    limiter = RateLimiter(requests=5, period=0.5)
+    start = time.monotonic()
+    for _ in range(5):
+        limiter.acquire()
+    assert time.monotonic() - start < 0.05
+    # every next request has to wait until the window has room again
+    for _ in range(3):
+        limiter.acquire()
+    assert time.monotonic() - start >= 0.25
+
+
+def test_never_more_than_requests_per_period():
+    limiter = RateLimiter(requests=10, period=0.5)
+    times = []
+    for _ in range(30):
+        limiter.acquire()
+        times.append(time.monotonic())
+    # also not the burst at the start together with the requests right after it
+    assert all(times[i + 10] - times[i] >= 0.49 for i in range(len(times) - 10))
+
+
+def test_no_429_at_the_limit_of_the_server(base_rows):
+    # as many requests per period as the server allows, from several threads at once
+    mtus = pd.date_range('2025-01-01', '2025-02-20', freq='h', tz='Europe/Amsterdam', inclusive='left')
+    with JaoTestServer({'core': {'netPos': base_rows(mtus)}}, rate_limit=10, rate_period=1) as server:
+        client = JaoPublicationToolPandasClient(rate_limit=RateLimiter(requests=10, period=1))
+        client.BASEURL = server.baseurl('core')
+        client.RATE_LIMIT_HANDLER = 0
+        assert len(client.query_net_position_fromto(mtus[0], mtus[-1])) == len(mtus)
+        client.close()
+    assert len(server.log) > 20 and all(status == 200 for _, _, status in server.log)
+
+
+def test_block():
+    limiter = RateLimiter(requests=100, period=60)
+    limiter.block(0.2)
+    start = time.monotonic()
+    limiter.acquire()
+    assert time.monotonic() - start >= 0.15
+
+
+def test_shared_over_processes():
+    limiter = RateLimiter(requests=3, period=0.3)
+    limiter.acquire()
+    # a copy in another process uses the same budget
+    copy = pickle.loads(pickle.dumps(limiter))
+    assert limiter.path is not None and copy.path == limiter.path
+    copy.acquire()
+    limiter.acquire()
+    copy.block(0.1)
+    start = time.monotonic()
+    limiter.acquire()
+    assert time.monotonic() - start >= 0.05
+
+
+def test_shared_file_removed(tmp_path):
+    limiter = RateLimiter(requests=3, period=0.3)
+    copy = pickle.loads(pickle.dumps(limiter))
+    path = limiter.path
+    assert os.path.exists(path)
+    # only the limiter that made the file cleans it up
+    del copy
+    gc.collect()
+    assert os.path.exists(path)
+    del limiter
+    gc.collect()
+    assert not os.path.exists(path)
+    # a file passed in is never removed
+    limiter = RateLimiter(path=str(tmp_path / 'ratelimit.json'))
+    limiter.acquire()
+    pickle.dumps(limiter)
+    del limiter
+    gc.collect()
+    assert (tmp_path / 'ratelimit.json').exists()
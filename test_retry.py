@@ -0,0 +1,103 @@
+import time
+import pytest
+import requests
+from requests.adapters import BaseAdapter
+from jao.exceptions import CircuitOpenError
+from jao.ratelimit import RateLimiter
+from jao.retry import RetryPolicy, RetrySession
+
+
+class FakeAdapter(BaseAdapter):
+    # answers with the given statuses in turn, an exception in the list is raised instead
+    def __init__(self, statuses: list):
+        super().__init__()
+        self.statuses = statuses
+        self.calls = 0
+
+    def send(self, request, **kwargs):
+        status = self.statuses[min(self.calls, len(self.statuses) - 1)]
+        self.calls += 1
+        if isinstance(status, Exception):
+            raise status
+        r = requests.Response()
+        r.status_code = status
+        r.url = request.url
+        r._content = b'{}'
+        return r
+
+    def close(self):
+        pass
+
+
+def _session(statuses: list, **kwargs) -> tuple[RetrySession, FakeAdapter]:
+    s = RetrySession(RetryPolicy(backoff=0.001, **kwargs))
+    adapter = FakeAdapter(statuses)
+    s.mount('https://', adapter)
+    return s, adapter
+
+
+def test_retries_until_success():
+    s, adapter = _session([503, requests.ConnectionError(), 200])
+    assert s.get('https://publicationtool.jao.eu/core/api/data/netPos').status_code == 200
+    assert adapter.calls == 3
+
+
+def test_retries_take_rate_limit_tokens():
+    # two requests per 0.2 seconds for three attempts, the last one has to wait until the first is 0.2 seconds old
+    limiter = RateLimiter(requests=2, period=0.2)
+    s, adapter = _session([503, 503, 200])
+    r = s.get('https://publicationtool.jao.eu/core/api/data/netPos', limiter=limiter)
+    assert r.status_code == 200 and adapter.calls == 3
+    assert r.throttled >= 0.15
+
+
+def test_gives_up():
+    s, adapter = _session([502], retries=2)
+    assert s.get('https://publicationtool.jao.eu/core/api/data/netPos').status_code == 502
+    assert adapter.calls == 3
+
+    s, adapter = _session([requests.Timeout()], retries=2)
+    with pytest.raises(requests.Timeout):
+        s.get('https://publicationtool.jao.eu/core/api/data/netPos')
+    assert adapter.calls == 3
+
+
+def test_no_retry_on_client_errors_and_posts():
+    s, adapter = _session([404])
+    assert s.get('https://publicationtool.jao.eu/core/api/data/netPos').status_code == 404
+    s, adapter = _session([503, 200])
+    assert s.post('https://publicationtool.jao.eu/core/api/data/netPos').status_code == 503
+    assert adapter.calls == 1
+
+
+def test_circuit_breaker():
+    s, adapter = _session([503], retries=0, breaker_threshold=3, breaker_reset=0.05)
+    for _ in range(3):
+        s.get('https://publicationtool.jao.eu/core/api/data/netPos')
+    with pytest.raises(CircuitOpenError):
+        s.get('https://publicationtool.jao.eu/core/api/data/netPos')
+    assert adapter.calls == 3
+
+    # after the reset one request is let through, a success closes the circuit again
+    time.sleep(0.06)
+    adapter.statuses = [200]
+    assert s.get('https://publicationtool.jao.eu/core/api/data/netPos').status_code == 200
+    assert s.get('https://publicationtool.jao.eu/core/api/data/netPos').status_code == 200
+
+
+def test_circuit_breaker_counts_requests():
+    # three requests of three attempts each stay under a threshold of four
+    s, adapter = _session([503], retries=2, breaker_threshold=4, breaker_reset=0.05)
+    for _ in range(3):
+        assert s.get('https://publicationtool.jao.eu/core/api/data/netPos').status_code == 503
+    assert adapter.calls == 9
+    s.get('https://publicationtool.jao.eu/core/api/data/netPos')
+    with pytest.raises(CircuitOpenError):
+        s.get('https://publicationtool.jao.eu/core/api/data/netPos')
+
+    # the trial after the reset gets all its retries, a success on the last one closes the circuit
+    time.sleep(0.06)
+    adapter.statuses, adapter.calls = [503, requests.ConnectionError(), 200], 0
+    assert s.get('https://publicationtool.jao.eu/core/api/data/netPos').status_code == 200
+    assert adapter.calls == 3
+    assert s.get('https://publicationtool.jao.eu/core/api/data/netPos').status_code == 200
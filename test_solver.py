@@ -0,0 +1,110 @@
+import numpy as np
+import pandas as pd
+import pytest
+from jao.domain import FlowBasedDomain
+from jao.solver import maxbex, minmax_np, presolve
+
+ZONES = ['BE', 'DE', 'FR', 'NL']
+
+
+@pytest.fixture()
+def domain():
+    # a closed domain: random cnecs plus a box of +-1000 on every zone, over 4 mtus with the same cnecs
+    rng = np.random.default_rng(0)
+    mtus = pd.date_range('2025-03-23', periods=4, freq='h', tz='Europe/Amsterdam')
+    frames = []
+    for mtu in mtus:
+        ptdf = np.vstack([rng.uniform(-0.3, 0.3, (12, 4)), np.eye(4), -np.eye(4)])
+        ram = np.concatenate([rng.uniform(100, 1000, 12), np.full(8, 1000)])
+        df = pd.DataFrame(ptdf, columns=[f'ptdf_{z}' for z in ZONES])
+        df.insert(0, 'mtu', mtu)
+        df['cnec_name'] = [f'cnec {i}' for i in range(len(df))]
+        df['ram'] = ram
+        frames.append(df)
+    return FlowBasedDomain.from_frame(pd.concat(frames, ignore_index=True))
+
+
+def test_maxbex(domain):
+    df = maxbex(domain, borders=[('NL', 'BE'), ('DE', 'FR')])
+    assert list(df.columns) == ['NL>BE', 'DE>FR'] and list(df.index) == list(domain.mtus)
+    for i, (_, d) in enumerate(domain.iter_mtus()):
+        t = df['NL>BE'].iloc[i]
+        direction = np.array([-1, 0, 0, 1])
+        # the exchange ends up on the border of the domain
+        assert np.isclose((d.ptdf @ (t * direction) - d.ram).max(), 0)
+
+    base = {'DE': 200, 'FR': -200}
+    shifted = maxbex(domain, borders=[('NL', 'BE')], base=base)
+    x = np.array([0, 200, -200, 0]) + shifted['NL>BE'].iloc[0] * np.array([-1, 0, 0, 1])
+    assert np.isclose((domain.mtu(domain.mtus[0]).ptdf @ x - domain.mtu(domain.mtus[0]).ram).max(), 0)
+
+    # scenarios with more ram give more exchange
+    scenarios = maxbex(domain, ram=np.vstack([domain.ram, domain.ram * 2]))
+    assert scenarios.index.names == ['scenario', 'mtu']
+    assert np.allclose(scenarios.loc[1].to_numpy(), scenarios.loc[0].to_numpy() * 2)
+
+
+@pytest.mark.parametrize('executor', ['thread', None])
+def test_minmax_np(domain, executor):
+    pytest.importorskip('highspy')
+    linprog = pytest.importorskip('scipy.optimize').linprog
+    df = minmax_np(domain, ram=np.vstack([domain.ram, domain.ram * 0.5]), executor=executor, max_workers=2)
+    assert list(df.columns) == [f'{s}{z}' for z in ZONES for s in ('min', 'max')]
+    assert len(df) == 2 * len(domain.mtus)
+
+    for s, factor in enumerate([1, 0.5]):
+        for mtu, d in domain.iter_mtus():
+            for i, z in enumerate(ZONES):
+                c = np.eye(4)[i]
+                kwargs = dict(A_ub=d.ptdf, b_ub=d.ram * factor, A_eq=np.ones((1, 4)), b_eq=[0], bounds=(None, None))
+                assert np.isclose(df.loc[(s, mtu), f'min{z}'], linprog(c, **kwargs).fun)
+                assert np.isclose(df.loc[(s, mtu), f'max{z}'], -linprog(-c, **kwargs).fun)
+
+
+def test_minmax_np_open_domain(domain):
+    pytest.importorskip('highspy')
+    first = domain.mtu(domain.mtus[0])
+    # only the first cnec left, the domain is open in most directions
+    open_domain = first._subset(0, 1, slice(0, 1))
+    df = minmax_np(open_domain, zones=['NL'], bounds={'BE': (-10, 10)}, executor=None)
+    assert np.isinf(df.to_numpy()).any()
+
+
+def _redundant_brute_force(ptdf, ram, linprog):
+    # a row is redundant when the domain without it does not reach over its ram
+    out = []
+    for i in range(len(ram)):
+        others = np.delete(np.arange(len(ram)), i)
+        r = linprog(-ptdf[i], A_ub=ptdf[others], b_ub=ram[others], A_eq=np.ones((1, ptdf.shape[1])), b_eq=[0],
+                    bounds=(None, None))
+        out.append(r.status == 0 and -r.fun <= ram[i] + 1e-6)
+    return np.array(out)
+
+
+def test_presolve(domain):
+    pytest.importorskip('highspy')
+    linprog = pytest.importorskip('scipy.optimize').linprog
+    keep = presolve(domain, executor=None)
+    assert keep.dtype == bool and len(keep) == len(domain)
+    for mtu, d in domain.iter_mtus():
+        part = keep[d.offsets[0] + domain.offsets[domain.mtus.get_loc(mtu)]:][:len(d)]
+        assert np.array_equal(part, ~_redundant_brute_force(d.ptdf, d.ram, linprog))
+
+
+def test_presolve_frame_with_duplicates_and_bounds(domain):
+    pytest.importorskip('highspy')
+    df = domain.to_frame()
+    # a copy of every cnec with more ram and one with no ptdf at all, both never limit anything
+    looser = df.assign(ram=df['ram'] * 2)
+    empty = df.head(1).assign(**{c: 0.0 for c in df.columns if c.startswith('ptdf_')})
+    frame = pd.concat([looser, df, empty], ignore_index=True).sample(frac=1, random_state=0)
+
+    mask = presolve(frame, max_workers=2)
+    assert mask.name == 'non_redundant' and mask.index.equals(frame.index)
+    assert not mask.loc[frame.index < len(df)].any() and not mask.loc[2 * len(df)]
+    assert mask.sum() == presolve(domain).sum()
+
+    # bounds within the domain leave nothing limiting
+    assert not presolve(domain, bounds={z: (-1, 1) for z in ZONES}).any()
+    minmax = minmax_np(domain)
+    assert presolve(domain, bounds=minmax).sum() <= mask.sum()
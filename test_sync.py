@@ -0,0 +1,149 @@
+import pandas as pd
+import pytest
+from jao import (JaoPublicationToolPandasClient, JaoPublicationToolPandasIntraDay, JaoPublicationToolPandasIntraDayParRun,
+                 JaoPublicationToolPandasNordics)
+from jao.store import PartitionedStore
+from jao.sync import JaoSync
+from jao.testserver import JaoTestServer
+
+
+def _day(day: str) -> tuple[pd.Timestamp, pd.DatetimeIndex]:
+    day = pd.Timestamp(day, tz='Europe/Amsterdam')
+    return day, pd.date_range(day, day + pd.DateOffset(days=1), freq='h', inclusive='left')
+
+
+def _monitoring(days: pd.DatetimeIndex, modified: dict[str, str]) -> list[dict]:
+    # one row per dataset and business day, all past their deadline
+    return [
+        {
+            'id': i,
+            'businessDayUtc': day.tz_convert('UTC').strftime('%Y-%m-%dT%H:%M:%SZ'),
+            'dataset': dataset,
+            'deadline': (day - pd.Timedelta(hours=12)).tz_convert('UTC').strftime('%Y-%m-%dT%H:%M:%SZ'),
+            'lastModifiedOn': last_modified,
+        }
+        for i, (day, (dataset, last_modified)) in enumerate((d, m) for d in days for m in modified.items())
+    ]
+
+
+def _client(server, region: str = 'core') -> JaoPublicationToolPandasClient:
+    client = JaoPublicationToolPandasClient(rate_limit=None)
+    client.BASEURL = server.baseurl(region)
+    return client
+
+
+def _data_requests(server, since: int = 0) -> list:
+    return [(path, query) for path, query, _ in server.log[since:] if '/monitoring' not in path]
+
+
+def test_sync_dst_day(tmp_path, base_rows):
+    day, mtus = _day('2025-10-26')
+    assert len(mtus) == 25
+    data = {'core': {'netPos': base_rows(mtus), 'monitoring': _monitoring(mtus[:1], {'Net position': '2025-10-25T12:00:00Z'})}}
+    with JaoTestServer(data) as server, _client(server) as client:
+        sync = JaoSync(client, str(tmp_path), ['netPos'])
+        assert sync.sync('2025-10-26', '2025-10-26') == [('netPos', day, 'full')]
+        df = sync.store.read('netPos', day)
+        assert len(df) == 25 and df.index.is_unique
+        assert sync.store.meta('netPos', day)['complete']
+
+        # complete and past its deadline, so only monitoring is asked
+        n = len(server.log)
+        assert sync.sync('2025-10-26', '2025-10-26') == []
+        assert _data_requests(server, n) == []
+
+
+def test_sync_fills_partial_day(tmp_path, base_rows):
+    day, mtus = _day('2025-03-30')
+    rows = base_rows(mtus)
+    data = {'core': {'netPos': rows[:10], 'monitoring': _monitoring(mtus[:1], {'netPos': '2025-03-29T12:00:00Z'})}}
+    with JaoTestServer(data) as server, _client(server) as client:
+        sync = JaoSync(client, PartitionedStore(str(tmp_path)), ['netPos'])
+        assert sync.sync('2025-03-30', '2025-03-30') == [('netPos', day, 'full')]
+        assert len(sync.store.read('netPos', day)) == 10
+        assert not sync.store.meta('netPos', day)['complete']
+
+        # the rest of the (23 hour) day is published, only the missing hours are asked
+        server.update('core', 'netPos', rows)
+        n = len(server.log)
+        assert sync.sync('2025-03-30', '2025-03-30') == [('netPos', day, 'gaps')]
+        requests = _data_requests(server, n)
+        assert len(requests) == 1
+        assert pd.Timestamp(requests[0][1]['FromUTC']) == mtus[10]
+        df = sync.store.read('netPos', day)
+        assert len(df) == 23 and list(df.index) == list(mtus)
+        assert sync.store.meta('netPos', day)['complete']
+
+
+def test_sync_refetches_modified_dataset_only(tmp_path, base_rows):
+    day, mtus = _day('2025-10-20')
+    modified = {'netPos': '2025-10-19T12:00:00Z', 'lta': '2025-10-19T12:00:00Z'}
+    data = {'core': {'netPos': base_rows(mtus), 'lta': base_rows(mtus), 'monitoring': _monitoring(mtus[:1], modified)}}
+    with JaoTestServer(data) as server, _client(server) as client:
+        sync = JaoSync(client, str(tmp_path), ['netPos', 'lta'])
+        assert sorted(e for e, _, _ in sync.sync('2025-10-20', '2025-10-20')) == ['lta', 'netPos']
+
+        server.update('core', 'monitoring', _monitoring(mtus[:1], {**modified, 'netPos': '2025-10-21T08:00:00Z'}))
+        assert sync.sync('2025-10-20', '2025-10-20') == [('netPos', day, 'full')]
+        assert sync.store.meta('netPos', day)['last_modified'].startswith('2025-10-21 08:00')
+
+
+def test_sync_intraday_monitoring_in_parallel(tmp_path, base_rows):
+    day, mtus = _day('2025-10-20')
+    days = pd.date_range(day, periods=5, freq='D')
+    all_mtus = pd.date_range(day, days[-1] + pd.DateOffset(days=1), freq='h', inclusive='left')
+    data = {'coreID': {'netPos': base_rows(all_mtus), 'monitoring': _monitoring(days, {'IDCCA_netPos': '2025-10-19T12:00:00Z'})}}
+    with JaoTestServer(data) as server:
+        client = JaoPublicationToolPandasIntraDay('a', rate_limit=None)
+        client.BASEURL_BARE = server.baseurl('coreID')
+        client.BASEURL = server.baseurl('coreID', 'IDCCA_')
+        with client:
+            done = JaoSync(client, str(tmp_path), ['netPos']).sync(days[0], days[-1])
+            assert len(done) == 5
+            # the monitoring queries did not touch the url of the client
+            assert client.BASEURL == server.baseurl('coreID', 'IDCCA_')
+        assert all(path.endswith('/system/monitoring') for path, _, _ in server.log if 'monitoring' in path)
+        assert all(path.endswith('/data/IDCCA_netPos') for path, _ in _data_requests(server))
+
+
+
+@pytest.mark.filterwarnings('ignore::DeprecationWarning')
+@pytest.mark.parametrize('version', ['c', 'd', 'e'])
+def test_intraday_parrun_monitoring(version):
+    day, mtus = _day('2025-10-20')
+    data = {'coreID': {'monitoring': _monitoring(mtus[:1], {f'IDCC{version.upper()}_netPos': '2025-10-19T12:00:00Z'})}}
+    with JaoTestServer(data) as server:
+        client = JaoPublicationToolPandasIntraDayParRun(version, rate_limit=None)
+        client.BASEURL_BARE = server.baseurl('coreID')
+        client.BASEURL = server.baseurl('coreID', f'IDCC{version.upper()}_')
+        with client:
+            df = client.query_monitoring(day)
+            assert df['businessDay'].to_list() == [day.date()] and df['lastModifiedOn'].dt.tz is not None
+            assert client.BASEURL == server.baseurl('coreID', f'IDCC{version.upper()}_')
+        assert [path for path, _, _ in server.log] == ['/coreID/api/system/monitoring']
+
+@pytest.mark.parametrize('endpoint, match', [('netPos', 'Net positions'), ('netPos', 'IDCCB_netPos'),
+                                             ('maxNetPos', 'Max net positions'), ('finalComputation', 'Final Computation')])
+def test_monitoring_dataset_names(endpoint, match):
+    monitoring = pd.DataFrame({
+        'dataset': ['Net positions', 'Max net positions', 'Final Computation', 'Prefinal Computation', 'IDCCB_netPos'],
+        'lastModifiedOn': pd.date_range('2025-01-01', periods=5, freq='h', tz='UTC'),
+        'deadline': pd.Timestamp('2025-01-02', tz='UTC'),
+    })
+    monitoring = monitoring[monitoring['dataset'].isin([match, 'Prefinal Computation'])]
+    last_modified, _ = JaoSync._modified(monitoring, endpoint)
+    assert last_modified == monitoring.loc[monitoring['dataset'] == match, 'lastModifiedOn'].iloc[0]
+
+
+def test_sync_nordic_shadow_prices_per_mtu(tmp_path, domain_rows):
+    day, mtus = _day('2025-10-20')
+    data = {'nordic': {'fbDomainShadowPrice': domain_rows(mtus, 3),
+                       'monitoring': _monitoring(mtus[:1], {'shadowPrices': '2025-10-19T12:00:00Z'})}}
+    with JaoTestServer(data) as server:
+        client = JaoPublicationToolPandasNordics(rate_limit=None)
+        client.BASEURL = server.baseurl('nordic')
+        with client:
+            sync = JaoSync(client, str(tmp_path), ['shadowPrices'])
+            assert sync.sync('2025-10-20', '2025-10-20') == [('shadowPrices', day, 'full')]
+    df = sync.store.read('shadowPrices', day)
+    assert len(df) == 24 * 3 and df['mtu'].nunique() == 24
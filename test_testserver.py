@@ -0,0 +1,148 @@
+import pandas as pd
+import pytest
+from jao import JaoPublicationToolClient, JaoPublicationToolPandasClient, JaoPublicationToolPandasIntraDay
+from jao.exceptions import IncompleteDataError
+from jao.retry import RetryPolicy
+from jao.testserver import JaoTestServer
+
+
+@pytest.fixture()
+def data(domain_rows, base_rows):
+    mtus = pd.date_range('2025-03-23', '2025-03-24', freq='h', tz='Europe/Amsterdam', inclusive='left')
+    october = pd.date_range('2025-10-20', '2025-11-03', freq='h', tz='Europe/Amsterdam', inclusive='left')
+    return {
+        'core': {'finalComputation': domain_rows(mtus[:3], 1200), 'netPos': base_rows(october)},
+        'coreID': {'finalComputation': domain_rows(mtus[:1], 50)},
+    }
+
+
+def _client(server: JaoTestServer, region: str = 'core', **kwargs) -> JaoPublicationToolPandasClient:
+    client = JaoPublicationToolPandasClient(rate_limit=None, **kwargs)
+    client.BASEURL = server.baseurl(region)
+    return client
+
+
+def test_domain_pagination_and_filters(data):
+    mtu = pd.Timestamp('2025-03-23 01:00', tz='Europe/Amsterdam')
+    with JaoTestServer(data) as server, _client(server) as client:
+        client.PAGE_SIZE = 500
+        df = client.query_final_domain(mtu)
+        assert len(df) == 1200 and df['id_original'].is_unique
+        assert (df['mtu'] == mtu).all()
+        assert len([q for _, q, _ in server.log if 'Skip' in q]) >= 2
+        assert len(client.query_final_domain(mtu, presolved=True)) == 120
+        assert len(client.query_final_domain(mtu, tso='ELIA')) == 600
+        assert len(client.query_final_domain(mtu, cne='line 11')) == 111
+        df = client.query_final_domain_fromto(mtu, mtu + pd.Timedelta(hours=2), presolved=True, tso='TENNETBV')
+        assert len(df) == 240
+
+
+def test_domain_capped_take(data):
+    # jao returns less rows than the Take asked for, the rest is pulled instead of skipped
+    mtu = pd.Timestamp('2025-03-23 01:00', tz='Europe/Amsterdam')
+    with JaoTestServer(data, max_take=300) as server, _client(server) as client:
+        client.PAGE_SIZE = 1000
+        df = client.query_final_domain(mtu)
+        assert len(df) == 1200 and df['id_original'].is_unique
+        pages = list(client.iter_final_domain_fromto(mtu, mtu + pd.Timedelta(hours=1)))
+        assert sum(len(page) for page in pages) == 1200
+
+
+def test_domain_split_large_page_on_server_error(data):
+    # jao chokes on pages above 1000 rows, also on the first one
+    mtu = pd.Timestamp('2025-03-23 01:00', tz='Europe/Amsterdam')
+    with JaoTestServer(data, overload_take=1000) as server, _client(server, retry=RetryPolicy(retries=0)) as client:
+        client.PAGE_SIZE = 4000
+        df = client.query_final_domain(mtu)
+        assert len(df) == 1200 and df['id_original'].is_unique
+        statuses = [(int(q['Take']), status) for _, q, status in server.log]
+        assert (4000, 503) in statuses and all(take <= 1000 for take, status in statuses if status == 200)
+        # and again with the page size tuned on the first query
+        assert len(client.query_final_domain(mtu)) == 1200
+
+
+def test_domain_empty_first_page(data):
+    # jao counts the rows but returns none on the first page, once
+    mtu = pd.Timestamp('2025-03-23 01:00', tz='Europe/Amsterdam')
+    with JaoTestServer(data) as server, _client(server) as client:
+        respond = server.respond
+        empty = [True]
+
+        def respond_empty_once(path, query):
+            status, headers, body = respond(path, query)
+            if empty[0] and query.get('Skip') == '0' and query.get('Take') != '1':
+                empty[0] = False
+                body['data'] = []
+            return status, headers, body
+
+        server.respond = respond_empty_once
+        client.PAGE_SIZE = 500
+        df = client.query_final_domain(mtu)
+        assert len(df) == 1200 and df['id_original'].is_unique
+
+    # a page size of 0, jao capping every page to nothing
+    with JaoTestServer(data, max_take=0) as server, _client(server) as client:
+        client.PAGE_SIZE = 500
+        with pytest.raises(IncompleteDataError):
+            client.query_final_domain(mtu)
+
+
+def test_domain_row_count_mismatch(data):
+    mtu = pd.Timestamp('2025-03-23 01:00', tz='Europe/Amsterdam')
+    with JaoTestServer(data) as server, _client(server) as client:
+        respond = server.respond
+
+        def respond_one_row_short(path, query):
+            # a row disappears between counting and paging
+            status, headers, body = respond(path, query)
+            body['totalRowsWithFilter'] += 1
+            return status, headers, body
+
+        server.respond = respond_one_row_short
+        client.PAGE_SIZE = 500
+        with pytest.raises(IncompleteDataError):
+            client.query_final_domain(mtu)
+        # counted and pulled twice
+        assert len([q for _, q, _ in server.log if q['Skip'] == '0']) == 2
+        with pytest.raises(IncompleteDataError):
+            list(client.iter_final_domain_fromto(mtu, mtu + pd.Timedelta(hours=1)))
+
+
+def test_domain_urls_only(data):
+    mtu = pd.Timestamp('2025-03-23 01:00', tz='Europe/Amsterdam')
+    with JaoTestServer(data) as server, JaoPublicationToolClient(rate_limit=None) as client:
+        client.BASEURL = server.baseurl('core')
+        client.PAGE_SIZE = 500
+        urls = client.query_final_domain(mtu, urls_only=True)
+        # only the count is fetched
+        assert [q['Take'] for _, q, _ in server.log] == ['1']
+        assert [(p['Skip'], p['Take']) for _, p, _ in urls] == [(0, 500), (500, 500), (1000, 200)]
+
+
+def test_rate_limit_retry_after(data):
+    d_from = pd.Timestamp('2025-10-20', tz='Europe/Amsterdam')
+    d_to = pd.Timestamp('2025-11-02 23:00', tz='Europe/Amsterdam')
+    with JaoTestServer(data, rate_limit=4, rate_period=1) as server, _client(server, executor=None) as client:
+        df = client.query_net_position_fromto(d_from, d_to)
+        assert len(df) == 14 * 24 + 1
+        statuses = [status for _, _, status in server.log]
+        assert 429 in statuses and statuses[-1] == 200
+
+
+def test_dst_windows_without_400(data):
+    d_from = pd.Timestamp('2025-10-20', tz='Europe/Amsterdam')
+    d_to = pd.Timestamp('2025-11-02 23:00', tz='Europe/Amsterdam')
+    with JaoTestServer(data) as server, _client(server) as client:
+        df = client.query_net_position_fromto(d_from, d_to)
+        assert df.index.is_unique and len(df) == 14 * 24 + 1
+        assert all(status == 200 for _, _, status in server.log)
+
+
+def test_intraday_prefix(data):
+    mtu = pd.Timestamp('2025-03-23 00:00', tz='Europe/Amsterdam')
+    with JaoTestServer(data) as server:
+        client = JaoPublicationToolPandasIntraDay('a', rate_limit=None)
+        client.BASEURL = server.baseurl('coreID', 'IDCCA_')
+        assert len(client.query_final_domain(mtu)) == 50
+        assert server.log[0][0] == '/coreID/api/data/IDCCA_finalComputation'
+        client.close()